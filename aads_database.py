@@ -5,8 +5,14 @@ Handles all database operations for the Atlantic Armwrestling Development Series
 
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+import json
+import functools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple, Iterator, Iterable, Any, Callable, Union, TYPE_CHECKING
 
 # Load environment variables if .env file exists
 try:
@@ -15,23 +21,498 @@ try:
 except ImportError:
     pass  # python-dotenv not installed, will use system environment variables
 
-from supabase_sync import SupabaseSync
+from aads_records import Player, Event, Participant
+import metrics
+from metrics import CACHE_REQUESTS, COMMITS, ROLLBACKS
+from supabase_sync import SupabaseSync, SYNC_LAST_SUCCESS, PUSHED_DELETIONS_KEY, record_sync_outcome
+from identity_map import IdentityMap
+from storage_engines import engine_for
+
+# Optional collaborators are imported where they are first created, so a
+# database that never uses them does not load them
+if TYPE_CHECKING:
+    from sync_scheduler import AutoSyncScheduler
+    from participation_index import ParticipationIndex
+    from season_analytics import SeasonAnalytics
+    from local_backup import LocalBackup
+    from event_log import OperationLog
+    from group_commit import GroupCommitter
+
+# Seconds a write waits for another process's lock (DB_BUSY_TIMEOUT), and how
+# often a write that still found the database locked is retried (DB_WRITE_RETRIES)
+BUSY_TIMEOUT = 10.0
+WRITE_RETRIES = 5
+RETRY_BASE_DELAY = 0.05
+
+
+METHOD_SECONDS = metrics.REGISTRY.histogram(
+    'aads_db_method_duration_seconds', 'Time spent in AADSDatabase methods', ('method',))
+LOCK_RETRIES = metrics.REGISTRY.counter(
+    'aads_db_lock_retries_total', 'Writes retried because another process held the lock')
+
+
+def _timed(method):
+    """Record the method's duration in the shared metrics registry."""
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            METHOD_SECONDS.observe(time.perf_counter() - started, method=name)
+    return wrapper
+
+
+def _is_lock_error(error: sqlite3.OperationalError) -> bool:
+    """Whether an error means another connection holds the write lock."""
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def _retry_locked(method):
+    """Run a mutator in its own write transaction, retrying while the database is locked.
+    
+    Called inside ``write_transaction()`` the mutator simply joins the
+    surrounding transaction.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._write_depth:
+            return method(self, *args, **kwargs)
+        
+        attempt = 0
+        while True:
+            try:
+                with self.write_transaction():
+                    return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not _is_lock_error(e):
+                    raise
+                if attempt >= self.write_retries:
+                    print(f"Database is busy; {method.__name__.replace('_', ' ')} was not saved ({e}).")
+                    return False
+                attempt += 1
+                self.lock_retries += 1
+                LOCK_RETRIES.inc()
+                _backoff(attempt)
+    return wrapper
+
+
+def _backoff(attempt: int):
+    """Sleep before a retry; jittered so competing processes do not retry in step."""
+    time.sleep(RETRY_BASE_DELAY * 2 ** attempt * random.uniform(0.5, 1.0))
+
+# Provinces the players table accepts
+PROVINCES = ('NB', 'NS', 'PEI')
+
+# Ordering for each player ``sort_by`` option as (column, descending) pairs.
+# ``id`` is always appended as a final tie-breaker so the order is total and
+# keyset cursors of the form ``(sort_key, id)`` never skip or repeat a row.
+PLAYER_SORTS = {
+    "name": (("name", False),),
+    "province": (("province", False), ("name", False)),
+    "participation": (("total_events", True), ("name", False)),
+    "status": (("status", False), ("name", False)),
+    "invite": (("province", False), ("total_events", True), ("name", False)),
+}
+
+# Shadow tables used by staged pulls. They mirror the live tables but leave
+# out uniqueness constraints; those become indexes built after the bulk load.
+STAGING_SCHEMA = {
+    "players": """
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            province TEXT NOT NULL CHECK(province IN ('NB', 'NS', 'PEI')),
+            status TEXT DEFAULT 'Prospect' CHECK(status IN ('Prospect', 'Active', 'Winner', 'TOC Qualified')),
+            total_events INTEGER DEFAULT 0,
+            toc_qualified INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    "events": """
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            event_type TEXT NOT NULL CHECK(event_type IN ('Invitational', 'TOC')),
+            event_date TEXT,
+            winner_id INTEGER,
+            status TEXT DEFAULT 'Pending' CHECK(status IN ('Pending', 'Active', 'Completed')),
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (winner_id) REFERENCES players(id)
+        )
+    """,
+    "event_participants": """
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            is_debut INTEGER DEFAULT 0,
+            is_veteran INTEGER DEFAULT 0,
+            placement INTEGER CHECK (placement IS NULL OR placement >= 1),
+            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (event_id) REFERENCES events(id),
+            FOREIGN KEY (player_id) REFERENCES players(id)
+        )
+    """
+}
+
+STAGED_UNIQUE_INDEXES = [
+    "CREATE UNIQUE INDEX idx_players_name ON players(name)",
+    "CREATE UNIQUE INDEX idx_event_participants_event_player ON event_participants(event_id, player_id)"
+]
+
+# Dashboard counts kept current by triggers, so summaries read a few
+# precomputed rows instead of counting rosters on every call. Bulk loads
+# that bypass row triggers (REPLACE, table swaps) call rebuild_summaries().
+SUMMARY_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_event_insert AFTER INSERT ON events
+    BEGIN
+        INSERT OR REPLACE INTO event_summary (event_id, winner_id, winner_name)
+        VALUES (NEW.id, NEW.winner_id, (SELECT name FROM players WHERE id = NEW.winner_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_event_winner AFTER UPDATE OF winner_id ON events
+    BEGIN
+        UPDATE event_summary
+        SET winner_id = NEW.winner_id,
+            winner_name = (SELECT name FROM players WHERE id = NEW.winner_id)
+        WHERE event_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_event_delete AFTER DELETE ON events
+    BEGIN
+        DELETE FROM event_summary WHERE event_id = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_participant_insert AFTER INSERT ON event_participants
+    BEGIN
+        UPDATE event_summary
+        SET participant_count = participant_count + 1,
+            debut_count = debut_count + COALESCE(NEW.is_debut, 0),
+            veteran_count = veteran_count + COALESCE(NEW.is_veteran, 0)
+        WHERE event_id = NEW.event_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_participant_update
+    AFTER UPDATE OF event_id, is_debut, is_veteran ON event_participants
+    BEGIN
+        UPDATE event_summary
+        SET participant_count = participant_count - 1,
+            debut_count = debut_count - COALESCE(OLD.is_debut, 0),
+            veteran_count = veteran_count - COALESCE(OLD.is_veteran, 0)
+        WHERE event_id = OLD.event_id;
+        UPDATE event_summary
+        SET participant_count = participant_count + 1,
+            debut_count = debut_count + COALESCE(NEW.is_debut, 0),
+            veteran_count = veteran_count + COALESCE(NEW.is_veteran, 0)
+        WHERE event_id = NEW.event_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_participant_delete AFTER DELETE ON event_participants
+    BEGIN
+        UPDATE event_summary
+        SET participant_count = participant_count - 1,
+            debut_count = debut_count - COALESCE(OLD.is_debut, 0),
+            veteran_count = veteran_count - COALESCE(OLD.is_veteran, 0)
+        WHERE event_id = OLD.event_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_player_insert AFTER INSERT ON players
+    BEGIN
+        INSERT INTO province_status_summary (province, status, players, toc_qualified)
+        VALUES (NEW.province, NEW.status, 1, COALESCE(NEW.toc_qualified, 0))
+        ON CONFLICT(province, status) DO UPDATE
+        SET players = players + 1, toc_qualified = toc_qualified + excluded.toc_qualified;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_player_update
+    AFTER UPDATE OF province, status, toc_qualified ON players
+    BEGIN
+        UPDATE province_status_summary
+        SET players = players - 1, toc_qualified = toc_qualified - COALESCE(OLD.toc_qualified, 0)
+        WHERE province = OLD.province AND status = OLD.status;
+        INSERT INTO province_status_summary (province, status, players, toc_qualified)
+        VALUES (NEW.province, NEW.status, 1, COALESCE(NEW.toc_qualified, 0))
+        ON CONFLICT(province, status) DO UPDATE
+        SET players = players + 1, toc_qualified = toc_qualified + excluded.toc_qualified;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_player_rename AFTER UPDATE OF name ON players
+    BEGIN
+        UPDATE event_summary SET winner_name = NEW.name WHERE winner_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_summary_player_delete AFTER DELETE ON players
+    BEGIN
+        UPDATE province_status_summary
+        SET players = players - 1, toc_qualified = toc_qualified - COALESCE(OLD.toc_qualified, 0)
+        WHERE province = OLD.province AND status = OLD.status;
+    END
+    """
+]
 
 class AADSDatabase:
-    def __init__(self, db_path: str = "aads_series.db", enable_sync: bool = True):
-        """Initialize database connection and create tables if they don't exist."""
-        self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+    def __init__(self, db_path: str = "aads_series.db", enable_sync: bool = True,
+                 busy_timeout: Optional[float] = None, write_retries: Optional[int] = None,
+                 group_commit: Optional[bool] = None, engine=None):
+        """Initialize database connection and create tables if they don't exist.
+        
+        ``busy_timeout`` (DB_BUSY_TIMEOUT) and ``write_retries``
+        (DB_WRITE_RETRIES) control how writes wait for other processes
+        using the same database file. ``group_commit`` (GROUP_COMMIT)
+        commits writes in batches from the first write on; see
+        start_group_commit(). ``engine``
+        (see storage_engines) replaces ``db_path`` as the storage.
+        """
+        self.engine = engine or engine_for(db_path)
+        self.db_path = self.engine.path
+        self.busy_timeout = busy_timeout if busy_timeout is not None else float(
+            os.getenv('DB_BUSY_TIMEOUT', str(BUSY_TIMEOUT)))
+        self.write_retries = write_retries if write_retries is not None else int(
+            os.getenv('DB_WRITE_RETRIES', str(WRITE_RETRIES)))
+        self.lock_retries = 0
+        self.conn = self.engine.connect(self.busy_timeout)
+        # Serializes the group committer's thread with writes and standings refreshes
+        self.lock = threading.RLock()
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
-        self.create_tables()
+        
+        # Callbacks told about every committed row change as (table, row_id);
+        # changes made inside a write transaction are held until it commits
+        self._change_listeners: List[Callable[[str, int], None]] = []
+        self._write_depth = 0
+        self._pending_changes: List[Tuple[str, int]] = []
+        
+        for attempt in range(self.write_retries + 1):
+            try:
+                self.create_tables()
+                break
+            except sqlite3.OperationalError as e:
+                self.conn.rollback()
+                if not _is_lock_error(e) or attempt == self.write_retries:
+                    raise
+                self.lock_retries += 1
+                LOCK_RETRIES.inc()
+                _backoff(attempt + 1)
+        
+        # Participation bitsets, built on first use and kept current by writes
+        self._participation: Optional['ParticipationIndex'] = None
+        self._participation_version: Optional[int] = None
+        self._analytics: Optional['SeasonAnalytics'] = None
+        self._backups: Optional['LocalBackup'] = None
+        self._oplog: Optional['OperationLog'] = None
+        self._identities: Optional[IdentityMap] = None
+        
+        # The committer and its thread start with the first write
+        self.group_committer: Optional['GroupCommitter'] = None
+        if group_commit is None:
+            group_commit = os.getenv('GROUP_COMMIT', 'false').lower() == 'true'
+        self._group_commit = group_commit
         
         # Initialize Supabase sync
         self.supabase = SupabaseSync() if enable_sync else None
         self.auto_sync = os.getenv('AUTO_SYNC', 'false').lower() == 'true'
+        self.auto_syncer: Optional['AutoSyncScheduler'] = None
+        if self.supabase and self.supabase.enabled:
+            # The sync age metric continues from the last recorded sync
+            for kind in ('push', 'pull'):
+                last = self.get_sync_state(f'last_{kind}_at')
+                if last and SYNC_LAST_SUCCESS.value(kind=kind) is None:
+                    SYNC_LAST_SUCCESS.set(datetime.fromisoformat(last).timestamp(), kind=kind)
+        if self.auto_sync:
+            self.start_auto_sync()
+        
+        # Data written before the operation log existed is only covered by a snapshot
+        if (self.get_sync_state('oplog_started_empty') == '0' and not self.engine.in_memory
+                and not self.oplog.list_snapshots()):
+            self.oplog.snapshot(label='baseline')
+    
+    def fork(self) -> 'AADSDatabase':
+        """An in-memory copy of the current data for what-if runs.
+        
+        Forks never sync, log snapshots or touch this database; fork a
+        fork to branch a scenario again.
+        """
+        self.flush_writes()
+        if self._analytics is not None:
+            # The copied standings are then current, so scenarios only
+            # recompute the players they change
+            self._analytics._ensure_current()
+        from storage_engines import MemoryEngine
+        fork = AADSDatabase(enable_sync=False, group_commit=False, engine=MemoryEngine(self.conn))
+        if self._analytics is not None:
+            fork._analytics = self._analytics.fork(fork)
+        return fork
+    
+    def add_change_listener(self, callback: Callable[[str, int], None]):
+        """Register a callback for committed row changes."""
+        self._change_listeners.append(callback)
+    
+    @property
+    def participation(self) -> 'ParticipationIndex':
+        """In-memory players x events index for roster set queries.
+        
+        This connection's writes keep it current; it is rebuilt when
+        another connection has committed since it was loaded.
+        """
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._participation is None or version != self._participation_version:
+            CACHE_REQUESTS.inc(cache='participation', result='miss')
+            from participation_index import ParticipationIndex
+            self._participation = ParticipationIndex.from_connection(self.conn)
+            self._participation_version = version
+        else:
+            CACHE_REQUESTS.inc(cache='participation', result='hit')
+        return self._participation
+    
+    @property
+    def analytics(self) -> 'SeasonAnalytics':
+        """Season standings engine, created on first use."""
+        if self._analytics is None:
+            from season_analytics import SeasonAnalytics
+            self._analytics = SeasonAnalytics(self)
+        return self._analytics
+    
+    @property
+    def backups(self) -> 'LocalBackup':
+        """Local snapshot manager for this database file."""
+        if self._backups is None:
+            from local_backup import LocalBackup
+            self._backups = LocalBackup(self.db_path)
+        return self._backups
+    
+    @property
+    def identities(self) -> IdentityMap:
+        """Cached player ids by name and player/event rows by id."""
+        if self._identities is None:
+            self._identities = IdentityMap(self.conn)
+        if not self._write_depth:
+            # Inside a write transaction it was checked when the lock was taken
+            self._identities.sync()
+        return self._identities
+    
+    @property
+    def oplog(self) -> 'OperationLog':
+        """Append-only log of roster operations, with replay and rebuild."""
+        if self._oplog is None:
+            from event_log import OperationLog
+            self._oplog = OperationLog(self)
+        return self._oplog
+    
+    def _log_operation(self, operation: str, **args) -> int:
+        """Append to the operation log inside the current write transaction."""
+        return self.oplog.append(operation, args)
+    
+    @_timed
+    def restore_snapshot(self, snapshot_path: str, keep_current: bool = True) -> Dict:
+        """Replace the database with a local snapshot.
+        
+        Unless ``keep_current`` is False the current data is snapshotted
+        first, so a restore can itself be undone.
+        """
+        self.flush_writes()
+        if keep_current:
+            self.backups.snapshot(label='pre-restore')
+        result = self.backups.restore(snapshot_path, self.conn)
+        # Snapshots may predate newer columns, summaries or triggers
+        self.create_tables()
+        self.rebuild_summaries()
+        self.invalidate_caches()
+        # Log snapshots from after the restored point describe a history
+        # that no longer happened
+        self.oplog.discard_snapshots_after(self.oplog.last_seq())
+        self.oplog.checkpoint()
+        return result
+    
+    def invalidate_caches(self):
+        """Drop in-memory caches after tables were changed in bulk."""
+        self._participation = None
+        if self._identities is not None:
+            self._identities.clear()
+        if self._analytics is not None:
+            self._analytics.mark_stale()
+    
+    def _notify_change(self, table: str, row_id: int):
+        """Tell listeners that a row was inserted or updated."""
+        if self._write_depth:
+            self._pending_changes.append((table, row_id))
+            return
+        for callback in self._change_listeners:
+            callback(table, row_id)
+    
+    @contextmanager
+    def write_transaction(self):
+        """Group writes into one ``BEGIN IMMEDIATE`` transaction.
+        
+        The write lock is taken up front, so the transaction waits for
+        other processes instead of failing halfway. Mutators called inside
+        join it (useful for batches, e.g. checking in a whole roster) and
+        listeners hear about the changes once it commits. Lock errors
+        propagate; the mutators' own retries only apply outside a batch.
+        
+        With group commit on, the transaction becomes a savepoint in the
+        committer's open batch and returns before the batch is committed.
+        """
+        if self._write_depth:
+            self._write_depth += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+            return
+        
+        if self._group_commit and self.group_committer is None:
+            self.start_group_commit()
+        if self.group_committer is not None:
+            with self.group_committer.write():
+                yield
+            return
+        
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("BEGIN IMMEDIATE")
+        if self._identities is not None:
+            # Another process may have written since the map was filled
+            self._identities.sync()
+        self._write_depth = 1
+        try:
+            yield
+            self.conn.commit()
+            COMMITS.inc()
+        except BaseException:
+            self.conn.rollback()
+            ROLLBACKS.inc()
+            self._pending_changes.clear()
+            # In-memory indexes may already include the rolled back rows
+            self.invalidate_caches()
+            raise
+        finally:
+            self._write_depth = 0
+        
+        pending, self._pending_changes = self._pending_changes, []
+        for table, row_id in pending:
+            self._notify_change(table, row_id)
     
     def create_tables(self):
         """Create all necessary database tables."""
+        if not self.conn.in_transaction:
+            # Take the write lock up front so setup waits for other processes
+            self.conn.execute("BEGIN IMMEDIATE")
         
         # Players Master List
         self.cursor.execute("""
@@ -56,10 +537,18 @@ class AADSDatabase:
                 event_date TEXT,
                 winner_id INTEGER,
                 status TEXT DEFAULT 'Pending' CHECK(status IN ('Pending', 'Active', 'Completed')),
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (winner_id) REFERENCES players(id)
             )
         """)
         
+        # Databases created before events tracked changes: add the column
+        # (SQLite cannot add it with a CURRENT_TIMESTAMP default)
+        self.cursor.execute("PRAGMA table_info(events)")
+        if 'updated_at' not in [column['name'] for column in self.cursor.fetchall()]:
+            self.cursor.execute("ALTER TABLE events ADD COLUMN updated_at TIMESTAMP")
+            self.cursor.execute("UPDATE events SET updated_at = CURRENT_TIMESTAMP")
+        
         # Event Participants (join table)
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS event_participants (
@@ -68,16 +557,142 @@ class AADSDatabase:
                 player_id INTEGER NOT NULL,
                 is_debut INTEGER DEFAULT 0,
                 is_veteran INTEGER DEFAULT 0,
-                placement INTEGER,
+                placement INTEGER CHECK (placement IS NULL OR placement >= 1),
                 added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (event_id) REFERENCES events(id),
                 FOREIGN KEY (player_id) REFERENCES players(id),
                 UNIQUE(event_id, player_id)
             )
         """)
         
+        # Placements and flags change existing roster rows, so they track
+        # changes too; older rows count as changed when they were added
+        self.cursor.execute("PRAGMA table_info(event_participants)")
+        if 'updated_at' not in [column['name'] for column in self.cursor.fetchall()]:
+            self.cursor.execute("ALTER TABLE event_participants ADD COLUMN updated_at TIMESTAMP")
+            self.cursor.execute("UPDATE event_participants SET updated_at = added_at")
+        
+        # SQLite cannot add a CHECK to an existing table, so files created
+        # before placements were checked get the same rule from triggers
+        self.cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'event_participants'")
+        if 'placement >= 1' not in self.cursor.fetchone()[0]:
+            for name, event in (('insert', 'INSERT'), ('update', 'UPDATE OF placement')):
+                self.cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_check_placement_{name}
+                    BEFORE {event} ON event_participants
+                    WHEN NEW.placement IS NOT NULL AND NEW.placement < 1
+                    BEGIN
+                        SELECT RAISE(ABORT, 'CHECK constraint failed: placement >= 1');
+                    END
+                """)
+        
+        # Deleted rows, kept so pushes and pulls can propagate the deletion
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tombstones (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(table_name, row_id)
+            )
+        """)
+        
+        # Local sync bookkeeping (pull watermarks and similar key/value state)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        
+        # Append-only history of roster operations (see event_log.py)
+        self.cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'operation_log'")
+        log_exists = self.cursor.fetchone()[0] > 0
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS operation_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                operation TEXT NOT NULL,
+                args TEXT NOT NULL,
+                recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        if not log_exists:
+            # Replaying from an empty database is only valid if the log saw every write
+            self.cursor.execute("SELECT EXISTS (SELECT 1 FROM players) OR EXISTS (SELECT 1 FROM events)")
+            started_empty = '0' if self.cursor.fetchone()[0] else '1'
+            self.cursor.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES ('oplog_started_empty', ?)",
+                                (started_empty,))
+        
+        # Materialized dashboard summaries (see SUMMARY_TRIGGERS)
+        self.cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'event_summary'")
+        summaries_exist = self.cursor.fetchone()[0] > 0
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS event_summary (
+                event_id INTEGER PRIMARY KEY,
+                participant_count INTEGER NOT NULL DEFAULT 0,
+                debut_count INTEGER NOT NULL DEFAULT 0,
+                veteran_count INTEGER NOT NULL DEFAULT 0,
+                winner_id INTEGER,
+                winner_name TEXT
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS province_status_summary (
+                province TEXT NOT NULL,
+                status TEXT NOT NULL,
+                players INTEGER NOT NULL DEFAULT 0,
+                toc_qualified INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (province, status)
+            )
+        """)
+        for statement in SUMMARY_TRIGGERS:
+            self.cursor.execute(statement)
+        if not summaries_exist:
+            self.rebuild_summaries(commit=False)
+        
+        # Indexes backing the keyset-paginated player listings
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_province ON players(province, name)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_status ON players(status, name)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_total_events ON players(total_events DESC, name)")
+        
+        # Per-player roster lookups (event counts, debut checks, deletes);
+        # the unique (event_id, player_id) index cannot serve them
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_participants_player ON event_participants(player_id)")
+        
         self.conn.commit()
     
+    @_timed
+    def rebuild_summaries(self, commit: bool = True):
+        """Recompute the dashboard summary tables from scratch."""
+        self.cursor.execute("DELETE FROM event_summary")
+        self.cursor.execute("""
+            INSERT INTO event_summary
+            (event_id, participant_count, debut_count, veteran_count, winner_id, winner_name)
+            SELECT
+                e.id,
+                COUNT(ep.id),
+                COALESCE(SUM(ep.is_debut), 0),
+                COALESCE(SUM(ep.is_veteran), 0),
+                e.winner_id,
+                p.name
+            FROM events e
+            LEFT JOIN event_participants ep ON ep.event_id = e.id
+            LEFT JOIN players p ON p.id = e.winner_id
+            GROUP BY e.id
+        """)
+        self.cursor.execute("DELETE FROM province_status_summary")
+        self.cursor.execute("""
+            INSERT INTO province_status_summary (province, status, players, toc_qualified)
+            SELECT province, status, COUNT(*), COALESCE(SUM(toc_qualified), 0)
+            FROM players
+            GROUP BY province, status
+        """)
+        if commit:
+            self.conn.commit()
+    
+    @_timed
+    @_retry_locked
     def initialize_events(self):
         """Initialize the 7 events in the series."""
         events = [
@@ -92,12 +707,17 @@ class AADSDatabase:
         
         for event in events:
             self.cursor.execute("""
-                INSERT OR IGNORE INTO events (id, name, event_type, event_date, status)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT OR IGNORE INTO events (id, name, event_type, event_date, status, updated_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             """, event)
+        self._log_operation('initialize_events', events=events)
         
-        self.conn.commit()
+        for event in events:
+            self.identities.event_changed(event[0])
+            self._notify_change('events', event[0])
     
+    @_timed
+    @_retry_locked
     def add_player(self, name: str, province: str) -> int:
         """Add a new player to the master list."""
         try:
@@ -105,23 +725,27 @@ class AADSDatabase:
                 INSERT INTO players (name, province, status)
                 VALUES (?, ?, 'Prospect')
             """, (name, province))
-            self.conn.commit()
-            return self.cursor.lastrowid
+            player_id = self.cursor.lastrowid
+            self.identities.remember_player(player_id, name)
+            self._log_operation('add_player', player_id=player_id, name=name, province=province)
+            if self._participation is not None:
+                self._participation.add_player(player_id)
+            self._notify_change('players', player_id)
+            return player_id
         except sqlite3.IntegrityError:
             # Player already exists, return their id
-            self.cursor.execute("SELECT id FROM players WHERE name = ?", (name,))
-            return self.cursor.fetchone()[0]
+            return self.identities.player_id(name)
     
+    @_timed
     def get_or_create_player(self, name: str, province: str) -> int:
         """Get player ID or create if doesn't exist."""
-        self.cursor.execute("SELECT id FROM players WHERE name = ?", (name,))
-        result = self.cursor.fetchone()
-        
-        if result:
-            return result[0]
-        else:
-            return self.add_player(name, province)
+        player_id = self.identities.player_id(name)
+        if player_id is not None:
+            return player_id
+        return self.add_player(name, province)
     
+    @_timed
+    @_retry_locked
     def add_player_to_event(self, event_id: int, player_name: str, province: str):
         """Add a player to an event roster."""
         # Get or create player
@@ -144,6 +768,7 @@ class AADSDatabase:
                 INSERT INTO event_participants (event_id, player_id, is_debut, is_veteran)
                 VALUES (?, ?, ?, ?)
             """, (event_id, player_id, is_debut, is_veteran))
+            participant_id = self.cursor.lastrowid
             
             # Update player status and event count
             self.cursor.execute("""
@@ -156,50 +781,455 @@ class AADSDatabase:
                 updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
             """, (player_id, player_id))
+            self._log_operation('add_player_to_event', event_id=event_id, player_id=player_id,
+                                participant_id=participant_id, name=player_name)
+            self.identities.player_changed(player_id)
             
-            self.conn.commit()
+            if self._participation is not None:
+                self._participation.add(event_id, player_id)
+            self._notify_change('players', player_id)
+            self._notify_change('event_participants', participant_id)
         except sqlite3.IntegrityError:
             print(f"Player {player_name} is already in Event {event_id}")
     
+    @_timed
+    @_retry_locked
     def set_event_winner(self, event_id: int, player_name: str):
         """Mark a player as the winner of an event."""
-        # Get player ID
-        self.cursor.execute("SELECT id FROM players WHERE name = ?", (player_name,))
-        result = self.cursor.fetchone()
-        
-        if not result:
+        player_id = self.identities.player_id(player_name)
+        if player_id is None:
             print(f"Player {player_name} not found!")
             return False
         
-        player_id = result[0]
-        
         # Update event winner
         self.cursor.execute("""
             UPDATE events 
-            SET winner_id = ?, status = 'Completed'
+            SET winner_id = ?, status = 'Completed', updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         """, (player_id, event_id))
         
         # Update player status
         self.cursor.execute("""
             UPDATE players 
-            SET status = 'Winner', toc_qualified = 1
+            SET status = 'Winner', toc_qualified = 1, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         """, (player_id,))
         
         # Add winner to TOC (Event 7) automatically
+        toc_entry_id = None
         if event_id != 7:
             try:
                 self.cursor.execute("""
                     INSERT INTO event_participants (event_id, player_id, is_veteran)
                     VALUES (7, ?, 1)
                 """, (player_id,))
+                toc_entry_id = self.cursor.lastrowid
+                # The TOC entry counts like any other event
+                self.cursor.execute("""
+                    UPDATE players
+                    SET total_events = (SELECT COUNT(DISTINCT event_id) FROM event_participants WHERE player_id = ?)
+                    WHERE id = ?
+                """, (player_id, player_id))
             except sqlite3.IntegrityError:
                 pass  # Already in TOC
+        self._log_operation('set_event_winner', event_id=event_id, player_id=player_id,
+                            toc_entry_id=toc_entry_id, name=player_name)
+        self.identities.player_changed(player_id)
+        self.identities.event_changed(event_id)
         
-        self.conn.commit()
+        self._notify_change('players', player_id)
+        self._notify_change('events', event_id)
+        if toc_entry_id is not None:
+            if self._participation is not None:
+                self._participation.add(7, player_id)
+            self._notify_change('event_participants', toc_entry_id)
+        return True
+    
+    @_timed
+    @_retry_locked
+    def record_placement(self, event_id: int, player_name: str, placement: int) -> bool:
+        """Record a player's final placement in an event.
+        
+        Raises ``ValueError`` if ``placement`` is below 1 or the player is
+        not on the event roster.
+        """
+        if placement < 1:
+            raise ValueError(f"Placement must be 1 or higher, not {placement}.")
+        self.cursor.execute("""
+            SELECT id FROM event_participants WHERE event_id = ? AND player_id = ?
+        """, (event_id, self.identities.player_id(player_name)))
+        result = self.cursor.fetchone()
+        
+        if not result:
+            raise ValueError(f"Player {player_name} is not in Event {event_id}!")
+        
+        participant_id = result[0]
+        self.cursor.execute("""
+            UPDATE event_participants 
+            SET placement = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (placement, participant_id))
+        self._log_operation('record_placement', participant_id=participant_id, placement=placement,
+                            event_id=event_id, name=player_name)
+        
+        self._notify_change('event_participants', participant_id)
+        return True
+    
+    def _record_tombstone(self, table: str, row_id: int) -> int:
+        """Note a deleted row in the current transaction; returns the tombstone id."""
+        self.cursor.execute("""
+            INSERT INTO tombstones (table_name, row_id) VALUES (?, ?)
+            ON CONFLICT(table_name, row_id) DO UPDATE SET deleted_at = CURRENT_TIMESTAMP
+        """, (table, row_id))
+        self.cursor.execute("SELECT id FROM tombstones WHERE table_name = ? AND row_id = ?", (table, row_id))
+        return self.cursor.fetchone()[0]
+    
+    @_timed
+    @_retry_locked
+    def remove_player_from_event(self, event_id: int, player_name: str) -> bool:
+        """Take a player off an event roster."""
+        self.cursor.execute("""
+            SELECT ep.id, ep.player_id, e.winner_id
+            FROM event_participants ep
+            LEFT JOIN events e ON ep.event_id = e.id
+            WHERE ep.event_id = ? AND ep.player_id = ?
+        """, (event_id, self.identities.player_id(player_name)))
+        result = self.cursor.fetchone()
+        
+        if not result:
+            print(f"Player {player_name} is not in Event {event_id}!")
+            return False
+        
+        participant_id, player_id, winner_id = result
+        if winner_id == player_id:
+            print(f"{player_name} won Event {event_id}; set a different winner first.")
+            return False
+        
+        self.cursor.execute("DELETE FROM event_participants WHERE id = ?", (participant_id,))
+        tombstone_id = self._record_tombstone('event_participants', participant_id)
+        
+        # Update event count; players left with no events become prospects again
+        self.cursor.execute("""
+            UPDATE players 
+            SET total_events = (SELECT COUNT(DISTINCT event_id) FROM event_participants WHERE player_id = ?),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (player_id, player_id))
+        self.cursor.execute("""
+            UPDATE players SET status = 'Prospect'
+            WHERE id = ? AND status = 'Active' AND total_events = 0
+        """, (player_id,))
+        self._log_operation('remove_player_from_event', event_id=event_id, player_id=player_id,
+                            participant_id=participant_id, name=player_name)
+        self.identities.player_changed(player_id)
+        
+        if self._participation is not None:
+            self._participation.remove(event_id, player_id)
+        self._notify_change('players', player_id)
+        self._notify_change('event_participants', participant_id)
+        self._notify_change('tombstones', tombstone_id)
         return True
     
+    @_timed
+    @_retry_locked
+    def reconcile_event_roster(self, event_id: int,
+                               roster: Iterable[Union[str, Tuple[str, str]]]) -> Optional[Dict[str, List[str]]]:
+        """Make an event roster match ``roster`` exactly and return the difference.
+        
+        ``roster`` lists player names, or (name, province) pairs for players
+        who may be new to the master list. Listed players missing from the
+        event are added and unlisted ones removed (except the winner), in
+        one transaction; importing the same list again changes nothing.
+        Returns sorted names under 'added', 'removed', 'unchanged',
+        'created' (new to the master list) and 'kept' (an unlisted winner).
+        """
+        provinces: Dict[str, Optional[str]] = {}
+        for entry in roster:
+            name, province = (entry, None) if isinstance(entry, str) else entry
+            provinces[name] = province or provinces.get(name)
+        names = json.dumps(sorted(provinces))
+        
+        self.cursor.execute("""
+            SELECT value FROM json_each(?)
+            WHERE NOT EXISTS (SELECT 1 FROM players WHERE name = value)
+        """, (names,))
+        created = [row[0] for row in self.cursor.fetchall()]
+        missing = [name for name in created if not provinces[name]]
+        if missing:
+            print(f"No province given for new player(s): {', '.join(missing)}")
+            return None
+        invalid = [f"{name} ({provinces[name]})" for name in created if provinces[name] not in PROVINCES]
+        if invalid:
+            print(f"Unknown province for new player(s): {', '.join(invalid)}; use {', '.join(PROVINCES)}")
+            return None
+        created = [name for name in created if self.add_player(name, provinces[name]) is not None]
+        
+        # Listed players not on the roster, listed players already on it, and
+        # roster entries that are not listed
+        self.cursor.execute("""
+            WITH listed AS (
+                SELECT p.id, p.name FROM json_each(?) r JOIN players p ON p.name = r.value
+            ), current AS (
+                SELECT id, player_id FROM event_participants WHERE event_id = ?
+            )
+            SELECT CASE WHEN c.id IS NULL THEN 'add' ELSE 'keep' END, l.id, l.name, c.id
+            FROM listed l LEFT JOIN current c ON c.player_id = l.id
+            UNION ALL
+            SELECT 'remove', c.player_id, p.name, c.id
+            FROM current c JOIN players p ON p.id = c.player_id
+            WHERE c.player_id NOT IN (SELECT id FROM listed)
+        """, (names, event_id))
+        diff: Dict[str, List] = {'add': [], 'keep': [], 'remove': []}
+        for action, player_id, name, participant_id in self.cursor.fetchall():
+            diff[action].append((player_id, name, participant_id))
+        
+        event = self.identities.event(event_id)
+        winner_id = event['winner_id'] if event is not None else None
+        kept = [entry for entry in diff['remove'] if entry[0] == winner_id]
+        removals = [entry for entry in diff['remove'] if entry[0] != winner_id]
+        if removals:
+            self.cursor.execute("DELETE FROM event_participants WHERE id IN (SELECT value FROM json_each(?))",
+                                (json.dumps([participant_id for _, _, participant_id in removals]),))
+        
+        additions = []
+        if diff['add']:
+            added_ids = json.dumps([player_id for player_id, _, _ in diff['add']])
+            # Flags depend only on the player's other events, which removals do not touch
+            self.cursor.execute("""
+                INSERT INTO event_participants (event_id, player_id, is_debut, is_veteran)
+                SELECT ?, p.value,
+                       NOT EXISTS (SELECT 1 FROM event_participants ep WHERE ep.player_id = p.value),
+                       EXISTS (SELECT 1 FROM event_participants ep WHERE ep.player_id = p.value)
+                FROM json_each(?) p
+            """, (event_id, added_ids))
+            self.cursor.execute("""
+                SELECT player_id, id FROM event_participants
+                WHERE event_id = ? AND player_id IN (SELECT value FROM json_each(?))
+            """, (event_id, added_ids))
+            participant_ids = dict(self.cursor.fetchall())
+            additions = [(player_id, name, participant_ids[player_id]) for player_id, name, _ in diff['add']]
+        
+        touched = [player_id for player_id, _, _ in removals + additions]
+        if touched:
+            touched_ids = json.dumps(touched)
+            self.cursor.execute("""
+                UPDATE players
+                SET total_events = (SELECT COUNT(DISTINCT event_id) FROM event_participants WHERE player_id = players.id),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id IN (SELECT value FROM json_each(?))
+            """, (touched_ids,))
+            # Prospects who now have an event become active; active players
+            # left with none become prospects again
+            self.cursor.execute("""
+                UPDATE players SET status = CASE WHEN total_events > 0 THEN 'Active' ELSE 'Prospect' END
+                WHERE id IN (SELECT value FROM json_each(?))
+                  AND ((status = 'Prospect' AND total_events > 0) OR (status = 'Active' AND total_events = 0))
+            """, (touched_ids,))
+        
+        # Logged one row at a time so the operation log replays exactly
+        for player_id, name, participant_id in removals:
+            tombstone_id = self._record_tombstone('event_participants', participant_id)
+            self._log_operation('remove_player_from_event', event_id=event_id, player_id=player_id,
+                                participant_id=participant_id, name=name)
+            if self._participation is not None:
+                self._participation.remove(event_id, player_id)
+            self._notify_change('event_participants', participant_id)
+            self._notify_change('tombstones', tombstone_id)
+        for player_id, name, participant_id in additions:
+            self._log_operation('add_player_to_event', event_id=event_id, player_id=player_id,
+                                participant_id=participant_id, name=name)
+            if self._participation is not None:
+                self._participation.add(event_id, player_id)
+            self._notify_change('event_participants', participant_id)
+        for player_id in touched:
+            self.identities.player_changed(player_id)
+            self._notify_change('players', player_id)
+        
+        return {
+            'added': sorted(name for _, name, _ in additions),
+            'removed': sorted(name for _, name, _ in removals),
+            'unchanged': sorted(name for _, name, _ in diff['keep']),
+            'created': sorted(created),
+            'kept': sorted(name for _, name, _ in kept)
+        }
+    
+    @_timed
+    @_retry_locked
+    def recompute_participation_flags(self, player_name: Optional[str] = None) -> int:
+        """Rederive debut/veteran flags and event counts from event order.
+        
+        Inserts decide the flags from the rows present at the time, so
+        events loaded out of order, pulls and TOC entries added for winners
+        can leave them wrong. A player's first event by date (then id) is
+        their debut and every later one a veteran appearance. Covers every
+        player, or just ``player_name``; returns the number of rows fixed.
+        """
+        player_id, params = None, ()
+        if player_name is not None:
+            player_id = self.identities.player_id(player_name)
+            if player_id is None:
+                print(f"Player {player_name} not found!")
+                return 0
+            params = (player_id,)
+        
+        self.cursor.execute(f"""
+            SELECT id, debut FROM (
+                SELECT ep.id, ep.is_debut, ep.is_veteran,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY ep.player_id
+                           ORDER BY e.event_date IS NULL, e.event_date, ep.event_id
+                       ) = 1 AS debut
+                FROM event_participants ep
+                LEFT JOIN events e ON e.id = ep.event_id
+                {"WHERE ep.player_id = ?" if params else ""}
+            )
+            WHERE is_debut IS NOT debut OR is_veteran IS NOT 1 - debut
+        """, params)
+        flags = [(debut, 1 - debut, participant_id) for participant_id, debut in self.cursor.fetchall()]
+        self.cursor.executemany("""
+            UPDATE event_participants SET is_debut = ?, is_veteran = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, flags)
+        
+        self.cursor.execute(f"""
+            SELECT p.id, COUNT(DISTINCT ep.event_id) AS events
+            FROM players p
+            LEFT JOIN event_participants ep ON ep.player_id = p.id
+            {"WHERE p.id = ?" if params else ""}
+            GROUP BY p.id
+            HAVING p.total_events IS NOT events
+                OR (p.status = 'Prospect' AND events > 0) OR (p.status = 'Active' AND events = 0)
+        """, params)
+        counts = self.cursor.fetchall()
+        self.cursor.executemany("""
+            UPDATE players
+            SET total_events = ?1,
+                status = CASE
+                    WHEN status IN ('Prospect', 'Active') THEN CASE WHEN ?1 > 0 THEN 'Active' ELSE 'Prospect' END
+                    ELSE status
+                END,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?2
+        """, [(events, player_id) for player_id, events in counts])
+        
+        if not flags and not counts:
+            return 0
+        self._log_operation('recompute_participation_flags', player_id=player_id, name=player_name)
+        for _, _, participant_id in flags:
+            self._notify_change('event_participants', participant_id)
+        for changed_id, _ in counts:
+            self.identities.player_changed(changed_id)
+            self._notify_change('players', changed_id)
+        return len(flags) + len(counts)
+    
+    @_timed
+    @_retry_locked
+    def delete_player(self, player_name: str) -> bool:
+        """Delete a player and their roster entries from the master list."""
+        player_id = self.identities.player_id(player_name)
+        if player_id is None:
+            print(f"Player {player_name} not found!")
+            return False
+        
+        self.cursor.execute("SELECT id FROM events WHERE winner_id = ?", (player_id,))
+        won = [row[0] for row in self.cursor.fetchall()]
+        if won:
+            print(f"{player_name} won Event {', '.join(map(str, won))}; set a different winner first.")
+            return False
+        
+        self.cursor.execute("SELECT id FROM event_participants WHERE player_id = ?", (player_id,))
+        participant_ids = [row[0] for row in self.cursor.fetchall()]
+        
+        self.cursor.execute("DELETE FROM event_participants WHERE player_id = ?", (player_id,))
+        self.cursor.execute("DELETE FROM players WHERE id = ?", (player_id,))
+        tombstone_ids = [self._record_tombstone('event_participants', participant_id)
+                         for participant_id in participant_ids]
+        tombstone_ids.append(self._record_tombstone('players', player_id))
+        self._log_operation('delete_player', player_id=player_id, name=player_name)
+        self.identities.player_deleted(player_id)
+        
+        if self._participation is not None:
+            self._participation.remove_player(player_id)
+        for participant_id in participant_ids:
+            self._notify_change('event_participants', participant_id)
+        for tombstone_id in tombstone_ids:
+            self._notify_change('tombstones', tombstone_id)
+        return True
+    
+    def tombstoned_ids(self) -> Dict[str, set]:
+        """Ids of locally deleted rows, per table."""
+        deleted: Dict[str, set] = {}
+        for table, row_id in self.conn.execute("SELECT table_name, row_id FROM tombstones"):
+            deleted.setdefault(table, set()).add(row_id)
+        return deleted
+    
+    @_timed
+    def apply_tombstones(self, tombstones: Iterator, commit: bool = True) -> int:
+        """Delete rows named by tombstones from another copy; returns rows removed.
+        
+        Deleting a player also deletes their roster entries, matching the
+        cloud's cascading foreign keys.
+        """
+        removed = 0
+        for tombstone in tombstones:
+            if tombstone.table_name not in ('players', 'events', 'event_participants'):
+                continue
+            if tombstone.table_name == 'players':
+                self.cursor.execute("DELETE FROM event_participants WHERE player_id = ?", (tombstone.row_id,))
+                removed += self.cursor.rowcount
+            self.cursor.execute(f"DELETE FROM {tombstone.table_name} WHERE id = ?", (tombstone.row_id,))
+            removed += self.cursor.rowcount
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO tombstones (table_name, row_id, deleted_at)
+                VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            """, (tombstone.table_name, tombstone.row_id, tombstone.deleted_at))
+        if commit:
+            self.conn.commit()
+            self.invalidate_caches()
+        return removed
+    
+    @_timed
+    def compact_tombstones(self, days: Optional[int] = None) -> int:
+        """Forget tombstones older than ``days`` (TOMBSTONE_RETENTION_DAYS, default 30).
+        
+        With cloud sync enabled, only tombstones already pushed are dropped
+        locally, and the cloud copies past the same age are removed too;
+        clients that stay offline longer than that should do a full pull.
+        """
+        days = days if days is not None else int(os.getenv('TOMBSTONE_RETENTION_DAYS', '30'))
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        
+        pushed = None
+        syncing = self.supabase is not None and self.supabase.enabled
+        if syncing:
+            # Not last_push_at: a push can succeed without the deletions in it
+            pushed = self.get_sync_state(PUSHED_DELETIONS_KEY)
+            if not pushed:
+                return 0
+            self.supabase.compact_tombstones(cutoff.isoformat())
+        
+        return self._delete_tombstones(cutoff, pushed)
+    
+    @_retry_locked
+    def _delete_tombstones(self, cutoff: datetime, pushed: Optional[str] = None) -> int:
+        """Delete local tombstones older than a UTC cutoff and, if given, no newer than ``pushed``."""
+        # Tombstones use SQLite's UTC clock
+        self.cursor.execute("""
+            DELETE FROM tombstones WHERE deleted_at < ? AND deleted_at <= COALESCE(?, deleted_at)
+        """, (cutoff.strftime('%Y-%m-%d %H:%M:%S'), pushed))
+        removed = self.cursor.rowcount
+        self.set_sync_state('last_compaction_at', datetime.now().isoformat(sep=' ', timespec='seconds'),
+                            commit=False)
+        return removed
+    
+    def _maybe_compact_tombstones(self):
+        """Compact tombstones at most once a day, after a successful sync."""
+        last = self.get_sync_state('last_compaction_at')
+        if last and datetime.now() - datetime.fromisoformat(last) < timedelta(days=1):
+            return
+        self.compact_tombstones()
+    
+    @_timed
     def get_event_roster(self, event_id: int) -> List[Dict]:
         """Get all players in an event roster."""
         self.cursor.execute("""
@@ -219,18 +1249,96 @@ class AADSDatabase:
         
         return [dict(row) for row in self.cursor.fetchall()]
     
-    def get_all_players(self, sort_by: str = "name") -> List[Dict]:
-        """Get all players from master list."""
-        valid_sorts = {
-            "name": "name",
-            "province": "province, name",
-            "participation": "total_events DESC, name",
-            "status": "status, name"
-        }
+    def _player_filters(self, province: Optional[str] = None,
+                        exclude_event: Optional[int] = None,
+                        has_played: Optional[bool] = None,
+                        player_ids: Optional[List[int]] = None,
+                        name_contains: Optional[str] = None,
+                        sort_column: Optional[str] = None) -> Tuple[List[str], List[Any]]:
+        """Build WHERE clauses and parameters shared by the player listings.
+        
+        ``sort_column`` is the leading ORDER BY column of a listing. Unless
+        it is total_events, the has_played filter is hidden from index
+        selection (unary +), so a page walks the sort index and stops after
+        ``limit`` rows instead of sorting every matching player.
+        """
+        clauses, params = [], []
+        if name_contains:
+            # LIKE is case-insensitive for ASCII; escape its wildcards
+            pattern = name_contains.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            params.append(f"%{pattern}%")
+        if player_ids is not None:
+            clauses.append("id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(player_ids))
+        if province is not None:
+            clauses.append("province = ?")
+            params.append(province)
+        if exclude_event is not None:
+            clauses.append("""id NOT IN (
+                SELECT player_id FROM event_participants WHERE event_id = ?
+            )""")
+            params.append(exclude_event)
+        played = "total_events" if sort_column in (None, "total_events") else "+total_events"
+        if has_played is True:
+            clauses.append(f"{played} > 0")
+        elif has_played is False:
+            clauses.append(f"{played} = 0")
+        return clauses, params
+    
+    def player_cursor(self, player: Dict, sort_by: str = "name") -> Tuple[Any, int]:
+        """Return the keyset cursor ``(sort_key, id)`` that resumes after ``player``."""
+        columns = PLAYER_SORTS.get(sort_by, PLAYER_SORTS["name"])
+        values = tuple(player[column] for column, _ in columns)
+        return (values[0] if len(values) == 1 else values), player['id']
+    
+    def iter_players(self, sort_by: str = "name", province: Optional[str] = None,
+                     exclude_event: Optional[int] = None, has_played: Optional[bool] = None,
+                     player_ids: Optional[List[int]] = None,
+                     name_contains: Optional[str] = None,
+                     after: Optional[Tuple[Any, int]] = None,
+                     limit: Optional[int] = None) -> Iterator[Dict]:
+        """Stream players lazily in ``sort_by`` order.
+        
+        ``after`` is a keyset cursor as returned by ``player_cursor`` and
+        ``limit`` caps the number of rows, so callers can page through large
+        rosters without materializing them.
+        """
+        columns = PLAYER_SORTS.get(sort_by, PLAYER_SORTS["name"]) + (("id", False),)
+        clauses, params = self._player_filters(province, exclude_event, has_played, player_ids,
+                                               name_contains, sort_column=columns[0][0])
         
-        order_clause = valid_sorts.get(sort_by, "name")
+        if after is not None:
+            sort_key, last_id = after
+            values = list(sort_key) if len(columns) > 2 else [sort_key]
+            values.append(last_id)
+            
+            # Expand (c1, c2, ..., id) > (v1, v2, ..., vid) honouring each
+            # column's direction: c1 > v1 OR (c1 = v1 AND c2 > v2) OR ...
+            alternatives = []
+            for i, (column, descending) in enumerate(columns):
+                terms = [f"{prev} = ?" for prev, _ in columns[:i]]
+                terms.append(f"{column} {'<' if descending else '>'} ?")
+                alternatives.append("(" + " AND ".join(terms) + ")")
+                params.extend(values[:i + 1])
+            clauses.append("(" + " OR ".join(alternatives) + ")")
+            
+            # Redundant bound on the leading column: SQLite cannot seek an
+            # index on the OR expansion alone and would scan from the start
+            first_column, first_descending = columns[0]
+            clauses.append(f"{first_column} {'<=' if first_descending else '>='} ?")
+            params.append(values[0])
+        
+        where_clause = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        order_clause = ", ".join(f"{column}{' DESC' if descending else ''}"
+                                 for column, descending in columns)
+        limit_clause = ""
+        if limit is not None:
+            limit_clause = "LIMIT ?"
+            params.append(limit)
         
-        query = f"""
+        # A dedicated cursor keeps the stream independent of self.cursor
+        cursor = self.conn.execute(f"""
             SELECT 
                 id,
                 name,
@@ -240,65 +1348,160 @@ class AADSDatabase:
                 toc_qualified,
                 created_at
             FROM players
+            {where_clause}
             ORDER BY {order_clause}
-        """
+            {limit_clause}
+        """, params)
         
-        self.cursor.execute(query)
-        return [dict(row) for row in self.cursor.fetchall()]
+        for row in cursor:
+            yield dict(row)
     
+    @_timed
+    def count_players(self, province: Optional[str] = None,
+                      exclude_event: Optional[int] = None,
+                      has_played: Optional[bool] = None,
+                      player_ids: Optional[List[int]] = None,
+                      name_contains: Optional[str] = None) -> int:
+        """Count players matching the same filters as ``iter_players``."""
+        clauses, params = self._player_filters(province, exclude_event, has_played, player_ids,
+                                               name_contains)
+        where_clause = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        return self.conn.execute(f"SELECT COUNT(*) FROM players {where_clause}", params).fetchone()[0]
+    
+    @_timed
+    def get_all_players(self, sort_by: str = "name") -> List[Dict]:
+        """Get all players from master list."""
+        return list(self.iter_players(sort_by))
+    
+    @_timed
     def get_players_by_province(self, province: str) -> List[Dict]:
         """Get all players from a specific province."""
-        self.cursor.execute("""
-            SELECT 
-                id,
-                name,
-                province,
-                status,
-                total_events,
-                toc_qualified
-            FROM players
-            WHERE province = ?
-            ORDER BY name
-        """, (province,))
-        
-        return [dict(row) for row in self.cursor.fetchall()]
+        return list(self.iter_players("name", province=province))
     
+    @_timed
     def get_players_not_in_event(self, event_id: int) -> List[Dict]:
         """Get players who did NOT participate in a specific event."""
-        self.cursor.execute("""
-            SELECT 
-                p.id,
-                p.name,
-                p.province,
-                p.status,
-                p.total_events
-            FROM players p
-            WHERE p.id NOT IN (
-                SELECT player_id 
-                FROM event_participants 
-                WHERE event_id = ?
-            )
-            AND p.total_events > 0
-            ORDER BY p.province, p.total_events DESC
-        """, (event_id,))
+        return self.find_players(none_of=[event_id], among=self.participation.played_any(),
+                                 sort_by="invite")
+    
+    @_timed
+    def find_players(self, all_of: List[int] = (), any_of: List[int] = (),
+                     none_of: List[int] = (), among: Optional[int] = None,
+                     sort_by: str = "name") -> List[Dict]:
+        """Get players by event participation, e.g. played Events 2 and 4 but not 6.
         
-        return [dict(row) for row in self.cursor.fetchall()]
+        The set algebra runs on the in-memory participation index; only the
+        matching players are read from the database.
+        """
+        from participation_index import bits_to_ids
+        bits = self.participation.query(all_of, any_of, none_of, among)
+        return list(self.iter_players(sort_by, player_ids=bits_to_ids(bits)))
     
+    @_timed
     def get_prospects(self) -> List[Dict]:
         """Get all players who have never competed (prospects)."""
-        self.cursor.execute("""
-            SELECT 
-                id,
-                name,
-                province,
-                status
-            FROM players
-            WHERE total_events = 0
-            ORDER BY province, name
-        """)
+        return list(self.iter_players("province", has_played=False))
+    
+    def iter_records(self, record_type, where: str = "", params: Tuple = ()) -> Iterator:
+        """Stream a table as compact ``aads_records`` rows in id order."""
+        # Plain tuples from a dedicated cursor; the record type wraps them
+        # without building an intermediate dict per row
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT {', '.join(record_type._fields)}
+            FROM {record_type.TABLE}
+            {where}
+            ORDER BY id
+        """, params)
+        return map(record_type._make, cursor)
+    
+    @_timed
+    def replace_tables_staged(self, players: Iterator, events: Iterator,
+                              participants: Iterator,
+                              expected: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """Replace players, events and participants with new rows atomically.
         
-        return [dict(row) for row in self.cursor.fetchall()]
+        Rows (in ``aads_records`` field order) are bulk-loaded into shadow
+        tables without indexes, checked for dangling references, then swapped
+        in with a single transaction; indexes are built once afterwards.
+        ``expected`` holds row counts reported by the source (e.g. the
+        cloud's exact counts) per table; a staged table holding a different
+        number means rows were lost or duplicated on the way. Raises
+        ``ValueError`` and leaves the live tables untouched if the data
+        does not validate.
+        """
+        sources = ((Player, players), (Event, events), (Participant, participants))
+        staging = {record_type.TABLE: f"{record_type.TABLE}__staging" for record_type, _ in sources}
+        counts = {}
+        
+        try:
+            for record_type, rows in sources:
+                name = staging[record_type.TABLE]
+                self.cursor.execute(f"DROP TABLE IF EXISTS {name}")
+                self.cursor.execute(STAGING_SCHEMA[record_type.TABLE].format(name=name))
+                # Loading in id order appends to the table's B-tree
+                rows = sorted(rows, key=lambda row: row[0])
+                self.cursor.executemany(f"""
+                    INSERT INTO {name} ({', '.join(record_type._fields)})
+                    VALUES ({', '.join('?' * len(record_type._fields))})
+                """, rows)
+                counts[record_type.TABLE] = len(rows)
+            self.conn.commit()
+            
+            # Validate before touching the live tables
+            for table, total in (expected or {}).items():
+                self.cursor.execute(f"SELECT COUNT(*) FROM {staging[table]}")
+                staged = self.cursor.fetchone()[0]
+                if staged != total:
+                    raise ValueError(f"source reported {total} {table} row(s) but {staged} were staged")
+            
+            self.cursor.execute(f"""
+                SELECT COUNT(*) FROM {staging['event_participants']} ep
+                WHERE ep.player_id NOT IN (SELECT id FROM {staging['players']})
+                   OR ep.event_id NOT IN (SELECT id FROM {staging['events']})
+            """)
+            orphans = self.cursor.fetchone()[0]
+            if orphans:
+                raise ValueError(f"{orphans} participant row(s) reference missing players or events")
+            
+            self.cursor.execute(f"""
+                SELECT COUNT(*) FROM {staging['events']}
+                WHERE winner_id IS NOT NULL
+                  AND winner_id NOT IN (SELECT id FROM {staging['players']})
+            """)
+            orphans = self.cursor.fetchone()[0]
+            if orphans:
+                raise ValueError(f"{orphans} event(s) name a winner that does not exist")
+            
+            # Swap: DDL is transactional in SQLite, so readers see either the
+            # old tables or the new ones, never a mix
+            self.cursor.execute("BEGIN IMMEDIATE")
+            # Summary triggers name the live tables; create_tables restores them
+            self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_summary_%'")
+            for (trigger,) in self.cursor.fetchall():
+                self.cursor.execute(f"DROP TRIGGER {trigger}")
+            for table, name in staging.items():
+                self.cursor.execute(f"DROP TABLE {table}")
+                self.cursor.execute(f"ALTER TABLE {name} RENAME TO {table}")
+            for statement in STAGED_UNIQUE_INDEXES:
+                self.cursor.execute(statement)
+            self.rebuild_summaries(commit=False)
+            
+            # Rebuild secondary indexes and summary triggers on the new tables;
+            # this commits the swap
+            self.create_tables()
+            self.invalidate_caches()
+        except Exception:
+            self.conn.rollback()
+            for name in staging.values():
+                self.cursor.execute(f"DROP TABLE IF EXISTS {name}")
+            self.conn.commit()
+            raise
+        
+        return counts
     
+    @_timed
     def get_event_details(self, event_id: int) -> Optional[Dict]:
         """Get details about a specific event."""
         self.cursor.execute("""
@@ -308,16 +1511,19 @@ class AADSDatabase:
                 e.event_type,
                 e.status,
                 e.event_date,
-                p.name as winner_name,
-                (SELECT COUNT(*) FROM event_participants WHERE event_id = e.id) as participant_count
+                s.winner_name,
+                s.participant_count,
+                s.debut_count,
+                s.veteran_count
             FROM events e
-            LEFT JOIN players p ON e.winner_id = p.id
+            JOIN event_summary s ON s.event_id = e.id
             WHERE e.id = ?
         """, (event_id,))
         
         result = self.cursor.fetchone()
         return dict(result) if result else None
     
+    @_timed
     def get_all_events_summary(self) -> List[Dict]:
         """Get summary of all events."""
         self.cursor.execute("""
@@ -326,34 +1532,50 @@ class AADSDatabase:
                 e.name,
                 e.event_type,
                 e.status,
-                p.name as winner_name,
-                (SELECT COUNT(*) FROM event_participants WHERE event_id = e.id) as participant_count
+                s.winner_name,
+                s.participant_count,
+                s.debut_count,
+                s.veteran_count
             FROM events e
-            LEFT JOIN players p ON e.winner_id = p.id
+            JOIN event_summary s ON s.event_id = e.id
             ORDER BY e.id
         """)
         
         return [dict(row) for row in self.cursor.fetchall()]
     
-    def get_player_history(self, player_name: str) -> Dict:
-        """Get complete history for a specific player."""
+    @_timed
+    def get_dashboard_totals(self) -> Dict:
+        """Player counts by province and status, plus series-wide totals."""
         self.cursor.execute("""
-            SELECT 
-                p.id,
-                p.name,
-                p.province,
-                p.status,
-                p.total_events,
-                p.toc_qualified
-            FROM players p
-            WHERE p.name = ?
-        """, (player_name,))
+            SELECT province, status, players, toc_qualified
+            FROM province_status_summary
+            WHERE players > 0
+            ORDER BY province, status
+        """)
+        by_province: Dict[str, Dict[str, int]] = {}
+        totals = {'players': 0, 'prospects': 0, 'toc_qualified': 0}
+        for row in self.cursor.fetchall():
+            by_province.setdefault(row['province'], {})[row['status']] = row['players']
+            totals['players'] += row['players']
+            totals['toc_qualified'] += row['toc_qualified']
+            if row['status'] == 'Prospect':
+                totals['prospects'] += row['players']
         
-        player = self.cursor.fetchone()
+        self.cursor.execute("SELECT COUNT(*) FROM event_summary WHERE winner_id IS NOT NULL")
+        totals['completed_events'] = self.cursor.fetchone()[0]
+        totals['by_province'] = by_province
+        return totals
+    
+    @_timed
+    def get_player_history(self, player_name: str) -> Dict:
+        """Get complete history for a specific player."""
+        player_id = self.identities.player_id(player_name)
+        player = self.identities.player(player_id) if player_id is not None else None
         if not player:
             return None
         
-        player_dict = dict(player)
+        player_dict = {key: player[key] for key in
+                       ('id', 'name', 'province', 'status', 'total_events', 'toc_qualified')}
         
         # Get events participated in
         self.cursor.execute("""
@@ -361,36 +1583,171 @@ class AADSDatabase:
                 e.id,
                 e.name,
                 ep.is_debut,
-                e.winner_id = p.id as won_event
+                e.winner_id = ep.player_id as won_event
             FROM event_participants ep
             JOIN events e ON ep.event_id = e.id
-            JOIN players p ON ep.player_id = p.id
-            WHERE p.name = ?
+            WHERE ep.player_id = ?
             ORDER BY e.id
-        """, (player_name,))
+        """, (player_id,))
         
         player_dict['events'] = [dict(row) for row in self.cursor.fetchall()]
         
         return player_dict
     
+    def _record_sync_result(self, kind: str, success: bool):
+        """Remember the outcome of a push or pull in the local sync state."""
+        now = datetime.now().isoformat(sep=' ', timespec='seconds')
+        record_sync_outcome(kind, success)
+        if success:
+            self.set_sync_state(f'last_{kind}_at', now, commit=False)
+        self.set_sync_state('last_result', f"{kind} {'succeeded' if success else 'failed'} at {now}")
+    
+    @_timed
     def sync_to_cloud(self) -> bool:
         """Sync local database to Supabase cloud."""
+        self.flush_writes()
         if self.supabase and self.supabase.enabled:
-            return self.supabase.full_sync_to_cloud(self)
+            last_deletion = self.conn.execute("SELECT MAX(deleted_at) FROM tombstones").fetchone()[0]
+            success = self.supabase.full_sync_to_cloud(self)
+            if success and last_deletion is not None:
+                self._note_deletions_pushed(last_deletion, commit=False)
+            self._record_sync_result('push', success)
+            if success:
+                self._maybe_compact_tombstones()
+            return success
         return False
     
-    def pull_from_cloud(self) -> bool:
+    @_timed
+    def pull_from_cloud(self, staged: bool = False) -> bool:
         """Pull data from Supabase cloud to local database."""
+        self.flush_writes()
         if self.supabase and self.supabase.enabled:
-            return self.supabase.pull_from_cloud(self)
+            changes_before = self.conn.total_changes
+            success = self.supabase.pull_from_cloud(self, staged=staged)
+            pulled = self.conn.total_changes > changes_before
+            if not staged:
+                # INSERT OR REPLACE skips delete triggers, so recount
+                self.rebuild_summaries()
+            self.invalidate_caches()
+            self._record_sync_result('pull', success)
+            if success and pulled:
+                # Rows arrive in table order, not event order
+                self.recompute_participation_flags()
+                # Pulled rows are not in the operation log; snapshot them
+                self.oplog.checkpoint()
+            return success
         return False
     
+    @_timed
+    def incremental_pull(self) -> bool:
+        """Pull only rows changed in the cloud since the last pull."""
+        self.flush_writes()
+        if self.supabase and self.supabase.enabled:
+            changes_before = self.conn.total_changes
+            success = self.supabase.incremental_pull(self)
+            pulled = self.conn.total_changes > changes_before
+            self.invalidate_caches()
+            self._record_sync_result('pull', success)
+            if success:
+                self._maybe_compact_tombstones()
+            if success and pulled:
+                self.recompute_participation_flags()
+                self.oplog.checkpoint()
+            return success
+        return False
+    
+    @_timed
+    def verify_against_cloud(self) -> Optional[Dict[str, Dict]]:
+        """Compare local tables with Supabase without downloading them.
+        
+        Returns, per table, the ids missing locally, missing in the cloud
+        and differing, plus the number of requests made; None if sync is
+        not configured.
+        """
+        if not (self.supabase and self.supabase.enabled):
+            return None
+        from merkle_check import compare, SQLiteDigestSource, SupabaseDigestSource
+        return compare(SQLiteDigestSource(self.conn), SupabaseDigestSource(self.supabase.client))
+    
+    def _note_deletions_pushed(self, deleted_at: str, commit: bool = True):
+        """Record that tombstones up to ``deleted_at`` are in the cloud."""
+        self.cursor.execute("""
+            INSERT INTO sync_state (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)
+        """, (PUSHED_DELETIONS_KEY, deleted_at))
+        if commit:
+            self.conn.commit()
+    
+    def get_sync_state(self, key: str) -> Optional[str]:
+        """Read a value from the local sync bookkeeping table."""
+        self.cursor.execute("SELECT value FROM sync_state WHERE key = ?", (key,))
+        result = self.cursor.fetchone()
+        return result[0] if result else None
+    
+    def set_sync_state(self, key: str, value: Optional[str], commit: bool = True):
+        """Store a value in the local sync bookkeeping table."""
+        self.cursor.execute("""
+            INSERT INTO sync_state (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        """, (key, value))
+        if commit:
+            self.conn.commit()
+    
     def test_cloud_connection(self) -> bool:
         """Test connection to Supabase."""
         if self.supabase and self.supabase.enabled:
             return self.supabase.test_connection()
         return False
     
+    def start_auto_sync(self) -> bool:
+        """Start pushing local changes to Supabase in the background."""
+        if self.auto_syncer is not None:
+            return True
+        if not self.supabase or not self.supabase.enabled or self.db_path == ":memory:":
+            return False
+        
+        from sync_scheduler import AutoSyncScheduler
+        self.auto_syncer = AutoSyncScheduler(self.db_path, self.supabase)
+        self.add_change_listener(self.auto_syncer.record_change)
+        return True
+    
+    def stop_auto_sync(self, flush: bool = True):
+        """Stop the background sync worker, pushing queued changes if ``flush``.
+        
+        Changes it does not push are kept in sync_state for the next start.
+        """
+        if self.auto_syncer is None:
+            return
+        
+        self.auto_syncer.stop(flush=flush)
+        self._change_listeners.remove(self.auto_syncer.record_change)
+        self.auto_syncer = None
+    
+    def start_group_commit(self, max_ops: Optional[int] = None, interval: Optional[float] = None):
+        """Commit writes in batches of ``max_ops`` or every ``interval`` seconds.
+        
+        Writes return as soon as their statements ran, which suits check-in
+        desks entering players faster than each commit can reach the disk.
+        Writes not yet committed are lost if the process dies, so close()
+        (or stop_group_commit) must run on exit.
+        """
+        if self.group_committer is None:
+            from group_commit import GroupCommitter
+            self.group_committer = GroupCommitter(self, max_ops, interval)
+        self._group_commit = True
+    
+    def flush_writes(self) -> bool:
+        """Commit writes queued by group commit now, e.g. before bulk operations."""
+        return self.group_committer is None or self.group_committer.flush()
+    
+    def stop_group_commit(self) -> bool:
+        """Commit queued writes and go back to one commit per write."""
+        self._group_commit = False
+        if self.group_committer is None:
+            return True
+        committer, self.group_committer = self.group_committer, None
+        return committer.stop(retries=self.write_retries)
+    
     def get_sync_status(self) -> Dict:
         """Get sync status information."""
         if not self.supabase or not self.supabase.enabled:
@@ -400,16 +1757,35 @@ class AADSDatabase:
                 'message': 'Supabase sync not configured'
             }
         
-        last_sync = self.supabase.get_last_sync_time()
+        # Everything here comes from the local sync_state table, so drawing
+        # the status never touches the network
+        state = dict(self.conn.execute("SELECT key, value FROM sync_state").fetchall())
+        last_sync = max(filter(None, (state.get('last_push_at'), state.get('last_pull_at'))), default=None)
         return {
             'enabled': True,
             'last_sync': last_sync,
+            'last_push': state.get('last_push_at'),
+            'last_pull': state.get('last_pull_at'),
+            'last_result': state.get('last_result'),
+            'watermarks': {key.split('.', 1)[1]: value for key, value in state.items()
+                           if key.startswith('pull_watermark.')},
             'auto_sync': self.auto_sync,
+            'auto_sync_stats': self.auto_syncer.stats() if self.auto_syncer else None,
             'message': 'Connected to Supabase'
         }
     
     def close(self):
         """Close database connection."""
+        # Queued writes commit first so auto-sync can still push them
+        self.stop_group_commit()
+        if self.auto_syncer is not None and self.auto_syncer.queue_depth:
+            print("Pushing pending changes to Supabase...")
+        self.stop_auto_sync()
+        if self._backups is not None:
+            # Let a running snapshot finish rather than leave a partial file
+            self._backups.wait()
+        if self._oplog is not None and self._oplog.snapshots is not None:
+            self._oplog.snapshots.wait()
         self.conn.close()
     
     def __enter__(self):
@@ -4,16 +4,38 @@ Atlantic Armwrestling Development Series Management System
 """
 
 from aads_database import AADSDatabase
+from event_log import describe
+from metrics import start_exporters
 from typing import Optional
+import functools
 import os
+import sys
+
+# Number of players shown per page in the player tables
+PAGE_SIZE = 25
+
+# Menu actions profiled with --profile
+MENU_ACTIONS = (
+    'view_master_list', 'view_by_province', 'view_all_events', 'view_specific_event',
+    'view_invite_candidates', 'view_prospects', 'view_player_history', 'view_season_standings',
+    'simulate_toc_qualification',
+    'view_change_history', 'add_player_to_event', 'set_event_winner', 'add_new_player',
+    'record_placement', 'remove_player_from_event', 'delete_player', 'cloud_sync_menu',
+    'view_sync_status', 'sync_to_cloud', 'pull_from_cloud', 'incremental_pull', 'verify_cloud',
+    'test_cloud_connection', 'initialize_supabase_tables', 'local_backup_menu'
+)
 
 class AADSManager:
-    def __init__(self):
-        self.db = AADSDatabase()
+    def __init__(self, db: Optional[AADSDatabase] = None):
+        self.db = db or AADSDatabase()
     
     def clear_screen(self):
         """Clear the console screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if os.name == 'nt':
+            os.system('cls')
+        else:
+            # ANSI clear and home; running `clear` costs a process per screen
+            print("\033[2J\033[H", end="", flush=True)
     
     def print_header(self, title: str):
         """Print a formatted header."""
@@ -40,6 +62,22 @@ class AADSManager:
             for player in players:
                 print(f"{player['name']:<25} {player['province']:<10} {player['status']:<15}")
     
+    def print_player_pages(self, sort_by: str = "name", show_events: bool = True, **filters):
+        """Print players page by page, fetching only one page at a time."""
+        after = None
+        while True:
+            page = list(self.db.iter_players(sort_by, after=after, limit=PAGE_SIZE, **filters))
+            if after is None or page:
+                self.print_player_table(page, show_events=show_events)
+            if len(page) < PAGE_SIZE:
+                return
+            
+            more = input("\nPress Enter for the next page, or 'q' to stop: ").strip().lower()
+            if more == 'q':
+                return
+            print()
+            after = self.db.player_cursor(page[-1], sort_by)
+    
     def print_event_roster(self, event_id: int):
         """Print the roster for a specific event."""
         event = self.db.get_event_details(event_id)
@@ -89,11 +127,10 @@ class AADSManager:
             elif choice in sort_map:
                 self.clear_screen()
                 sort_by = sort_map[choice]
-                players = self.db.get_all_players(sort_by=sort_by)
                 
                 self.print_header(f"All Players (Sorted by {sort_by.title()})")
-                print(f"Total Players: {len(players)}\n")
-                self.print_player_table(players)
+                print(f"Total Players: {self.db.count_players()}\n")
+                self.print_player_pages(sort_by)
                 
                 input("\nPress Enter to continue...")
                 self.clear_screen()
@@ -117,12 +154,11 @@ class AADSManager:
             elif choice in province_map:
                 self.clear_screen()
                 province = province_map[choice]
-                players = self.db.get_players_by_province(province)
                 
                 province_names = {'NB': 'New Brunswick', 'NS': 'Nova Scotia', 'PEI': 'Prince Edward Island'}
                 self.print_header(f"{province_names[province]} Players")
-                print(f"Total: {len(players)} players\n")
-                self.print_player_table(players)
+                print(f"Total: {self.db.count_players(province=province)} players\n")
+                self.print_player_pages("name", province=province)
                 
                 input("\nPress Enter to continue...")
                 self.clear_screen()
@@ -135,11 +171,11 @@ class AADSManager:
         # Find the most recent completed event
         recent_event = 5  # Event 5 is the most recent completed
         
-        candidates = self.db.get_players_not_in_event(recent_event)
-        
+        # Veterans who missed it, one page at a time like the other listings
+        filters = {'exclude_event': recent_event, 'has_played': True}
         print(f"Players who did NOT participate in Event {recent_event}:")
-        print(f"Total Candidates: {len(candidates)}\n")
-        self.print_player_table(candidates)
+        print(f"Total Candidates: {self.db.count_players(**filters)}\n")
+        self.print_player_pages("invite", **filters)
         
         input("\nPress Enter to continue...")
     
@@ -148,9 +184,8 @@ class AADSManager:
         self.clear_screen()
         self.print_header("PROSPECTS - Players Who Have Never Competed")
         
-        prospects = self.db.get_prospects()
-        print(f"Total Prospects: {len(prospects)}\n")
-        self.print_player_table(prospects, show_events=False)
+        print(f"Total Prospects: {self.db.count_players(has_played=False)}\n")
+        self.print_player_pages("province", show_events=False, has_played=False)
         
         input("\nPress Enter to continue...")
     
@@ -160,14 +195,22 @@ class AADSManager:
         self.print_header("ALL EVENTS SUMMARY")
         
         events = self.db.get_all_events_summary()
+        totals = self.db.get_dashboard_totals()
         
-        print(f"{'ID':<5} {'Event Name':<35} {'Status':<12} {'Participants':<15} {'Winner':<20}")
-        print("-" * 95)
+        print(f"Players: {totals['players']}  |  Prospects: {totals['prospects']}  |  "
+              f"TOC Qualified: {totals['toc_qualified']}  |  Completed Events: {totals['completed_events']}")
+        for province, statuses in totals['by_province'].items():
+            counts = ", ".join(f"{status} {count}" for status, count in statuses.items())
+            print(f"  {province:<4} {counts}")
+        print()
+        
+        print(f"{'ID':<5} {'Event Name':<35} {'Status':<12} {'Participants':<15} {'Debuts':<8} {'Winner':<20}")
+        print("-" * 103)
         
         for event in events:
             winner = event['winner_name'] if event['winner_name'] else "TBD"
             print(f"{event['id']:<5} {event['name']:<35} {event['status']:<12} "
-                  f"{event['participant_count']:<15} {winner:<20}")
+                  f"{event['participant_count']:<15} {event['debut_count']:<8} {winner:<20}")
         
         input("\nPress Enter to continue...")
     
@@ -317,6 +360,169 @@ class AADSManager:
         
         input("\nPress Enter to continue...")
     
+    def view_season_standings(self):
+        """Show season points, win rates and streaks, plus a province breakdown."""
+        self.clear_screen()
+        self.print_header("SEASON STANDINGS")
+        
+        standings = self.db.analytics.standings(limit=PAGE_SIZE)
+        if not standings:
+            print("No results recorded yet.")
+            input("\nPress Enter to continue...")
+            return
+        
+        print(f"{'#':<4} {'Name':<25} {'Prov':<5} {'Pts':>4} {'Evts':>5} {'Wins':>5} "
+              f"{'Pods':>5} {'Win %':>6} {'Best':>5} {'Now':>4}")
+        print("-" * 76)
+        for rank, row in enumerate(standings, 1):
+            print(f"{rank:<4} {row['name']:<25} {row['province']:<5} {row['points']:>4} "
+                  f"{row['events_played']:>5} {row['wins']:>5} {row['podiums']:>5} "
+                  f"{row['win_rate'] * 100:>5.1f}% {row['longest_streak']:>5} {row['current_streak']:>4}")
+        
+        print("\nBy Province:")
+        print(f"{'Province':<10} {'Players':>8} {'Apps':>6} {'Wins':>6} {'Pts':>6} {'Avg Win %':>10}")
+        print("-" * 50)
+        for row in self.db.analytics.province_breakdown():
+            print(f"{row['province']:<10} {row['players']:>8} {row['appearances']:>6} "
+                  f"{row['wins']:>6} {row['points']:>6} {row['avg_win_rate'] * 100:>9.1f}%")
+        
+        input("\nPress Enter to continue...")
+    
+    def simulate_toc_qualification(self):
+        """Estimate each player's chance of reaching the TOC under an invite policy."""
+        self.clear_screen()
+        self.print_header("TOC QUALIFICATION ODDS")
+        
+        # Loaded here so the manager starts without NumPy
+        from season_simulator import SeasonSimulator, INVITE_POLICIES, NUMPY_AVAILABLE
+        for name, description in INVITE_POLICIES.items():
+            print(f"  {name:<10} {description}")
+        policy = input("\nInvite policy [veterans]: ").strip().lower() or 'veterans'
+        try:
+            attendance = float(input("Chance an invited player attends, 0-1 [0.6]: ").strip() or 0.6)
+            seasons = int(input("Seasons to simulate [10000]: ").strip() or 10000)
+            simulator = SeasonSimulator(self.db, policy=policy, attendance=attendance)
+        except ValueError as e:
+            print(f"Invalid input: {e}")
+            input("Press Enter to continue...")
+            return
+        
+        if not simulator.events:
+            print("\nEvery invitational already has a winner; nothing left to simulate.")
+            input("\nPress Enter to continue...")
+            return
+        
+        print(f"\nSimulating {seasons:,} seasons of {', '.join(name for _, name, _, _ in simulator.events)}...")
+        if not NUMPY_AVAILABLE:
+            print("(Install numpy for a much faster simulation: pip install numpy)")
+        report = simulator.run(seasons)
+        print(f"Done in {simulator.last_duration:.1f}s\n")
+        
+        print(f"{'#':<4} {'Name':<25} {'Prov':<5} {'Chance':>9} {'Exp. wins':>9}")
+        print("-" * 56)
+        for rank, row in enumerate(report[:PAGE_SIZE], 1):
+            chance = "qualified" if row['qualified'] else f"{row['probability'] * 100:.1f}%"
+            print(f"{rank:<4} {row['name']:<25} {row['province']:<5} {chance:>9} {row['expected_wins']:>9.2f}")
+        if len(report) > PAGE_SIZE:
+            print(f"\n... and {len(report) - PAGE_SIZE} more players with a chance")
+        
+        input("\nPress Enter to continue...")
+    
+    def record_placement(self):
+        """Record a player's final placement in an event."""
+        self.clear_screen()
+        self.print_header("RECORD PLACEMENT")
+        
+        event_id = input("Enter event number (1-7): ").strip()
+        
+        try:
+            event_id = int(event_id)
+            if not (1 <= event_id <= 7):
+                print("Invalid event number. Must be 1-7.")
+                input("Press Enter to continue...")
+                return
+            
+            self.print_event_roster(event_id)
+            
+            player_name = input("\nEnter player name (exactly as shown above): ").strip()
+            placement = int(input("Enter placement (1 = first): ").strip())
+        except ValueError:
+            print("Please enter a valid number.")
+            input("Press Enter to continue...")
+            return
+        
+        try:
+            if self.db.record_placement(event_id, player_name, placement):
+                print(f"\n✓ {player_name} recorded in place {placement} for Event {event_id}.")
+        except ValueError as e:
+            print(f"\n{e}")
+        input("Press Enter to continue...")
+    
+    def remove_player_from_event(self):
+        """Take a player off an event roster."""
+        self.clear_screen()
+        self.print_header("REMOVE PLAYER FROM EVENT")
+        
+        event_id = input("Enter event number (1-7): ").strip()
+        
+        try:
+            event_id = int(event_id)
+            if not (1 <= event_id <= 7):
+                print("Invalid event number. Must be 1-7.")
+                input("Press Enter to continue...")
+                return
+            
+            self.print_event_roster(event_id)
+            
+            player_name = input("\nEnter player name (exactly as shown above): ").strip()
+            confirm = input(f"Remove {player_name} from Event {event_id}? (yes/no): ").strip().lower()
+            if confirm != 'yes':
+                print("Cancelled.")
+            elif self.db.remove_player_from_event(event_id, player_name):
+                print(f"\n✓ {player_name} removed from Event {event_id}.")
+            else:
+                print("\nError removing player. Please check the player name.")
+            input("Press Enter to continue...")
+            
+        except ValueError:
+            print("Please enter a valid number.")
+            input("Press Enter to continue...")
+    
+    def delete_player(self):
+        """Delete a player from the master list."""
+        self.clear_screen()
+        self.print_header("DELETE PLAYER")
+        
+        player_name = input("Enter player name to delete: ").strip()
+        if not player_name:
+            return
+        
+        print(f"\nThis removes {player_name} and their event history, here and in the cloud.")
+        confirm = input("Type the player's name again to confirm: ").strip()
+        if confirm != player_name:
+            print("Names do not match. Cancelled.")
+        elif self.db.delete_player(player_name):
+            print(f"\n✓ {player_name} deleted.")
+        else:
+            print("\nError deleting player.")
+        input("Press Enter to continue...")
+    
+    def view_change_history(self):
+        """Show the most recent roster operations from the operation log."""
+        self.clear_screen()
+        self.print_header("CHANGE HISTORY")
+        
+        entries = self.db.oplog.recent(PAGE_SIZE)
+        if not entries:
+            print("No changes recorded yet.")
+        else:
+            print(f"{'#':>8}  {'When (UTC)':<20} Change")
+            print("-" * 75)
+            for entry in entries:
+                print(f"{entry['seq']:>8}  {entry['recorded_at']:<20} {describe(entry)}")
+        
+        input("\nPress Enter to continue...")
+    
     def view_sync_status(self):
         """Display Supabase sync status."""
         self.clear_screen()
@@ -329,10 +535,25 @@ class AADSManager:
         
         if status['enabled']:
             print(f"Auto-Sync: {'ON' if status.get('auto_sync') else 'OFF'}")
-            if status['last_sync']:
-                print(f"Last Sync: {status['last_sync']}")
-            else:
-                print("Last Sync: Never")
+            print(f"Last Push: {status['last_push'] or 'Never'}")
+            print(f"Last Pull: {status['last_pull'] or 'Never'}")
+            if status['last_result']:
+                print(f"Last Result: {status['last_result']}")
+            for table, watermark in sorted(status['watermarks'].items()):
+                print(f"Pulled {table} up to: {watermark}")
+            
+            stats = status.get('auto_sync_stats')
+            if stats:
+                print(f"Auto-Sync Queue: {stats['queue_depth']} pending change(s)")
+                print(f"Auto-Sync Pushes: {stats['pushes']} ({stats['rows_pushed']} rows, "
+                      f"{stats['failures']} failed)")
+                if stats['rows_rejected']:
+                    print(f"Auto-Sync Skipped: {stats['rows_rejected']} row(s) older than the cloud copy "
+                          f"(check this computer's clock)")
+                if stats['last_latency'] is not None:
+                    print(f"Auto-Sync Latency: {stats['last_latency']:.1f}s from change to cloud")
+                if stats['last_error']:
+                    print(f"Auto-Sync Error: {stats['last_error']}")
         
         print("\nWhat is Supabase Sync?")
         print("  - Backs up your data to the cloud")
@@ -396,7 +617,7 @@ class AADSManager:
         
         if confirm == 'yes':
             print()
-            success = self.db.pull_from_cloud()
+            success = self.db.pull_from_cloud(staged=True)
             if success:
                 print("\n✓ Local database updated with cloud data!")
             else:
@@ -406,6 +627,66 @@ class AADSManager:
             print("Pull cancelled.")
             input("Press Enter to continue...")
     
+    def incremental_pull(self):
+        """Pull only the changes made in the cloud since the last pull."""
+        self.clear_screen()
+        self.print_header("PULL CHANGES FROM CLOUD")
+        
+        status = self.db.get_sync_status()
+        if not status['enabled']:
+            print("❌ Supabase sync is not enabled.")
+            print("\nPlease configure Supabase first (see Sync Status for instructions).")
+            input("\nPress Enter to continue...")
+            return
+        
+        print("This downloads only rows changed in the cloud since your last pull.")
+        print("Local edits newer than the cloud copy are kept.")
+        print()
+        
+        success = self.db.incremental_pull()
+        if success:
+            print("\n✓ Local database is up to date with the cloud!")
+        else:
+            print("\n❌ Pull failed. Check your connection and credentials.")
+        input("\nPress Enter to continue...")
+    
+    def verify_cloud(self):
+        """Check whether the local database and Supabase hold the same rows."""
+        self.clear_screen()
+        self.print_header("VERIFY LOCAL VS CLOUD")
+        
+        status = self.db.get_sync_status()
+        if not status['enabled']:
+            print("❌ Supabase sync is not enabled.")
+            print("\nPlease configure Supabase first (see Sync Status for instructions).")
+            input("\nPress Enter to continue...")
+            return
+        
+        print("Comparing hash trees over id ranges (requires the setup SQL functions)...\n")
+        try:
+            results = self.db.verify_against_cloud()
+        except Exception as e:
+            print(f"❌ Verification failed: {e}")
+            input("\nPress Enter to continue...")
+            return
+        
+        in_sync = True
+        for table, result in results.items():
+            differences = len(result['missing_local']) + len(result['missing_remote']) + len(result['different'])
+            mark = "✓" if differences == 0 else "✗"
+            print(f"{mark} {table:<20} {differences:>6} differing rows   ({result['round_trips']} requests)")
+            for label, key in (("Only in cloud", 'missing_local'), ("Only local", 'missing_remote'),
+                               ("Changed", 'different')):
+                if result[key]:
+                    in_sync = False
+                    ids = ", ".join(str(row_id) for row_id in result[key][:20])
+                    more = f" ... (+{len(result[key]) - 20})" if len(result[key]) > 20 else ""
+                    print(f"    {label}: {ids}{more}")
+        
+        print("\n✓ Local database and cloud match!" if in_sync
+              else "\nPush or pull to bring the two copies back in line.")
+        input("\nPress Enter to continue...")
+    
     def test_cloud_connection(self):
         """Test connection to Supabase."""
         self.clear_screen()
@@ -469,6 +750,8 @@ class AADSManager:
             print("  3. Pull from Cloud (Restore)")
             print("  4. Test Connection")
             print("  5. Initialize Supabase Tables")
+            print("  6. Pull Changes from Cloud (Incremental)")
+            print("  7. Verify Local vs Cloud")
             print()
             print("  0. Back to Main Menu")
             
@@ -484,6 +767,113 @@ class AADSManager:
                 self.test_cloud_connection()
             elif choice == '5':
                 self.initialize_supabase_tables()
+            elif choice == '6':
+                self.incremental_pull()
+            elif choice == '7':
+                self.verify_cloud()
+            elif choice == '0':
+                break
+            else:
+                print("Invalid option. Please try again.")
+                input("Press Enter to continue...")
+    
+    def print_backup_result(self, result: dict):
+        """Print the outcome of a snapshot or restore."""
+        if 'error' in result:
+            print(f"✗ Backup failed at {result['finished_at']}: {result['error']}")
+            return
+        print(f"✓ {os.path.basename(result['path'])}: {result['pages']} pages in "
+              f"{result['seconds']:.2f}s ({result['pages_per_sec']:,.0f} pages/sec)")
+        for path in result.get('pruned', []):
+            print(f"  Removed old snapshot {os.path.basename(path)}")
+    
+    def choose_snapshot(self) -> Optional[dict]:
+        """List snapshots and let the user pick one."""
+        snapshots = self.db.backups.list_snapshots()
+        if not snapshots:
+            print("No snapshots yet.")
+            return None
+        
+        print(f"{'#':<4} {'Snapshot':<45} {'Created':<20} {'Size':>10}")
+        print("-" * 82)
+        for number, snapshot in enumerate(snapshots, 1):
+            print(f"{number:<4} {snapshot['name']:<45} {snapshot['created']:<20} "
+                  f"{snapshot['bytes'] / 1024:>8.0f}KB")
+        
+        choice = input("\nSnapshot number (Enter to cancel): ").strip()
+        if not choice:
+            return None
+        try:
+            return snapshots[int(choice) - 1]
+        except (ValueError, IndexError):
+            print("Invalid snapshot number.")
+            return None
+    
+    def local_backup_menu(self):
+        """Display local snapshot submenu."""
+        try:
+            backups = self.db.backups
+        except ValueError as e:
+            print(f"\nLocal backups unavailable: {e}")
+            input("Press Enter to continue...")
+            return
+        
+        while True:
+            self.clear_screen()
+            self.print_header("LOCAL BACKUPS - SNAPSHOTS")
+            
+            print(f"Folder: {backups.backup_dir}")
+            print(f"Keeping the newest {backups.retention} snapshots")
+            if backups.running:
+                print("Snapshot in progress...")
+            elif backups.last_result:
+                print("Last snapshot: ", end="")
+                self.print_backup_result(backups.last_result)
+            print()
+            
+            print("BACKUP OPTIONS:")
+            print("  1. Take Snapshot (runs in background)")
+            print("  2. List Snapshots")
+            print("  3. Restore Snapshot")
+            print()
+            print("  0. Back to Main Menu")
+            
+            choice = input("\nSelect option: ").strip()
+            
+            if choice == '1':
+                if backups.snapshot_in_background():
+                    print("\nSnapshot started; you can keep working.")
+                else:
+                    print("\nA snapshot is already running.")
+                input("Press Enter to continue...")
+            elif choice == '2':
+                self.clear_screen()
+                self.print_header("SNAPSHOTS")
+                snapshots = backups.list_snapshots()
+                if not snapshots:
+                    print("No snapshots yet.")
+                for snapshot in snapshots:
+                    print(f"  {snapshot['name']:<45} {snapshot['created']:<20} "
+                          f"{snapshot['bytes'] / 1024:>8.0f}KB")
+                input("\nPress Enter to continue...")
+            elif choice == '3':
+                self.clear_screen()
+                self.print_header("RESTORE SNAPSHOT")
+                if backups.running:
+                    print("Waiting for the running snapshot to finish...")
+                    backups.wait()
+                snapshot = self.choose_snapshot()
+                if snapshot:
+                    print(f"\n⚠️  WARNING: This will replace ALL local data with {snapshot['name']}!")
+                    print("The current data is snapshotted first.")
+                    confirm = input("Are you sure you want to continue? (yes/no): ").strip().lower()
+                    if confirm == 'yes':
+                        result = self.db.restore_snapshot(snapshot['path'])
+                        print(f"\n✓ Restored {result['pages']} pages in {result['seconds']:.2f}s "
+                              f"({result['pages_per_sec']:,.0f} pages/sec)")
+                    else:
+                        print("Cancelled.")
+                input("\nPress Enter to continue...")
             elif choice == '0':
                 break
             else:
@@ -539,8 +929,19 @@ class AADSManager:
             print("  9.  Set Event Winner")
             print("  10. Add New Player to Master List")
             print()
-            print("CLOUD BACKUP:")
+            print("BACKUP & SYNC:")
             print("  11. Cloud Sync (Supabase)")
+            print("  12. Local Backups (Snapshots)")
+            print()
+            print("SEASON OPTIONS:")
+            print("  13. View Season Standings")
+            print("  14. View Change History")
+            print("  15. Simulate TOC Qualification Odds")
+            print()
+            print("RESULTS & CORRECTIONS:")
+            print("  16. Record Placement")
+            print("  17. Remove Player from Event")
+            print("  18. Delete Player")
             print()
             print("  0.  Exit Program")
             
@@ -568,6 +969,20 @@ class AADSManager:
                 self.add_new_player()
             elif choice == '11':
                 self.cloud_sync_menu()
+            elif choice == '12':
+                self.local_backup_menu()
+            elif choice == '13':
+                self.view_season_standings()
+            elif choice == '14':
+                self.view_change_history()
+            elif choice == '15':
+                self.simulate_toc_qualification()
+            elif choice == '16':
+                self.record_placement()
+            elif choice == '17':
+                self.remove_player_from_event()
+            elif choice == '18':
+                self.delete_player()
             elif choice == '0':
                 print("\nThank you for using AADS Series Manager!")
                 break
@@ -576,16 +991,39 @@ class AADSManager:
                 input("Press Enter to continue...")
     
     def close(self):
-        """Close database connection."""
+        """Close the database, which commits queued writes and flushes background sync."""
         self.db.close()
 
-def main():
-    """Main entry point for the AADS Manager."""
+def main(profiler=None):
+    """Main entry point for the AADS Manager.
+    
+    ``--profile`` (or a ``profiler`` from quick_start) profiles every menu
+    action and writes the stats to profiles/ on exit. METRICS_PORT and
+    METRICS_TEXTFILE export the metrics registry while the manager runs.
+    """
+    if profiler is None and '--profile' in sys.argv[1:]:
+        from action_profiler import ActionProfiler
+        profiler = ActionProfiler()
+    
     manager = AADSManager()
+    if profiler:
+        profiler.wrap(manager, MENU_ACTIONS)
+    exporters = start_exporters()
     try:
+        if '--tui' in sys.argv[1:]:
+            from aads_tui import run_tui
+            run = run_tui if profiler is None else functools.partial(profiler.run, 'tui', run_tui)
+            if run(manager.db):
+                return
         manager.main_menu()
     finally:
         manager.close()
+        for exporter in exporters:
+            exporter.stop()
+        if profiler:
+            report = profiler.finish()
+            if report:
+                print(f"Profile written to {report}")
 
 if __name__ == "__main__":
     main()
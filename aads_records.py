@@ -0,0 +1,160 @@
+"""
+AADS Series Record Types
+Compact tuple-backed rows used instead of per-row dicts on bulk read paths
+"""
+
+import re
+from collections import namedtuple
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+
+def to_local_timestamp(value: Optional[str]) -> Optional[str]:
+    """Convert a Supabase timestamp to SQLite's UTC 'YYYY-MM-DD HH:MM:SS' form."""
+    if not value:
+        return value
+    
+    text = value.replace('T', ' ').replace('Z', '+00:00')
+    # Older Pythons only parse 3- or 6-digit fractions
+    text = re.sub(r'\.(\d+)', lambda m: '.' + (m.group(1) + '000000')[:6], text)
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return value
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def to_cloud_timestamp(value: Optional[str]) -> Optional[str]:
+    """Convert a local UTC 'YYYY-MM-DD HH:MM:SS' timestamp to ISO 8601 for Supabase."""
+    if not value:
+        return None
+    return value.replace(' ', 'T') + '+00:00'
+
+
+class RecordMixin:
+    """Dict-style access for tuple-backed records, so they can stand in for rows."""
+    __slots__ = ()
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field value, or ``default`` if the record has no such field."""
+        return getattr(self, key) if key in self._fields else default
+    
+    @classmethod
+    def coerce(cls, row):
+        """Return ``row`` as this record type, converting dicts field by field."""
+        if isinstance(row, cls):
+            return row
+        return cls._make(row.get(field) for field in cls._fields)
+    
+    def to_push(self) -> Dict:
+        """The cloud payload plus the local change time.
+        
+        The server keeps its own copy when that is newer, and only restamps
+        a row whose content changed; see set_updated_at() in the setup SQL.
+        """
+        payload = self.to_cloud()
+        if 'updated_at' in self._fields:
+            payload['updated_at'] = to_cloud_timestamp(self.updated_at)
+        return payload
+
+
+class Player(RecordMixin, namedtuple('Player', 'id name province status total_events '
+                                               'toc_qualified created_at updated_at')):
+    __slots__ = ()
+    TABLE = 'players'
+    
+    def to_cloud(self) -> Dict:
+        """Convert to the Supabase payload format."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'province': self.province,
+            'status': self.status,
+            'total_events': self.total_events,
+            'toc_qualified': bool(self.toc_qualified)
+        }
+    
+    @classmethod
+    def from_cloud(cls, data: Dict) -> 'Player':
+        """Convert a Supabase row to local SQLite values."""
+        return cls(
+            data['id'], data['name'], data['province'], data['status'],
+            data['total_events'], 1 if data['toc_qualified'] else 0,
+            to_local_timestamp(data.get('created_at')), to_local_timestamp(data.get('updated_at'))
+        )
+
+
+class Event(RecordMixin, namedtuple('Event', 'id name event_type event_date winner_id status '
+                                             'updated_at')):
+    __slots__ = ()
+    TABLE = 'events'
+    
+    def to_cloud(self) -> Dict:
+        """Convert to the Supabase payload format."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'event_type': self.event_type,
+            'event_date': self.event_date,
+            'winner_id': self.winner_id,
+            'status': self.status
+        }
+    
+    @classmethod
+    def from_cloud(cls, data: Dict) -> 'Event':
+        """Convert a Supabase row to local SQLite values."""
+        return cls(
+            data['id'], data['name'], data['event_type'], data.get('event_date'),
+            data.get('winner_id'), data['status'], to_local_timestamp(data.get('updated_at'))
+        )
+
+
+class Participant(RecordMixin, namedtuple('Participant', 'id event_id player_id is_debut '
+                                                         'is_veteran placement added_at updated_at')):
+    __slots__ = ()
+    TABLE = 'event_participants'
+    
+    def to_cloud(self) -> Dict:
+        """Convert to the Supabase payload format."""
+        return {
+            'id': self.id,
+            'event_id': self.event_id,
+            'player_id': self.player_id,
+            'is_debut': bool(self.is_debut),
+            'is_veteran': bool(self.is_veteran),
+            'placement': self.placement
+        }
+    
+    @classmethod
+    def from_cloud(cls, data: Dict) -> 'Participant':
+        """Convert a Supabase row to local SQLite values."""
+        return cls(
+            data['id'], data['event_id'], data['player_id'],
+            1 if data['is_debut'] else 0, 1 if data['is_veteran'] else 0,
+            data.get('placement'), to_local_timestamp(data.get('added_at')),
+            to_local_timestamp(data.get('updated_at'))
+        )
+
+
+class Tombstone(RecordMixin, namedtuple('Tombstone', 'id table_name row_id deleted_at')):
+    __slots__ = ()
+    TABLE = 'tombstones'
+    
+    def to_cloud(self) -> Dict:
+        """Convert to the Supabase payload format (the server stamps deleted_at)."""
+        return {
+            'table_name': self.table_name,
+            'row_id': self.row_id
+        }
+    
+    @classmethod
+    def from_cloud(cls, data: Dict) -> 'Tombstone':
+        """Convert a Supabase row to local SQLite values."""
+        return cls(None, data['table_name'], data['row_id'], to_local_timestamp(data.get('deleted_at')))
@@ -0,0 +1,356 @@
+"""
+AADS Series Manager - Terminal UI
+Full-screen curses interface with virtualized, live-filtered player tables
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from metrics import CACHE_REQUESTS
+
+try:
+    import curses
+    CURSES_AVAILABLE = True
+except ImportError:
+    CURSES_AVAILABLE = False
+
+# Rows fetched per database query, and how many such blocks stay cached
+BLOCK_SIZE = 100
+MAX_CACHED_BLOCKS = 8
+
+# Pause after the last keystroke before a search re-queries (milliseconds)
+SEARCH_DEBOUNCE_MS = 120
+
+SORT_ORDER = ("name", "province", "participation", "status")
+PROVINCE_FILTERS = (None, "NB", "NS", "PEI")
+
+HELP = " ↑↓ PgUp PgDn Home End  / search  s sort  p province  Enter details  e events  q quit "
+
+
+class PlayerWindow:
+    def __init__(self, db, block_size: int = BLOCK_SIZE, max_blocks: int = MAX_CACHED_BLOCKS):
+        """Virtual view over a sorted, filtered player listing.
+
+        Rows are read a block at a time with keyset cursors, and only the
+        blocks around the viewport are kept, so scrolling 100k players costs
+        the same memory as scrolling 100.
+        """
+        self.db = db
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.sort_by = "name"
+        self.filters: Dict[str, Any] = {}
+        self.fetches = 0
+        self.reset()
+    
+    def reset(self):
+        """Forget cached rows, e.g. after the query or the data changed."""
+        self._starts: List[Optional[Tuple[Any, int]]] = [None]  # cursor that begins each block
+        self._blocks: "OrderedDict[int, List[Dict]]" = OrderedDict()
+        self.total = self.db.count_players(**self.filters)
+    
+    def set_query(self, sort_by: Optional[str] = None, **filters):
+        """Change the sort order and/or filters and start over from the top."""
+        if sort_by is not None:
+            self.sort_by = sort_by
+        self.filters.update(filters)
+        self.filters = {key: value for key, value in self.filters.items() if value not in (None, "")}
+        self.reset()
+    
+    def _block(self, index: int) -> List[Dict]:
+        """Rows of block ``index``, fetching (and walking to) it if needed."""
+        if index in self._blocks:
+            CACHE_REQUESTS.inc(cache='player_blocks', result='hit')
+            self._blocks.move_to_end(index)
+            return self._blocks[index]
+        CACHE_REQUESTS.inc(cache='player_blocks', result='miss')
+        
+        # Keyset pagination can only resume after a known row, so walk
+        # forward from the furthest block whose starting cursor is known
+        while len(self._starts) <= index:
+            if len(self._block(len(self._starts) - 1)) < self.block_size:
+                return []
+        
+        rows = list(self.db.iter_players(self.sort_by, after=self._starts[index],
+                                         limit=self.block_size, **self.filters))
+        self.fetches += 1
+        if len(rows) == self.block_size and len(self._starts) == index + 1:
+            self._starts.append(self.db.player_cursor(rows[-1], self.sort_by))
+        
+        self._blocks[index] = rows
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return rows
+    
+    def rows(self, offset: int, count: int) -> List[Dict]:
+        """Rows ``offset`` to ``offset + count`` of the listing."""
+        result = []
+        position = offset
+        while len(result) < count:
+            block = self._block(position // self.block_size)
+            chunk = block[position % self.block_size:][:count - len(result)]
+            if not chunk:
+                break
+            result.extend(chunk)
+            position += len(chunk)
+        return result
+
+
+def format_player(player: Dict, width: int) -> str:
+    """One table line for a player, cut to ``width`` columns."""
+    toc = "✓" if player.get('toc_qualified') else ""
+    line = (f" {player['name']:<25} {player['province']:<10} {player['status']:<15} "
+            f"{player.get('total_events', 0):<8} {toc:<5}")
+    return line[:width]
+
+
+class AADSTui:
+    def __init__(self, stdscr, db):
+        """Full-screen manager UI on a curses screen."""
+        self.stdscr = stdscr
+        self.db = db
+        self.players = PlayerWindow(db)
+        self.view = "players"
+        self.top = 0
+        self.selected = 0
+        self.sort_index = 0
+        self.province_index = 0
+        self.search = ""
+        self.searching = False
+        self.search_pending = False
+        self.message = ""
+        self.last_frame_ms = 0.0
+        
+        # Lines currently on screen, so a frame only rewrites what changed
+        self._shown: Dict[Tuple[str, int], Tuple[str, int]] = {}
+        
+        curses.curs_set(0)
+        curses.use_default_colors()
+        self.stdscr.keypad(True)
+        self._layout()
+    
+    def _layout(self):
+        """Split the screen into header, table and status windows."""
+        height, width = self.stdscr.getmaxyx()
+        self.width = width
+        self.body_height = max(1, height - 4)
+        self.header = curses.newwin(2, width, 0, 0)
+        self.body = curses.newwin(self.body_height, width, 2, 0)
+        self.status = curses.newwin(2, width, height - 2, 0)
+        self._shown.clear()
+        self.stdscr.erase()
+        self.stdscr.noutrefresh()
+    
+    def _put(self, window, name: str, y: int, text: str, attr: int = 0) -> bool:
+        """Write one line unless it is already showing; True if it changed."""
+        text = text[:self.width - 1].ljust(self.width - 1)
+        if self._shown.get((name, y)) == (text, attr):
+            return False
+        self._shown[(name, y)] = (text, attr)
+        try:
+            window.addstr(y, 0, text, attr)
+        except curses.error:
+            # Writing into the last cell of a window always raises
+            pass
+        return True
+    
+    def draw(self):
+        """Redraw the regions whose contents changed."""
+        started = time.perf_counter()
+        if self.view == "players":
+            self._draw_players()
+        else:
+            self._draw_events()
+        self._draw_status()
+        curses.doupdate()
+        self.last_frame_ms = (time.perf_counter() - started) * 1000
+    
+    def _draw_players(self):
+        """Header plus the visible slice of the player table."""
+        province = PROVINCE_FILTERS[self.province_index] or "All"
+        title = (f" AADS Master List  |  {self.players.total} players  |  "
+                 f"sort: {SORT_ORDER[self.sort_index]}  |  province: {province}")
+        changed = self._put(self.header, "header", 0, title, curses.A_BOLD)
+        columns = f" {'Name':<25} {'Province':<10} {'Status':<15} {'Events':<8} {'TOC':<5}"
+        changed |= self._put(self.header, "header", 1, columns, curses.A_UNDERLINE)
+        if changed:
+            self.header.noutrefresh()
+        
+        rows = self.players.rows(self.top, self.body_height)
+        changed = False
+        for y in range(self.body_height):
+            if y < len(rows):
+                attr = curses.A_REVERSE if self.top + y == self.selected else 0
+                changed |= self._put(self.body, "body", y, format_player(rows[y], self.width), attr)
+            else:
+                changed |= self._put(self.body, "body", y, "")
+        if changed:
+            self.body.noutrefresh()
+    
+    def _draw_events(self):
+        """Events summary and series totals from the summary tables."""
+        totals = self.db.get_dashboard_totals()
+        title = (f" AADS Events  |  players {totals['players']}  prospects {totals['prospects']}  "
+                 f"TOC qualified {totals['toc_qualified']}  completed {totals['completed_events']}")
+        changed = self._put(self.header, "header", 0, title, curses.A_BOLD)
+        columns = f" {'ID':<4} {'Event Name':<35} {'Status':<12} {'Players':<9} {'Debuts':<8} {'Winner':<20}"
+        changed |= self._put(self.header, "header", 1, columns, curses.A_UNDERLINE)
+        if changed:
+            self.header.noutrefresh()
+        
+        lines = []
+        for event in self.db.get_all_events_summary():
+            lines.append(f" {event['id']:<4} {event['name']:<35} {event['status']:<12} "
+                         f"{event['participant_count']:<9} {event['debut_count']:<8} "
+                         f"{event['winner_name'] or 'TBD':<20}")
+        lines.append("")
+        for province, statuses in totals['by_province'].items():
+            lines.append(f" {province:<4} " + ", ".join(f"{status} {count}" for status, count in statuses.items()))
+        
+        changed = False
+        for y in range(self.body_height):
+            changed |= self._put(self.body, "body", y, lines[y] if y < len(lines) else "")
+        if changed:
+            self.body.noutrefresh()
+    
+    def _draw_status(self):
+        """Search prompt or message line, plus key help."""
+        if self.searching:
+            line = f" Search: {self.search}_"
+        elif self.message:
+            line = f" {self.message}"
+        else:
+            line = (f" row {min(self.selected + 1, self.players.total)}/{self.players.total}  "
+                    f"{self.players.fetches} queries  frame {self.last_frame_ms:.1f} ms")
+        changed = self._put(self.status, "status", 0, line)
+        changed |= self._put(self.status, "status", 1, HELP, curses.A_REVERSE)
+        if changed:
+            self.status.noutrefresh()
+    
+    def move(self, delta: int):
+        """Move the selection, scrolling the viewport to keep it visible."""
+        last = max(0, self.players.total - 1)
+        self.selected = min(max(0, self.selected + delta), last)
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.body_height:
+            self.top = self.selected - self.body_height + 1
+    
+    def requery(self, **changes):
+        """Apply new sort/filter settings and jump back to the top."""
+        self.players.set_query(**changes)
+        self.top = self.selected = 0
+    
+    def show_details(self):
+        """Pop up the selected player's event history."""
+        rows = self.players.rows(self.selected, 1)
+        if not rows:
+            return
+        history = self.db.get_player_history(rows[0]['name'])
+        if not history:
+            return
+        
+        lines = [f" {history['name']} ({history['province']}) - {history['status']}",
+                 f" Events: {history['total_events']}   TOC: {'Yes' if history['toc_qualified'] else 'No'}",
+                 ""]
+        for event in history['events']:
+            won = "  WINNER" if event['won_event'] else ""
+            lines.append(f" {event['name']:<35} {'DEBUT' if event['is_debut'] else 'VETERAN'}{won}")
+        if not history['events']:
+            lines.append(" No event history (Prospect)")
+        lines.append("")
+        lines.append(" Press any key")
+        
+        height = min(len(lines) + 2, self.body_height + 2)
+        width = min(max(len(line) for line in lines) + 3, self.width)
+        popup = curses.newwin(height, width, 2, max(0, (self.width - width) // 2))
+        popup.box()
+        for y, line in enumerate(lines[:height - 2]):
+            popup.addnstr(y + 1, 1, line, width - 2)
+        popup.refresh()
+        popup.getch()
+        # The popup covered part of the table: force those lines to redraw
+        self.body.touchwin()
+        self._shown = {key: value for key, value in self._shown.items() if key[0] != "body"}
+    
+    def handle_search_key(self, key: int):
+        """Edit the live search text."""
+        if key in (27, 10, 13, curses.KEY_ENTER):
+            self.searching = False
+        elif key in (curses.KEY_BACKSPACE, 127, 8):
+            self.search = self.search[:-1]
+            self.search_pending = True
+        elif 32 <= key < 127:
+            self.search += chr(key)
+            self.search_pending = True
+    
+    def handle_key(self, key: int) -> bool:
+        """React to a key press; returns False to quit."""
+        self.message = ""
+        if key == curses.KEY_RESIZE:
+            self._layout()
+        elif key in (ord('q'), ord('Q')):
+            return False
+        elif key == ord('e'):
+            self.view = "events" if self.view == "players" else "players"
+            self._shown.clear()
+            self.body.erase()
+        elif self.view != "players":
+            return True
+        elif key in (curses.KEY_DOWN, ord('j')):
+            self.move(1)
+        elif key in (curses.KEY_UP, ord('k')):
+            self.move(-1)
+        elif key == curses.KEY_NPAGE:
+            self.move(self.body_height)
+        elif key == curses.KEY_PPAGE:
+            self.move(-self.body_height)
+        elif key == curses.KEY_HOME:
+            self.move(-self.selected)
+        elif key == curses.KEY_END:
+            self.move(self.players.total)
+        elif key == ord('/'):
+            self.searching = True
+        elif key == ord('s'):
+            self.sort_index = (self.sort_index + 1) % len(SORT_ORDER)
+            self.requery(sort_by=SORT_ORDER[self.sort_index])
+        elif key == ord('p'):
+            self.province_index = (self.province_index + 1) % len(PROVINCE_FILTERS)
+            self.requery(province=PROVINCE_FILTERS[self.province_index])
+        elif key in (10, 13, curses.KEY_ENTER):
+            self.show_details()
+        return True
+    
+    def run(self):
+        """Main loop: draw, wait for a key, repeat."""
+        while True:
+            self.draw()
+            # While typing a search, wait briefly so a burst of keys costs one query
+            self.stdscr.timeout(SEARCH_DEBOUNCE_MS if self.search_pending else -1)
+            key = self.stdscr.getch()
+            
+            if key == -1:
+                if self.search_pending:
+                    self.search_pending = False
+                    self.requery(name_contains=self.search)
+                continue
+            
+            if self.searching:
+                self.handle_search_key(key)
+                if not self.searching and self.search_pending:
+                    self.search_pending = False
+                    self.requery(name_contains=self.search)
+            elif not self.handle_key(key):
+                return
+
+
+def run_tui(db) -> bool:
+    """Run the full-screen UI; returns False if curses is unavailable."""
+    if not CURSES_AVAILABLE:
+        print("Warning: curses not available. Full-screen mode disabled.")
+        print("Install with: pip install windows-curses")
+        return False
+    
+    curses.wrapper(lambda stdscr: AADSTui(stdscr, db).run())
+    return True
@@ -0,0 +1,134 @@
+"""
+Action Profiler for AADS Series
+Profiles each menu action with cProfile and reports where the time went:
+SQL, network, rendering or waiting for the operator
+"""
+
+import cProfile
+import functools
+import os
+import pstats
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+PROFILE_DIR = 'profiles'
+
+CATEGORIES = ('sql', 'network', 'rendering', 'input', 'other')
+
+# Pure-Python modules whose own time counts as network time
+NETWORK_MODULES = ('httpx', 'httpcore', 'h11', 'h2', 'ssl.py', 'socket.py', 'postgrest',
+                   'supabase', 'gotrue', 'storage3', 'realtime')
+
+
+def categorize(function: tuple) -> str:
+    """Category of a pstats function key (filename, line, name)."""
+    filename, _, name = function
+    if filename == '~':
+        if 'sqlite3' in name:
+            return 'sql'
+        if 'socket' in name or '_ssl' in name or 'getaddrinfo' in name:
+            return 'network'
+        if name == '<built-in method builtins.input>':
+            return 'input'
+        if name in ('<built-in method builtins.print>', "<method 'write' of '_io.TextIOWrapper' objects>",
+                    "<method 'flush' of '_io.TextIOWrapper' objects>") or name.endswith('.system>'):
+            return 'rendering'
+        return 'other'
+    path = filename.replace('\\', '/')
+    if any(f'/{module}' in path for module in NETWORK_MODULES):
+        return 'network'
+    return 'other'
+
+
+def breakdown(stats: pstats.Stats) -> Dict[str, float]:
+    """Seconds spent in each category; own time only, so nothing is counted twice."""
+    totals = dict.fromkeys(CATEGORIES, 0.0)
+    for function, (_, _, own_time, _, _) in stats.stats.items():
+        totals[categorize(function)] += own_time
+    return totals
+
+
+class ActionProfiler:
+    def __init__(self, output_dir: str = PROFILE_DIR):
+        """Collects one cProfile per action name.
+
+        Only objects passed to ``wrap()`` are affected, so a manager started
+        without ``--profile`` runs its methods untouched.
+        """
+        self.output_dir = output_dir
+        self.stats: Dict[str, pstats.Stats] = {}
+        self.calls: Dict[str, int] = {}
+        self.wall: Dict[str, float] = {}
+        self._active: List[cProfile.Profile] = []
+    
+    def run(self, name: str, func, *args, **kwargs):
+        """Call ``func`` under a profile recorded as ``name``.
+
+        A nested action gets its own profile; the outer one is paused
+        meanwhile, so each action's stats cover only its own work.
+        """
+        profile = cProfile.Profile()
+        if self._active:
+            self._active[-1].disable()
+        self._active.append(profile)
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            self._active.pop()
+            if self._active:
+                self._active[-1].enable()
+            self._record(name, profile, elapsed)
+    
+    def _record(self, name: str, profile: cProfile.Profile, elapsed: float):
+        if name in self.stats:
+            self.stats[name].add(profile)
+        else:
+            self.stats[name] = pstats.Stats(profile)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.wall[name] = self.wall.get(name, 0.0) + elapsed
+    
+    def wrap(self, target, names):
+        """Replace the named methods of ``target`` with profiled versions."""
+        for name in names:
+            method = getattr(target, name)
+            
+            @functools.wraps(method)
+            def profiled(*args, _name=name, _method=method, **kwargs):
+                return self.run(_name, _method, *args, **kwargs)
+            
+            setattr(target, name, profiled)
+    
+    def report(self) -> str:
+        """Per-action table of calls, wall time and time per category."""
+        lines = [f"AADS action profile - {datetime.now().isoformat(sep=' ', timespec='seconds')}",
+                 "Seconds of own time per category; 'input' is time waiting for the operator.", "",
+                 f"{'action':<28} {'calls':>5} {'wall':>8} " + ' '.join(f"{c:>9}" for c in CATEGORIES),
+                 "-" * (44 + 10 * len(CATEGORIES))]
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        for name in sorted(self.stats, key=lambda n: self.wall[n], reverse=True):
+            parts = breakdown(self.stats[name])
+            for category in CATEGORIES:
+                totals[category] += parts[category]
+            lines.append(f"{name:<28} {self.calls[name]:>5} {self.wall[name]:>8.3f} "
+                         + ' '.join(f"{parts[c]:>9.3f}" for c in CATEGORIES))
+        lines.append("-" * (44 + 10 * len(CATEGORIES)))
+        lines.append(f"{'total':<28} {sum(self.calls.values()):>5} {sum(self.wall.values()):>8.3f} "
+                     + ' '.join(f"{totals[c]:>9.3f}" for c in CATEGORIES))
+        return '\n'.join(lines) + '\n'
+    
+    def finish(self) -> Optional[str]:
+        """Write ``<action>.prof`` files and ``report.txt``; returns the report path."""
+        if not self.stats:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        for name, stats in self.stats.items():
+            stats.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+        path = os.path.join(self.output_dir, 'report.txt')
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(self.report())
+        return path
@@ -5,6 +5,7 @@ let supabaseClient = null;
 let players = [];
 let events = [];
 let eventParticipants = [];
+let tombstones = [];
 
 // Initialize app on page load
 document.addEventListener('DOMContentLoaded', () => {
@@ -108,6 +109,7 @@ function resetLocalData() {
     localStorage.removeItem('aads_players');
     localStorage.removeItem('aads_events');
     localStorage.removeItem('aads_participants');
+    localStorage.removeItem('aads_tombstones');
     
     showToast('Data reset! Reloading...', 'success');
     setTimeout(() => location.reload(), 1000);
@@ -224,16 +226,19 @@ function saveLocalData() {
     localStorage.setItem('aads_players', JSON.stringify(players));
     localStorage.setItem('aads_events', JSON.stringify(events));
     localStorage.setItem('aads_participants', JSON.stringify(eventParticipants));
+    localStorage.setItem('aads_tombstones', JSON.stringify(tombstones));
 }
 
 function loadLocalData() {
     const storedPlayers = localStorage.getItem('aads_players');
     const storedEvents = localStorage.getItem('aads_events');
     const storedParticipants = localStorage.getItem('aads_participants');
+    const storedTombstones = localStorage.getItem('aads_tombstones');
     
     if (storedPlayers) players = JSON.parse(storedPlayers);
     if (storedEvents) events = JSON.parse(storedEvents);
     if (storedParticipants) eventParticipants = JSON.parse(storedParticipants);
+    if (storedTombstones) tombstones = JSON.parse(storedTombstones);
 }
 
 // Initialize demo data
@@ -386,10 +391,17 @@ function updateDashboard() {
     document.getElementById('toc-qualified').textContent = players.filter(p => p.toc_qualified).length;
     document.getElementById('prospects-count').textContent = players.filter(p => p.total_events === 0).length;
     
+    // Count rosters and index players in one pass instead of rescanning per event
+    const participantCounts = new Map();
+    eventParticipants.forEach(ep => {
+        participantCounts.set(ep.event_id, (participantCounts.get(ep.event_id) || 0) + 1);
+    });
+    const playerNames = new Map(players.map(p => [p.id, p.name]));
+    
     // Update events summary
     const summaryHTML = events.map(event => {
-        const participants = eventParticipants.filter(ep => ep.event_id === event.id).length;
-        const winner = event.winner_id ? players.find(p => p.id === event.winner_id)?.name : 'TBD';
+        const participants = participantCounts.get(event.id) || 0;
+        const winner = event.winner_id ? playerNames.get(event.winner_id) : 'TBD';
         
         return `
             <div class="event-card">
@@ -748,7 +760,14 @@ function addToRoster(eventId, playerId) {
 function removeFromRoster(eventId, playerId) {
     const index = eventParticipants.findIndex(ep => ep.event_id === eventId && ep.player_id === playerId);
     if (index !== -1) {
-        eventParticipants.splice(index, 1);
+        const [removed] = eventParticipants.splice(index, 1);
+        
+        // Remember the deletion so the next sync removes the cloud row too
+        tombstones.push({
+            table_name: 'event_participants',
+            row_id: removed.id,
+            deleted_at: new Date().toISOString()
+        });
         
         // Update player stats
         const player = players.find(p => p.id === playerId);
@@ -845,6 +864,22 @@ async function syncToCloud() {
             await supabaseClient.from('event_participants').upsert(ep);
         }
         
+        // Propagate deletions, then forget them once the cloud has them
+        if (tombstones.length > 0) {
+            await supabaseClient.from('tombstones').upsert(
+                tombstones.map(t => ({ table_name: t.table_name, row_id: t.row_id })),
+                { onConflict: 'table_name,row_id', ignoreDuplicates: true }
+            );
+            for (const table of ['event_participants', 'events', 'players']) {
+                const ids = tombstones.filter(t => t.table_name === table).map(t => t.row_id);
+                if (ids.length > 0) {
+                    await supabaseClient.from(table).delete().in('id', ids);
+                }
+            }
+            tombstones = [];
+            saveLocalData();
+        }
+        
         showToast('✓ Successfully synced to cloud!', 'success');
         updateSyncStatus('Synced • Last: just now', true);
     } catch (error) {
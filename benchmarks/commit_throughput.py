@@ -0,0 +1,86 @@
+"""
+Group Commit Benchmark
+Checks players in to an event one add_player_to_event call at a time, as a
+desk would, with a commit per call and with group commit at several batch
+sizes, reporting writes per second and how long each call kept the desk waiting
+"""
+
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from synthetic import populate
+from aads_database import AADSDatabase, COMMITS
+
+EVENT_ID = 999
+
+
+def check_ins(count: int, players: int):
+    """(name, province) pairs: every other one a returning player, the rest walk-ins."""
+    for i in range(count):
+        if i % 2 and players:
+            yield f"Player {1 + (i * 7919) % players:07d}", 'NB'
+        else:
+            yield f"Walk-in {i:06d}", ('NB', 'NS', 'PEI')[i % 3]
+
+
+def run(label: str, path: str, args, max_ops=None):
+    db = AADSDatabase(path, enable_sync=False, group_commit=False)
+    populate(db, players=args.players, events=10, per_event=max(1, args.players // 10))
+    db.conn.execute("INSERT INTO events (id, name, event_type) VALUES (?, 'Check-in Desk', 'Invitational')",
+                    (EVENT_ID,))
+    db.conn.commit()
+    if max_ops is not None:
+        db.start_group_commit(max_ops=max_ops, interval=args.interval_ms / 1000)
+    
+    latencies = []
+    commits_before = COMMITS.value()
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for name, province in check_ins(args.check_ins, args.players):
+            call_started = time.perf_counter()
+            db.add_player_to_event(EVENT_ID, name, province)
+            latencies.append(time.perf_counter() - call_started)
+    # Durability: the run is only over once everything is on disk
+    db.stop_group_commit()
+    elapsed = time.perf_counter() - started
+    commits = COMMITS.value() - commits_before
+    db.close()
+    
+    check = AADSDatabase(path, enable_sync=False, group_commit=False)
+    saved = check.conn.execute("SELECT COUNT(*) FROM event_participants WHERE event_id = ?",
+                               (EVENT_ID,)).fetchone()[0]
+    check.close()
+    
+    latencies.sort()
+    print(f"{label:<18} {len(latencies) / elapsed:>11,.0f} {commits:>8.0f} "
+          f"{statistics.mean(latencies) * 1000:>9.2f} {latencies[int(len(latencies) * 0.99)] * 1000:>9.2f} "
+          f"{saved:>7}")
+    return len(latencies) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--check-ins', type=int, default=2000)
+    parser.add_argument('--players', type=int, default=10000, help="players already in the series")
+    parser.add_argument('--batch', type=int, nargs='+', default=[10, 50, 200], help="group commit batch sizes")
+    parser.add_argument('--interval-ms', type=float, default=10.0, help="group commit interval")
+    args = parser.parse_args()
+    
+    print(f"\n{args.check_ins} check-ins, {args.players} existing players, "
+          f"group commit every {args.interval_ms:g}ms or N writes\n")
+    print(f"{'mode':<18} {'writes/sec':>11} {'commits':>8} {'mean ms':>9} {'p99 ms':>9} {'saved':>7}")
+    print("-" * 67)
+    with tempfile.TemporaryDirectory() as folder:
+        baseline = run("commit per call", os.path.join(folder, 'per-call.db'), args)
+        for max_ops in args.batch:
+            rate = run(f"group N={max_ops}", os.path.join(folder, f'group-{max_ops}.db'), args, max_ops)
+            print(f"{'':<18} {rate / baseline:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
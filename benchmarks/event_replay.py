@@ -0,0 +1,121 @@
+"""
+Operation Log Replay Benchmark
+Rebuilds a database from a synthetic operation log and compares the rate with
+replaying the same operations through the AADSDatabase methods
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from synthetic import PROVINCES
+from aads_database import AADSDatabase
+
+
+def synthetic_log(operations: int, players: int, seed: int = 42):
+    """Yield (operation, args) pairs that are valid when applied in order."""
+    rng = random.Random(seed)
+    events = [(i, f"Event {i} - Invitational", 'Invitational', None, 'Completed') for i in range(1, 7)]
+    events.append((7, "Event 7 - Tournament of Champions", 'TOC', None, 'Pending'))
+    yield 'initialize_events', {'events': events}
+    
+    rosters = {}
+    next_participant = 1
+    for player_id in range(1, players + 1):
+        rosters[player_id] = {}
+        yield 'add_player', {'player_id': player_id, 'name': f"Player {player_id:07d}",
+                             'province': rng.choice(PROVINCES)}
+    
+    for _ in range(operations - players - 1):
+        player_id = rng.randint(1, players)
+        event_id = rng.randint(1, 6)
+        roster = rosters[player_id]
+        name = f"Player {player_id:07d}"
+        roll = rng.random()
+        if event_id not in roster:
+            roster[event_id] = next_participant
+            yield 'add_player_to_event', {'event_id': event_id, 'player_id': player_id,
+                                          'participant_id': next_participant, 'name': name}
+            next_participant += 1
+        elif roll < 0.6:
+            yield 'record_placement', {'participant_id': roster[event_id], 'placement': rng.randint(1, 16),
+                                       'event_id': event_id, 'name': name}
+        elif roll < 0.9:
+            participant_id = roster.pop(event_id)
+            yield 'remove_player_from_event', {'event_id': event_id, 'player_id': player_id,
+                                               'participant_id': participant_id, 'name': name}
+        else:
+            toc_entry_id = None
+            if 7 not in roster:
+                toc_entry_id = roster[7] = next_participant
+                next_participant += 1
+            yield 'set_event_winner', {'event_id': event_id, 'player_id': player_id,
+                                       'toc_entry_id': toc_entry_id, 'name': name}
+
+
+def write_log(db, operations: int, players: int):
+    """Append a synthetic log to an empty database without applying it."""
+    db.conn.executemany(
+        "INSERT INTO operation_log (operation, args) VALUES (?, ?)",
+        ((operation, json.dumps(args, separators=(',', ':')))
+         for operation, args in synthetic_log(operations, players)))
+    db.conn.commit()
+
+
+def replay_through_methods(db, source, limit: int) -> float:
+    """Apply the first ``limit`` logged operations with the regular methods; returns seconds."""
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for entry in source.oplog.read_since(0, limit):
+            args = entry['args']
+            operation = entry['operation']
+            if operation == 'initialize_events':
+                db.initialize_events()
+            elif operation == 'add_player':
+                db.add_player(args['name'], args['province'])
+            elif operation == 'add_player_to_event':
+                db.add_player_to_event(args['event_id'], args['name'], 'NB')
+            elif operation == 'record_placement':
+                db.record_placement(args['event_id'], args['name'], args['placement'])
+            elif operation == 'remove_player_from_event':
+                db.remove_player_from_event(args['event_id'], args['name'])
+            elif operation == 'set_event_winner':
+                db.set_event_winner(args['event_id'], args['name'])
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--operations', type=int, default=1000000)
+    parser.add_argument('--players', type=int, default=50000)
+    parser.add_argument('--method-sample', type=int, default=5000,
+                        help="operations replayed through the regular methods for comparison")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as folder:
+        source = AADSDatabase(os.path.join(folder, 'source.db'), enable_sync=False)
+        started = time.perf_counter()
+        write_log(source, args.operations, args.players)
+        print(f"\nWrote {args.operations} synthetic operations in {time.perf_counter() - started:.2f}s")
+        
+        result = source.oplog.rebuild(os.path.join(folder, 'rebuilt.db'))
+        print(f"Log rebuild: {result['operations']} operations in {result['seconds']:.2f}s "
+              f"({result['ops_per_sec']:,.0f} ops/sec)")
+        
+        target = AADSDatabase(os.path.join(folder, 'methods.db'), enable_sync=False)
+        sample = min(args.method_sample, args.operations)
+        elapsed = replay_through_methods(target, source, sample)
+        rate = sample / elapsed
+        print(f"Method replay: {sample} operations in {elapsed:.2f}s ({rate:,.0f} ops/sec, "
+              f"~{args.operations / rate:.0f}s for the full log)")
+        target.close()
+        source.close()
+
+
+if __name__ == "__main__":
+    main()
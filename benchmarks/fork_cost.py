@@ -0,0 +1,78 @@
+"""
+Fork Cost Benchmark
+Times starting a what-if scenario from a loaded series: forking an in-memory
+copy with AADSDatabase.fork() versus copying the database file and opening
+the copy, then runs the same small scenario on each
+"""
+
+import argparse
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from synthetic import populate
+from aads_database import AADSDatabase
+
+EVENTS = 50
+
+
+def scenario(db, event_id: int, count: int):
+    """Check a few walk-ins in to an event and read the standings."""
+    with redirect_stdout(io.StringIO()):
+        with db.write_transaction():
+            for i in range(count):
+                db.add_player_to_event(event_id, f"Scenario {i:04d}", 'NB')
+        return db.analytics.standings(limit=10)
+
+
+def measure(label: str, start, runs: int, check_ins: int):
+    starts, totals = [], []
+    for run in range(runs):
+        started = time.perf_counter()
+        db = start(run)
+        opened = time.perf_counter()
+        scenario(db, EVENTS, check_ins)
+        finished = time.perf_counter()
+        db.close()
+        starts.append((opened - started) * 1000)
+        totals.append((finished - started) * 1000)
+    print(f"{label:<16} {statistics.median(starts):>10.1f} {statistics.median(totals):>12.1f} "
+          f"{1000 / statistics.median(totals):>13.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--per-event', type=int, default=200)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--check-ins', type=int, default=50, help="writes per scenario")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'series.db')
+        source = AADSDatabase(path, enable_sync=False)
+        populate(source, players=args.players, events=EVENTS, per_event=args.per_event)
+        source.rebuild_summaries()
+        # Forks inherit standings that are already current
+        source.analytics.standings(limit=10)
+        
+        def copy_file(run: int):
+            copy = os.path.join(folder, f'scenario-{run}.db')
+            shutil.copyfile(path, copy)
+            return AADSDatabase(copy, enable_sync=False)
+        
+        print(f"\n{args.players} players, {EVENTS} events x {args.per_event}, "
+              f"{args.check_ins} writes per scenario, median of {args.runs}\n")
+        print(f"{'start from':<16} {'start ms':>10} {'scenario ms':>12} {'scenarios/s':>13}")
+        print("-" * 54)
+        measure("file copy", copy_file, args.runs, args.check_ins)
+        measure("fork()", lambda run: source.fork(), args.runs, args.check_ins)
+        source.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Query Plan Check
+Runs the hot AADSDatabase methods against a large synthetic database, checks
+every statement they issue with EXPLAIN QUERY PLAN and times each method.
+Exits with status 1 if a plan scans players or event_participants where it
+should search an index, or if a method exceeds its time budget.
+tests/test_query_plans.py checks the same plans on a small database.
+"""
+
+import argparse
+import io
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from synthetic import populate
+from aads_database import AADSDatabase
+
+# Tables that must be reached through an index
+GUARDED_TABLES = ('players', 'event_participants')
+
+TABLE_ALIAS = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+SCAN = re.compile(r'^SCAN (\w+)(.*)$')
+
+
+def hot_queries(db, event_id: int, player_name: str):
+    """(label, call, budget in ms, tables the call may walk in index order).
+
+    Listings that page through players walk an index in sort order; that is
+    only allowed where a case names the table. Everything else must search.
+    """
+    page = list(db.iter_players("name", limit=25))
+    after = db.player_cursor(page[-1], "name")
+    return [
+        ("event roster", lambda: db.get_event_roster(event_id), 25, ()),
+        ("event details", lambda: db.get_event_details(event_id), 10, ()),
+        ("player history", lambda: db.get_player_history(player_name), 5, ()),
+        ("next page by name", lambda: list(db.iter_players("name", after=after, limit=25)), 5, ()),
+        ("province page", lambda: list(db.iter_players("name", province="NB", limit=25)), 5, ()),
+        ("prospects page", lambda: list(db.iter_players("province", has_played=False, limit=25)), 10, ('players',)),
+        ("candidate page (NOT IN)", lambda: list(db.iter_players("name", exclude_event=event_id, limit=25)),
+         10, ('players',)),
+        ("candidate count (NOT IN)", lambda: db.count_players(exclude_event=event_id), 250, ('players',)),
+        ("invite candidates", lambda: db.get_players_not_in_event(event_id), 1500, ()),
+        ("standings top 25", lambda: db.analytics.standings(limit=25), 10, ()),
+    ]
+
+
+def hot_writes(db, event_id: int):
+    """Write paths with correlated participant counts, run once in this order."""
+    name = "Plan Check"
+    return [
+        ("check in new player", lambda: db.add_player_to_event(event_id, name, "NB"), 50, ()),
+        ("record placement", lambda: db.record_placement(event_id, name, 3), 50, ()),
+        ("set event winner", lambda: db.set_event_winner(event_id, name), 100, ()),
+        ("recompute player flags", lambda: db.recompute_participation_flags(name), 20, ()),
+        ("remove from event", lambda: db.remove_player_from_event(event_id, name), 50, ()),
+        ("delete player", lambda: db.delete_player(name), 50, ()),
+    ]
+
+
+def table_aliases(sql: str):
+    """alias -> table for every table named in a statement."""
+    aliases = {}
+    for table, alias in TABLE_ALIAS.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in ('ON', 'WHERE', 'SET', 'VALUES', 'SELECT', 'ORDER', 'GROUP', 'LIMIT',
+                                           'LEFT', 'JOIN', 'INNER', 'USING', 'DEFAULT'):
+            aliases[alias] = table
+    return aliases
+
+
+def plan_problems(conn, sql: str, allowed_walks) -> list:
+    """Plan lines that scan a guarded table."""
+    try:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    except Exception:
+        # Statements that cannot be explained (BEGIN, PRAGMA, ...) have no plan
+        return []
+    aliases = table_aliases(sql)
+    problems = []
+    for row in plan:
+        match = SCAN.match(row[3])
+        if not match:
+            continue
+        table = aliases.get(match.group(1), match.group(1))
+        if table not in GUARDED_TABLES:
+            continue
+        if table in allowed_walks and 'INDEX' in match.group(2):
+            continue
+        problems.append(row[3])
+    return problems
+
+
+def check(db, cases, runs: int, budget_scale: float, verbose: bool) -> int:
+    """Trace, explain and time each case; returns the number of failures.
+    
+    With ``runs`` the call is warmed up, traced once and then timed ``runs``
+    times (median); without, the traced call is the timed one, as writes
+    can only run once.
+    """
+    failures = 0
+    for label, call, budget, allowed_walks in cases:
+        if runs:
+            # Builds in-memory caches, which load whole tables by design
+            with redirect_stdout(io.StringIO()):
+                call()
+        
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            call()
+        timings = [(time.perf_counter() - started) * 1000]
+        db.conn.set_trace_callback(None)
+        
+        if runs:
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                with redirect_stdout(io.StringIO()):
+                    call()
+                timings.append((time.perf_counter() - started) * 1000)
+        median = statistics.median(timings)
+        
+        problems = []
+        for sql in dict.fromkeys(statements):
+            if sql.lstrip().startswith('--'):
+                continue
+            for line in plan_problems(db.conn, sql, allowed_walks):
+                problems.append((line, ' '.join(sql.split())[:110]))
+        
+        status = 'FAIL' if problems or median > budget * budget_scale else 'ok'
+        failures += status == 'FAIL'
+        print(f"{label:<28} {status:<5} {median:>9.2f} {budget * budget_scale:>9.1f} {len(statements):>6}")
+        for line, sql in problems:
+            print(f"    {line}\n      in: {sql}")
+        if verbose:
+            for sql in dict.fromkeys(statements):
+                print(f"    | {' '.join(sql.split())[:140]}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--events', type=int, default=50)
+    parser.add_argument('--per-event', type=int, default=2000)
+    parser.add_argument('--runs', type=int, default=5, help="timed runs per read; writes run once")
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="multiply every time budget")
+    parser.add_argument('--verbose', action='store_true', help="list every traced statement")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as folder:
+        db = AADSDatabase(os.path.join(folder, 'plans.db'), enable_sync=False)
+        started = time.perf_counter()
+        populate(db, players=args.players, events=args.events, per_event=args.per_event)
+        db.rebuild_summaries()
+        print(f"\n{args.players} players, {args.events} events x {args.per_event} "
+              f"(built in {time.perf_counter() - started:.1f}s)\n")
+        
+        event_id = args.events // 2
+        player_name = db.get_event_roster(event_id)[0]['name']
+        print(f"{'query':<28} {'plan':<5} {'ms':>9} {'budget':>9} {'stmts':>6}")
+        print("-" * 61)
+        failures = check(db, hot_queries(db, event_id, player_name), args.runs, args.budget_scale, args.verbose)
+        # Writes change the data, so each runs once and is timed while traced
+        failures += check(db, hot_writes(db, event_id), 0, args.budget_scale, args.verbose)
+        db.close()
+    
+    print(f"\n{'All plans use indexes and meet their budgets' if not failures else f'{failures} failing'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
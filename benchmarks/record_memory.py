@@ -0,0 +1,80 @@
+"""
+Record Memory Benchmark
+Compares peak allocations of per-row dicts against aads_records on a full push
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from synthetic import populate
+from aads_database import AADSDatabase
+from aads_records import Player, Participant
+from supabase_sync import SupabaseSync, PUSH_BATCH_SIZE
+
+
+class NullClient:
+    """Stand-in Supabase client that accepts and discards every request."""
+    
+    def table(self, name):
+        return self
+    
+    def upsert(self, data):
+        return self
+    
+    def execute(self):
+        return None
+
+
+def dict_push(db):
+    """The previous approach: materialize dicts, then a payload dict per row."""
+    db.cursor.execute("SELECT * FROM players")
+    players = [dict(row) for row in db.cursor.fetchall()]
+    db.cursor.execute("SELECT * FROM event_participants")
+    participants = [dict(row) for row in db.cursor.fetchall()]
+    payloads = [Player.coerce(p).to_cloud() for p in players]
+    payloads += [Participant.coerce(p).to_cloud() for p in participants]
+    return len(payloads)
+
+
+def record_list(db):
+    """Materialize every row as a compact record."""
+    return len(list(db.iter_records(Player))) + len(list(db.iter_records(Participant)))
+
+
+def record_push(db):
+    """The current sync path: stream records into batched payloads."""
+    sync = SupabaseSync(client=NullClient())
+    sync.sync_players_to_cloud(db.iter_records(Player))
+    sync.sync_participants_to_cloud(db.iter_records(Participant))
+
+
+def measure(label, func, db):
+    tracemalloc.start()
+    started = time.perf_counter()
+    func(db)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} peak {peak / 1024 / 1024:>8.2f} MiB   {elapsed:>7.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--per-event', type=int, default=50)
+    args = parser.parse_args()
+    
+    db = populate(AADSDatabase(":memory:", enable_sync=False),
+                  players=args.players, events=args.events, per_event=args.per_event)
+    print(f"\n{args.players} players, {args.events * args.per_event} participants "
+          f"(batch size {PUSH_BATCH_SIZE})\n")
+    measure("dicts + payload dicts", dict_push, db)
+    measure("records (materialized)", record_list, db)
+    measure("records streamed to upsert", record_push, db)
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Screen Transition Benchmark
+Times clearing the screen and drawing a player screen, old approach against new
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import time
+from contextlib import redirect_stdout
+
+from synthetic import populate
+from aads_database import AADSDatabase
+from aads_manager import AADSManager
+from aads_tui import PlayerWindow, format_player
+
+SCREEN_ROWS = 40
+SCREEN_WIDTH = 100
+
+
+def clear_with_subprocess():
+    """The previous clear_screen: spawn `clear` for every screen."""
+    subprocess.run(['clear'], stdout=subprocess.DEVNULL, env=dict(os.environ, TERM='xterm'))
+
+
+def clear_with_escape(manager):
+    """The current clear_screen: write the ANSI sequence."""
+    manager.clear_screen()
+
+
+def full_table_screen(db, manager):
+    """The previous master list: fetch and print every player."""
+    manager.print_player_table(db.get_all_players("name"))
+
+
+def virtual_screen(window, offset):
+    """The TUI: fetch and format only the visible rows."""
+    return [format_player(player, SCREEN_WIDTH) for player in window.rows(offset, SCREEN_ROWS)]
+
+
+def measure(label, func, repeat):
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for i in range(repeat):
+            func(i)
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<40} {elapsed * 1000:>9.3f} ms per screen")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    db = populate(AADSDatabase(":memory:", enable_sync=False),
+                  players=args.players, events=50, per_event=200)
+    manager = AADSManager(db)
+    window = PlayerWindow(db)
+    step = max(1, args.players // args.repeat)
+    
+    print(f"\n{args.players} players, {SCREEN_ROWS}-row screen\n")
+    measure("clear: subprocess `clear`", lambda i: clear_with_subprocess(), args.repeat)
+    measure("clear: ANSI escape", lambda i: clear_with_escape(manager), args.repeat)
+    measure("master list: print every player", lambda i: full_table_screen(db, manager), args.repeat)
+    measure("TUI: visible rows, sequential pages", lambda i: virtual_screen(window, i * SCREEN_ROWS),
+            args.repeat)
+    measure("TUI: visible rows, scattered jumps", lambda i: virtual_screen(window, i * step),
+            args.repeat)
+    measure("TUI: live search keystroke", lambda i: (window.set_query(name_contains=f"{i:03d}"),
+                                                    virtual_screen(window, 0)), args.repeat)
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
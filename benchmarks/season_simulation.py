@@ -0,0 +1,58 @@
+"""
+Season Simulation Benchmark
+Times SeasonSimulator on a synthetic series with some invitationals still to
+be decided, in one process and across a process pool
+"""
+
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+
+from synthetic import populate
+from aads_database import AADSDatabase
+import season_simulator
+from season_simulator import SeasonSimulator
+
+# Invitationals 1..EVENTS-1 plus the Tournament of Champions
+EVENTS = 7
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--per-event', type=int, default=300)
+    parser.add_argument('--decided', type=int, default=3, help="invitationals that already have a winner")
+    parser.add_argument('--seasons', type=int, default=10000)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--policy', default='veterans', choices=sorted(season_simulator.INVITE_POLICIES))
+    args = parser.parse_args()
+    
+    db = populate(AADSDatabase(":memory:", enable_sync=False),
+                  players=args.players, events=EVENTS, per_event=args.per_event)
+    # Undecided invitationals start with empty rosters; the decided ones get winners
+    db.conn.execute("DELETE FROM event_participants WHERE event_id > ? AND event_id < ?", (args.decided, EVENTS))
+    db.conn.commit()
+    db.invalidate_caches()
+    with redirect_stdout(io.StringIO()):
+        for event_id in range(1, args.decided + 1):
+            db.set_event_winner(event_id, db.get_event_roster(event_id)[0]['name'])
+    
+    started = time.perf_counter()
+    simulator = SeasonSimulator(db, policy=args.policy)
+    print(f"\n{args.players} players, {len(simulator.events)} invitationals left, "
+          f"model built in {time.perf_counter() - started:.2f}s, "
+          f"{'NumPy' if season_simulator.NUMPY_AVAILABLE else 'pure Python (install numpy)'}\n")
+    print(f"{'processes':>9} {'seasons':>8} {'seconds':>8} {'seasons/s':>10}   likeliest non-qualified")
+    print("-" * 72)
+    for processes in args.processes:
+        report = simulator.run(args.seasons, processes=processes, seed=1)
+        contender = next((row for row in report if not row['qualified']), None)
+        summary = f"{contender['name']} {contender['probability']:.1%}" if contender else "-"
+        print(f"{processes:>9} {args.seasons:>8} {simulator.last_duration:>8.2f} "
+              f"{args.seasons / simulator.last_duration:>10,.0f}   {summary}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
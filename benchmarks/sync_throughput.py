@@ -0,0 +1,70 @@
+"""
+Sync Throughput Benchmark
+Pushes a synthetic series to an in-process Supabase stand-in and pulls it back
+into an empty database, reporting requests, bytes and wall time
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from synthetic import populate
+from aads_database import AADSDatabase
+from fake_supabase import FakeSupabase
+from supabase_sync import SupabaseSync
+
+EVENTS = 50
+
+
+def measure(server: FakeSupabase, label: str, rows: int, action) -> bool:
+    """Run one sync action against a fresh counter and print its line."""
+    server.reset_stats()
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        ok = action()
+    elapsed = time.perf_counter() - started
+    stats = server.stats
+    print(f"{rows:>8} {label:<14} {'ok' if ok else 'FAILED':<7} {stats['requests']:>9} "
+          f"{stats['bytes_sent'] / 1024:>11,.0f} {stats['bytes_received'] / 1024:>11,.0f} {elapsed:>9.2f}")
+    return ok
+
+
+def run(rows: int, latency: float, max_rows: int, folder: str):
+    source = AADSDatabase(os.path.join(folder, f'source-{rows}.db'), enable_sync=False)
+    populate(source, players=rows, events=EVENTS, per_event=max(1, rows // EVENTS))
+    server = FakeSupabase(latency=latency, max_rows=max_rows)
+    sync = SupabaseSync(client=server)
+    
+    measure(server, 'full push', rows, lambda: sync.full_sync_to_cloud(source))
+    for staged in (False, True):
+        target = AADSDatabase(os.path.join(folder, f'target-{rows}-{staged}.db'), enable_sync=False)
+        label = 'pull (staged)' if staged else 'pull'
+        if measure(server, label, rows, lambda: sync.pull_from_cloud(target, staged=staged)):
+            pulled = target.conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+            if pulled != rows:
+                print(f"{'':>8} only {pulled} of {rows} players arrived")
+        target.close()
+    source.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="players per run; rosters hold about as many rows")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument('--max-rows', type=int, default=1000, help="server row limit per response")
+    args = parser.parse_args()
+    
+    print(f"\nlatency {args.latency * 1000:.0f}ms per request, max {args.max_rows} rows per response\n")
+    print(f"{'rows':>8} {'action':<14} {'result':<7} {'requests':>9} {'KB sent':>11} {'KB received':>11} {'seconds':>9}")
+    print("-" * 74)
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in args.sizes:
+            run(rows, args.latency, args.max_rows, folder)
+
+
+if __name__ == "__main__":
+    main()
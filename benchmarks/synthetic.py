@@ -0,0 +1,49 @@
+"""
+Synthetic Data for AADS Benchmarks
+Bulk-loads a realistic-looking series into an AADSDatabase
+"""
+
+import os
+import random
+import sys
+
+# Benchmarks run from the repository root or from this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROVINCES = ('NB', 'NS', 'PEI')
+
+
+def populate(db, players: int = 10000, events: int = 50, per_event: int = 10, seed: int = 42):
+    """Fill ``db`` with players, events and rosters using bulk inserts."""
+    rng = random.Random(seed)
+    cursor = db.conn.cursor()
+    
+    cursor.executemany("""
+        INSERT INTO players (id, name, province, status)
+        VALUES (?, ?, ?, 'Prospect')
+    """, ((i, f"Player {i:07d}", rng.choice(PROVINCES)) for i in range(1, players + 1)))
+    
+    cursor.executemany("""
+        INSERT INTO events (id, name, event_type, event_date, status)
+        VALUES (?, ?, ?, ?, 'Completed')
+    """, ((i, f"Event {i}", 'TOC' if i == events else 'Invitational', f"2026-{1 + i % 12:02d}-01")
+          for i in range(1, events + 1)))
+    
+    seen = {}
+    rows = []
+    for event_id in range(1, events + 1):
+        for player_id in rng.sample(range(1, players + 1), min(per_event, players)):
+            debut = player_id not in seen
+            seen[player_id] = seen.get(player_id, 0) + 1
+            rows.append((event_id, player_id, int(debut), int(not debut)))
+    cursor.executemany("""
+        INSERT INTO event_participants (event_id, player_id, is_debut, is_veteran)
+        VALUES (?, ?, ?, ?)
+    """, rows)
+    
+    # Counted here: a correlated COUNT per player scans the whole roster table
+    cursor.executemany("""
+        UPDATE players SET total_events = ?, status = 'Active' WHERE id = ?
+    """, ((count, player_id) for player_id, count in seen.items()))
+    db.conn.commit()
+    return db
@@ -0,0 +1,139 @@
+"""
+Write Contention Benchmark
+Several processes check players in to the same database file at once, as
+multiple manager instances on a shared drive would. The legacy mode is the
+original code path: a plain sqlite3.connect() (Python's default 5 second
+timeout), deferred transactions, a commit per statement group and no retry
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from synthetic import PROVINCES
+from aads_database import AADSDatabase, _is_lock_error
+
+
+def legacy_check_in(conn, event_id: int, name: str, province: str):
+    """The previous add_player_to_event: deferred transactions, two commits, no retry."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM players WHERE name = ?", (name,))
+    row = cursor.fetchone()
+    if row:
+        player_id = row[0]
+    else:
+        cursor.execute("INSERT INTO players (name, province, status) VALUES (?, ?, 'Prospect')", (name, province))
+        conn.commit()
+        player_id = cursor.lastrowid
+    cursor.execute("SELECT COUNT(*) FROM event_participants WHERE player_id = ?", (player_id,))
+    debut = 1 if cursor.fetchone()[0] == 0 else 0
+    cursor.execute("""
+        INSERT INTO event_participants (event_id, player_id, is_debut, is_veteran) VALUES (?, ?, ?, ?)
+    """, (event_id, player_id, debut, 1 - debut))
+    cursor.execute("""
+        UPDATE players
+        SET status = CASE WHEN status = 'Prospect' THEN 'Active' ELSE status END,
+            total_events = (SELECT COUNT(DISTINCT event_id) FROM event_participants WHERE player_id = ?),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    """, (player_id, player_id))
+    conn.commit()
+    return True
+
+
+def worker(path: str, mode: str, worker_id: int, seconds: float, busy_timeout: float, results):
+    """Check in new players until the deadline.
+
+    Reports (saved, failed, failed on a lock, lock retries).
+    """
+    rng = random.Random(worker_id)
+    ok = failed = locked = 0
+    db = conn = None
+    try:
+        if mode == 'legacy':
+            conn = sqlite3.connect(path)
+        else:
+            db = AADSDatabase(path, enable_sync=False, busy_timeout=busy_timeout)
+    except sqlite3.OperationalError as e:
+        results.put((0, 1, int(_is_lock_error(e)), 0))
+        return
+    deadline = time.perf_counter() + seconds
+    sequence = 0
+    with redirect_stdout(io.StringIO()) as output:
+        while time.perf_counter() < deadline:
+            sequence += 1
+            name = f"W{worker_id:02d}-{sequence:07d}"
+            event_id = rng.randint(1, 6)
+            province = rng.choice(PROVINCES)
+            try:
+                if mode == 'legacy':
+                    saved = legacy_check_in(conn, event_id, name, province)
+                else:
+                    saved = db.add_player_to_event(event_id, name, province) is not False
+            except sqlite3.OperationalError as e:
+                saved = False
+                locked += _is_lock_error(e)
+                if conn is not None:
+                    conn.rollback()
+            if saved:
+                ok += 1
+            else:
+                failed += 1
+    # Writes that ran out of retries report the lock instead of raising
+    locked += output.getvalue().count("Database is busy")
+    if db is not None:
+        results.put((ok, failed, locked, db.lock_retries))
+        db.close()
+    else:
+        results.put((ok, failed, locked, 0))
+        conn.close()
+
+
+def run(mode: str, processes: int, seconds: float, busy_timeout: float):
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'contention.db')
+        db = AADSDatabase(path, enable_sync=False)
+        db.initialize_events()
+        db.close()
+        
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=worker, args=(path, mode, i, seconds, busy_timeout, results))
+                   for i in range(processes)]
+        started = time.perf_counter()
+        for process in workers:
+            process.start()
+        totals = [results.get() for _ in workers]
+        for process in workers:
+            process.join()
+        elapsed = time.perf_counter() - started
+        
+        ok, failed, locked, retries = (sum(column) for column in zip(*totals))
+        check = sqlite3.connect(path)
+        rows = check.execute("SELECT COUNT(*) FROM event_participants").fetchone()[0]
+        check.close()
+        print(f"{mode:<10} {ok:>8} {failed:>8} {locked:>8} {retries:>8} {ok / elapsed:>12.1f} {rows:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--busy-timeout', type=float, default=5.0,
+                        help="seconds the immediate mode waits for a lock; legacy keeps Python's default")
+    args = parser.parse_args()
+    
+    print(f"\n{args.processes} processes, {args.seconds}s, busy timeout {args.busy_timeout}s (immediate mode)\n")
+    print(f"{'mode':<10} {'saved':>8} {'failed':>8} {'locked':>8} {'retries':>8} {'writes/sec':>12} {'roster rows':>10}")
+    print("-" * 71)
+    for mode in ('legacy', 'immediate'):
+        run(mode, args.processes, args.seconds, args.busy_timeout)
+
+
+if __name__ == "__main__":
+    main()
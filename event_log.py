@@ -0,0 +1,403 @@
+"""
+Operation Log for AADS Series
+Append-only history of roster operations, with snapshots for fast rebuilds
+"""
+
+import json
+import os
+import sqlite3
+import time
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from local_backup import LocalBackup
+
+# A background snapshot is taken after this many logged operations
+SNAPSHOT_EVERY = 10000
+
+# Operation log entries read per query while replaying
+REPLAY_FETCH_SIZE = 10000
+
+
+class RosterState:
+    def __init__(self):
+        """Players, events and rosters held in plain dicts while operations are replayed."""
+        # id -> [name, province, status, total_events, toc_qualified, created_at, updated_at]
+        self.players: Dict[int, list] = {}
+        # id -> [name, event_type, event_date, winner_id, status, updated_at]
+        self.events: Dict[int, list] = {}
+        # id -> [event_id, player_id, is_debut, is_veteran, placement, added_at, updated_at]
+        self.participants: Dict[int, list] = {}
+        # player id -> {event id: participant id}
+        self.rosters: Dict[int, Dict[int, int]] = {}
+    
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> 'RosterState':
+        """Load the current tables of a database."""
+        state = cls()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        for row in cursor.execute("""
+            SELECT id, name, province, status, total_events, toc_qualified, created_at, updated_at
+            FROM players
+        """):
+            state.players[row[0]] = list(row[1:])
+            state.rosters[row[0]] = {}
+        for row in cursor.execute("""
+            SELECT id, name, event_type, event_date, winner_id, status, updated_at FROM events
+        """):
+            state.events[row[0]] = list(row[1:])
+        for row in cursor.execute("""
+            SELECT id, event_id, player_id, is_debut, is_veteran, placement, added_at, updated_at
+            FROM event_participants
+        """):
+            state.participants[row[0]] = list(row[1:])
+            state.rosters.setdefault(row[2], {})[row[1]] = row[0]
+        return state
+    
+    def apply(self, operation: str, args: Dict, at: str):
+        """Apply one logged operation, with the same effects as the AADSDatabase method."""
+        getattr(self, '_' + operation)(at, **args)
+    
+    def replay(self, entries: Iterator[Tuple[int, str, str, str]]) -> int:
+        """Apply raw log rows in order; returns how many were applied."""
+        handlers = {name[1:]: getattr(self, name) for name in dir(self)
+                    if name.startswith('_') and not name.startswith('__')}
+        count = 0
+        while True:
+            batch = list(islice(entries, REPLAY_FETCH_SIZE))
+            if not batch:
+                return count
+            # One JSON document per batch parses far faster than one per entry
+            parsed = json.loads('[' + ','.join(row[2] for row in batch) + ']')
+            for (seq, operation, _, recorded_at), args in zip(batch, parsed):
+                handlers[operation](recorded_at, **args)
+            count += len(batch)
+    
+    def _initialize_events(self, at, events):
+        for event_id, name, event_type, event_date, status in events:
+            if event_id not in self.events:
+                self.events[event_id] = [name, event_type, event_date, None, status, at]
+    
+    def _add_player(self, at, player_id, name, province):
+        self.players[player_id] = [name, province, 'Prospect', 0, 0, at, at]
+        self.rosters[player_id] = {}
+    
+    def _add_player_to_event(self, at, event_id, player_id, participant_id, name=None):
+        roster = self.rosters[player_id]
+        debut = 1 if not roster else 0
+        self.participants[participant_id] = [event_id, player_id, debut, 1 - debut, None, at, at]
+        roster[event_id] = participant_id
+        
+        player = self.players[player_id]
+        if player[2] == 'Prospect':
+            player[2] = 'Active'
+        player[3] = len(roster)
+        player[6] = at
+    
+    def _set_event_winner(self, at, event_id, player_id, toc_entry_id=None, name=None):
+        event = self.events.get(event_id)
+        if event is not None:
+            event[3], event[4], event[5] = player_id, 'Completed', at
+        
+        player = self.players[player_id]
+        player[2], player[4], player[6] = 'Winner', 1, at
+        if toc_entry_id is not None:
+            self.participants[toc_entry_id] = [7, player_id, 0, 1, None, at, at]
+            self.rosters[player_id][7] = toc_entry_id
+            player[3] = len(self.rosters[player_id])
+    
+    def _record_placement(self, at, participant_id, placement, event_id=None, name=None):
+        participant = self.participants[participant_id]
+        participant[4], participant[6] = placement, at
+    
+    def _remove_player_from_event(self, at, event_id, player_id, participant_id, name=None):
+        del self.participants[participant_id]
+        roster = self.rosters[player_id]
+        roster.pop(event_id, None)
+        
+        player = self.players[player_id]
+        player[3] = len(roster)
+        if player[2] == 'Active' and not roster:
+            player[2] = 'Prospect'
+        player[6] = at
+    
+    def _recompute_participation_flags(self, at, player_id=None, name=None):
+        def event_order(event_id):
+            event = self.events.get(event_id)
+            date = event[2] if event is not None else None
+            return date is None, date or '', event_id
+        
+        for pid in [player_id] if player_id is not None else list(self.rosters):
+            roster = self.rosters.get(pid, {})
+            for position, event_id in enumerate(sorted(roster, key=event_order)):
+                participant = self.participants[roster[event_id]]
+                flags = (1, 0) if position == 0 else (0, 1)
+                if (participant[2], participant[3]) != flags:
+                    participant[2], participant[3], participant[6] = flags[0], flags[1], at
+            
+            player = self.players[pid]
+            status = player[2]
+            if status in ('Prospect', 'Active'):
+                status = 'Active' if roster else 'Prospect'
+            if player[3] != len(roster) or player[2] != status:
+                player[2], player[3], player[6] = status, len(roster), at
+    
+    def _delete_player(self, at, player_id, name=None):
+        for participant_id in self.rosters.pop(player_id, {}).values():
+            del self.participants[participant_id]
+        del self.players[player_id]
+    
+    def write(self, conn: sqlite3.Connection):
+        """Replace the player, event and roster tables of ``conn`` (no commit)."""
+        conn.execute("DELETE FROM event_participants")
+        conn.execute("DELETE FROM players")
+        conn.execute("DELETE FROM events")
+        conn.executemany("""
+            INSERT INTO players
+            (id, name, province, status, total_events, toc_qualified, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, ((player_id, *player) for player_id, player in self.players.items()))
+        conn.executemany("""
+            INSERT INTO events (id, name, event_type, event_date, winner_id, status, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, ((event_id, *event) for event_id, event in self.events.items()))
+        conn.executemany("""
+            INSERT INTO event_participants
+            (id, event_id, player_id, is_debut, is_veteran, placement, added_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, ((participant_id, *participant) for participant_id, participant in self.participants.items()))
+
+
+class OperationLog:
+    def __init__(self, db, snapshot_every: Optional[int] = None, retention: Optional[int] = None):
+        """History of the domain operations written through ``db``.
+
+        Every logged operation is committed in the same transaction as its
+        table changes. Snapshots are taken every OPLOG_SNAPSHOT_EVERY
+        operations (10000) into an ``oplog`` folder beside the regular
+        backups, keeping the newest OPLOG_SNAPSHOT_RETENTION (5); in-memory
+        databases are logged but never snapshotted.
+        """
+        self.db = db
+        self.snapshot_every = snapshot_every or int(os.getenv('OPLOG_SNAPSHOT_EVERY', str(SNAPSHOT_EVERY)))
+        retention = retention if retention is not None else int(os.getenv('OPLOG_SNAPSHOT_RETENTION', '5'))
+        
+        self.snapshots: Optional[LocalBackup] = None
+        if db.db_path != ':memory:':
+            self.snapshots = LocalBackup(db.db_path, os.path.join(db.backups.backup_dir, 'oplog'), retention)
+        self._next_snapshot_seq: Optional[int] = None
+    
+    def append(self, operation: str, args: Dict) -> int:
+        """Log an operation in the caller's open transaction; returns its sequence number."""
+        seq = self.db.conn.execute(
+            "INSERT INTO operation_log (operation, args) VALUES (?, ?)",
+            (operation, json.dumps(args, separators=(',', ':')))
+        ).lastrowid
+        
+        if self.snapshots is not None:
+            if self._next_snapshot_seq is None:
+                self._next_snapshot_seq = self._snapshot_seq_after(seq)
+            if seq >= self._next_snapshot_seq and not self.snapshots.running:
+                # The copy only sees committed rows, so it records its own
+                # position in the log; see snapshot_seq()
+                self.snapshots.snapshot_in_background()
+                self._next_snapshot_seq = seq + self.snapshot_every
+        return seq
+    
+    def _snapshot_seq_after(self, seq: int) -> int:
+        """Sequence number at which the next periodic snapshot is due."""
+        snapshots = self.list_snapshots()
+        newest = snapshots[0]['seq'] if snapshots else 0
+        return max(seq, newest + self.snapshot_every)
+    
+    def last_seq(self) -> int:
+        """Sequence number of the newest logged operation (0 if none)."""
+        return self.db.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM operation_log").fetchone()[0]
+    
+    def iter_entries(self, after: int = 0, upto: Optional[int] = None,
+                     conn: Optional[sqlite3.Connection] = None) -> Iterator[Tuple[int, str, str, str]]:
+        """Stream raw (seq, operation, args JSON, recorded_at) rows in log order."""
+        cursor = (conn or self.db.conn).cursor()
+        cursor.row_factory = None
+        cursor.execute("""
+            SELECT seq, operation, args, recorded_at FROM operation_log
+            WHERE seq > ? AND seq <= ?
+            ORDER BY seq
+        """, (after, upto if upto is not None else 2 ** 63 - 1))
+        while True:
+            rows = cursor.fetchmany(REPLAY_FETCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+    
+    def read_since(self, seq: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Operations logged after ``seq``, oldest first.
+
+        Consumers such as a sync feed keep the last ``seq`` they processed
+        and ask for what came after it.
+        """
+        entries = []
+        for entry_seq, operation, args, recorded_at in self.iter_entries(after=seq):
+            if limit is not None and len(entries) >= limit:
+                break
+            entries.append({'seq': entry_seq, 'operation': operation,
+                            'args': json.loads(args), 'recorded_at': recorded_at})
+        return entries
+    
+    def recent(self, limit: int = 20) -> List[Dict]:
+        """The newest ``limit`` operations, newest first."""
+        rows = self.db.conn.execute("""
+            SELECT seq, operation, args, recorded_at FROM operation_log
+            ORDER BY seq DESC LIMIT ?
+        """, (limit,)).fetchall()
+        return [{'seq': seq, 'operation': operation, 'args': json.loads(args), 'recorded_at': recorded_at}
+                for seq, operation, args, recorded_at in rows]
+    
+    def snapshot(self, label: str = '') -> Dict:
+        """Snapshot the database now; the result includes the log position it covers."""
+        if self.snapshots is None:
+            raise ValueError("in-memory databases cannot be snapshotted")
+        result = self.snapshots.snapshot(label)
+        result['seq'] = snapshot_seq(result['path'])
+        self._next_snapshot_seq = result['seq'] + self.snapshot_every
+        return result
+    
+    def checkpoint(self) -> bool:
+        """Snapshot in the background after changes that bypassed the log (pulls, restores).
+
+        A snapshot already running may have copied the database before
+        those changes, so it is waited for and a new one started.
+        """
+        if self.snapshots is None:
+            return False
+        while not self.snapshots.snapshot_in_background('checkpoint'):
+            self.snapshots.wait()
+        return True
+    
+    def list_snapshots(self) -> List[Dict]:
+        """Completed log snapshots, newest first, each with the ``seq`` it covers."""
+        if self.snapshots is None:
+            return []
+        snapshots = self.snapshots.list_snapshots()
+        for snapshot in snapshots:
+            snapshot['seq'] = snapshot_seq(snapshot['path'])
+        return snapshots
+    
+    def discard_snapshots_after(self, seq: int) -> List[str]:
+        """Delete snapshots past ``seq``, e.g. after restoring an older copy forked the log."""
+        removed = []
+        for snapshot in self.list_snapshots():
+            if snapshot['seq'] > seq:
+                os.remove(snapshot['path'])
+                removed.append(snapshot['path'])
+        self._next_snapshot_seq = None
+        return removed
+    
+    def rebuild(self, target_path: str, upto: Optional[int] = None) -> Dict:
+        """Recreate the database as it was after operation ``upto`` (default: all) in a new file.
+
+        Starts from the newest snapshot at or before ``upto`` (or from an
+        empty database if the log covers all history), replays the rest of
+        the log in memory and writes the resulting tables once. Changes
+        that bypassed the log, such as cloud pulls, are only included up to
+        the last snapshot taken after them.
+        """
+        if os.path.exists(target_path):
+            raise FileExistsError(target_path)
+        if self.snapshots is not None and os.path.abspath(target_path) == self.snapshots.db_path:
+            raise ValueError("cannot rebuild over the live database")
+        
+        started = time.perf_counter()
+        upto = self.last_seq() if upto is None else upto
+        base = next((snapshot for snapshot in self.list_snapshots() if snapshot['seq'] <= upto), None)
+        if base is None and self.db.get_sync_state('oplog_started_empty') != '1':
+            raise ValueError(f"no snapshot at or before operation {upto}; "
+                             "the log does not cover data written before it existed")
+        
+        target = type(self.db)(target_path, enable_sync=False)
+        try:
+            if base is not None:
+                self.snapshots.restore(base['path'], target.conn)
+                target.create_tables()
+            base_seq = base['seq'] if base is not None else 0
+            state = RosterState.from_connection(target.conn)
+            
+            operations = state.replay(self.iter_entries(after=base_seq, upto=upto))
+            
+            cursor = target.cursor
+            if self.snapshots is not None:
+                # Copied inside SQLite, so the new file has the history too
+                cursor.execute("ATTACH DATABASE ? AS source", (self.snapshots.db_path,))
+            cursor.execute("BEGIN IMMEDIATE")
+            # Summaries are rebuilt once instead of row by row in the triggers
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_summary_%'")
+            for (trigger,) in cursor.fetchall():
+                cursor.execute(f"DROP TRIGGER {trigger}")
+            state.write(target.conn)
+            cursor.execute("DELETE FROM operation_log WHERE seq > ?", (base_seq,))
+            if self.snapshots is not None:
+                cursor.execute("""
+                    INSERT INTO operation_log (seq, operation, args, recorded_at)
+                    SELECT seq, operation, args, recorded_at FROM source.operation_log
+                    WHERE seq > ? AND seq <= ?
+                """, (base_seq, upto))
+            else:
+                cursor.executemany("""
+                    INSERT INTO operation_log (seq, operation, args, recorded_at) VALUES (?, ?, ?, ?)
+                """, self.iter_entries(after=base_seq, upto=upto))
+            target.rebuild_summaries(commit=False)
+            target.set_sync_state('oplog_started_empty', self.db.get_sync_state('oplog_started_empty'),
+                                  commit=False)
+            target.create_tables()
+            if self.snapshots is not None:
+                cursor.execute("DETACH DATABASE source")
+        finally:
+            target.close()
+        
+        elapsed = time.perf_counter() - started
+        return {
+            'path': target_path,
+            'snapshot': base['path'] if base is not None else None,
+            'base_seq': base_seq,
+            'seq': upto,
+            'operations': operations,
+            'seconds': elapsed,
+            'ops_per_sec': operations / elapsed if elapsed > 0 else 0.0
+        }
+
+
+def snapshot_seq(path: str) -> int:
+    """Last operation contained in a snapshot file."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM operation_log").fetchone()[0]
+    except sqlite3.OperationalError:
+        # Taken before the database had an operation log
+        return 0
+    finally:
+        conn.close()
+
+
+def describe(entry: Dict) -> str:
+    """One-line summary of a log entry for history screens."""
+    args = entry['args']
+    name = args.get('name', f"player #{args.get('player_id')}")
+    operation = entry['operation']
+    if operation == 'add_player':
+        return f"Added {name} ({args['province']}) to the master list"
+    if operation == 'add_player_to_event':
+        return f"Added {name} to Event {args['event_id']}"
+    if operation == 'set_event_winner':
+        return f"Set {name} as winner of Event {args['event_id']}"
+    if operation == 'record_placement':
+        return f"Recorded {name} in place {args['placement']} for Event {args.get('event_id')}"
+    if operation == 'remove_player_from_event':
+        return f"Removed {name} from Event {args['event_id']}"
+    if operation == 'delete_player':
+        return f"Deleted {name}"
+    if operation == 'recompute_participation_flags':
+        return f"Recomputed debut/veteran flags for {args['name'] or 'all players'}"
+    if operation == 'initialize_events':
+        return f"Initialized {len(args['events'])} events"
+    return operation
@@ -0,0 +1,453 @@
+"""
+Fake Supabase for AADS Series
+In-process stand-in for the subset of the Supabase/PostgREST client API that
+SupabaseSync and the cloud verification use, for offline benchmarks and checks
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from merkle_check import row_hash
+
+# Supabase caps every response at this many rows (PostgREST db-max-rows)
+DEFAULT_MAX_ROWS = 1000
+
+# Primary key and unique columns of each table, as in supabase_setup.sql
+TABLE_KEYS = {
+    'players': (('id',), (('name',),)),
+    'events': (('id',), ()),
+    'event_participants': (('id',), (('event_id', 'player_id'),)),
+    'tombstones': (('table_name', 'row_id'), ()),
+    'sync_metadata': (('id',), ())
+}
+
+# Columns the server stamps on insert and update, like the setup SQL's triggers
+STAMPED_COLUMNS = {
+    'tombstones': ('deleted_at',)
+}
+
+# Columns kept by set_updated_at(): stamped only when the row's content
+# changes, and an update carrying an older value than the row's is skipped
+CHANGE_STAMPED_COLUMNS = {
+    'players': 'updated_at',
+    'events': 'updated_at',
+    'event_participants': 'updated_at'
+}
+
+# Columns with a NOW() default
+DEFAULTED_COLUMNS = {
+    'players': ('created_at',),
+    'event_participants': ('added_at',)
+}
+
+
+class FakeSupabaseError(Exception):
+    """Raised for injected failures and constraint violations, like postgrest's APIError."""
+    
+    def __init__(self, message: str, code: str = 'FAKE'):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeResponse:
+    def __init__(self, data: List[Dict]):
+        self.data = data
+        self.count = None
+
+
+class FakeQuery:
+    def __init__(self, server: 'FakeSupabase', table: str):
+        """A request being built; nothing is sent until ``execute()``."""
+        self.server = server
+        self.table_name = table
+        self.method = 'select'
+        self.columns = '*'
+        self.payload: Any = None
+        self.filters: List[Tuple[str, str, Any]] = []
+        self.ordering: List[Tuple[str, bool]] = []
+        self.offset = 0
+        self.row_limit: Optional[int] = None
+        self.ignore_duplicates = False
+        self.count: Optional[str] = None
+        self.total: Optional[int] = None
+    
+    def select(self, columns: str = '*', count: Optional[str] = None) -> 'FakeQuery':
+        self.method, self.columns, self.count = 'select', columns, count
+        return self
+    
+    def upsert(self, payload, ignore_duplicates: bool = False, on_conflict: str = '') -> 'FakeQuery':
+        self.method, self.payload = 'upsert', payload if isinstance(payload, list) else [payload]
+        self.ignore_duplicates = ignore_duplicates
+        return self
+    
+    def insert(self, payload) -> 'FakeQuery':
+        self.method, self.payload = 'insert', payload if isinstance(payload, list) else [payload]
+        return self
+    
+    def update(self, values: Dict) -> 'FakeQuery':
+        self.method, self.payload = 'update', values
+        return self
+    
+    def delete(self) -> 'FakeQuery':
+        self.method = 'delete'
+        return self
+    
+    def _filter(self, operator: str, column: str, value) -> 'FakeQuery':
+        self.filters.append((operator, column, value))
+        return self
+    
+    def eq(self, column: str, value) -> 'FakeQuery':
+        return self._filter('eq', column, value)
+    
+    def neq(self, column: str, value) -> 'FakeQuery':
+        return self._filter('neq', column, value)
+    
+    def gt(self, column: str, value) -> 'FakeQuery':
+        return self._filter('gt', column, value)
+    
+    def gte(self, column: str, value) -> 'FakeQuery':
+        return self._filter('gte', column, value)
+    
+    def lt(self, column: str, value) -> 'FakeQuery':
+        return self._filter('lt', column, value)
+    
+    def lte(self, column: str, value) -> 'FakeQuery':
+        return self._filter('lte', column, value)
+    
+    def in_(self, column: str, values) -> 'FakeQuery':
+        return self._filter('in', column, set(values))
+    
+    def order(self, column: str, desc: bool = False) -> 'FakeQuery':
+        self.ordering.append((column, desc))
+        return self
+    
+    def range(self, start: int, end: int) -> 'FakeQuery':
+        self.offset, self.row_limit = start, end - start + 1
+        return self
+    
+    def limit(self, count: int) -> 'FakeQuery':
+        self.row_limit = count
+        return self
+    
+    def execute(self) -> FakeResponse:
+        response = FakeResponse(self.server._handle(self))
+        response.count = self.total
+        return response
+
+
+class FakeRpc:
+    def __init__(self, server: 'FakeSupabase', function: str, params: Dict):
+        self.server = server
+        self.function = function
+        self.params = params
+    
+    def execute(self) -> FakeResponse:
+        return FakeResponse(self.server._handle_rpc(self.function, self.params))
+
+
+def _older(value: Optional[str], current: Optional[str]) -> bool:
+    """Whether timestamp ``value`` is before ``current``, to the whole second."""
+    if value is None or current is None:
+        return False
+    value, current = (datetime.fromisoformat(stamp).replace(microsecond=0) for stamp in (value, current))
+    return value < current
+
+
+def _matches(row: Dict, filters: List[Tuple[str, str, Any]]) -> bool:
+    for operator, column, value in filters:
+        current = row.get(column)
+        if operator == 'in':
+            if current not in value:
+                return False
+        elif operator == 'eq':
+            if current != value:
+                return False
+        elif operator == 'neq':
+            if current == value:
+                return False
+        elif current is None:
+            # Comparisons with NULL are never true in SQL
+            return False
+        elif operator == 'gt' and not current > value:
+            return False
+        elif operator == 'gte' and not current >= value:
+            return False
+        elif operator == 'lt' and not current < value:
+            return False
+        elif operator == 'lte' and not current <= value:
+            return False
+    return True
+
+
+class FakeSupabase:
+    def __init__(self, latency: float = 0.0, max_rows: int = DEFAULT_MAX_ROWS,
+                 max_payload_rows: Optional[int] = None, failure_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """An in-memory Supabase project speaking the client's table/rpc API.
+
+        Every request sleeps ``latency`` seconds, selects return at most
+        ``max_rows`` rows, writes with more than ``max_payload_rows`` rows
+        are rejected, and a ``failure_rate`` share of requests fails.
+        Use ``fail_next()`` for deterministic failures. Request and byte
+        counts (JSON bodies) accumulate in ``stats``.
+        """
+        self.latency = latency
+        self.max_rows = max_rows
+        self.max_payload_rows = max_payload_rows
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._forced_failures: List[Tuple[Optional[str], Optional[str]]] = []
+        self._lock = threading.Lock()
+        
+        self.tables: Dict[str, Dict[tuple, Dict]] = {table: {} for table in TABLE_KEYS}
+        self._versions: Dict[str, int] = {table: 0 for table in TABLE_KEYS}
+        self._sorted_cache: Dict[tuple, List[Dict]] = {}
+        self._unique: Dict[str, Dict[tuple, Dict[tuple, tuple]]] = {}
+        for table in TABLE_KEYS:
+            self._reindex(table)
+        self.tables['sync_metadata'][(1,)] = {'id': 1, 'last_sync': None, 'local_changes': 0}
+        self.reset_stats()
+    
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+    
+    def rpc(self, function: str, params: Dict) -> FakeRpc:
+        return FakeRpc(self, function, params)
+    
+    def reset_stats(self):
+        """Zero the request, byte and row counters."""
+        self.stats = {
+            'requests': 0,
+            'bytes_sent': 0,
+            'bytes_received': 0,
+            'rows_written': 0,
+            'rows_read': 0,
+            'failures': 0,
+            'by_method': {}
+        }
+    
+    def fail_next(self, count: int = 1, table: Optional[str] = None, method: Optional[str] = None):
+        """Make the next ``count`` matching requests fail."""
+        self._forced_failures.extend([(table, method)] * count)
+    
+    def rows(self, table: str) -> List[Dict]:
+        """Copies of a table's rows, ordered by key."""
+        return [dict(row) for _, row in sorted(self.tables[table].items())]
+    
+    def _now(self) -> str:
+        return datetime.now(timezone.utc).isoformat()
+    
+    def _begin_request(self, table: str, method: str, body: Any):
+        """Count, delay and possibly fail one request."""
+        if self.latency:
+            time.sleep(self.latency)
+        self.stats['requests'] += 1
+        self.stats['by_method'][method] = self.stats['by_method'].get(method, 0) + 1
+        if body is not None:
+            self.stats['bytes_sent'] += len(json.dumps(body, default=str))
+        
+        for i, (fail_table, fail_method) in enumerate(self._forced_failures):
+            if fail_table in (None, table) and fail_method in (None, method):
+                del self._forced_failures[i]
+                self.stats['failures'] += 1
+                raise FakeSupabaseError(f"injected failure on {method} {table}")
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            self.stats['failures'] += 1
+            raise FakeSupabaseError(f"injected failure on {method} {table}")
+    
+    def _respond(self, data: List[Dict]) -> List[Dict]:
+        self.stats['bytes_received'] += len(json.dumps(data, default=str))
+        return data
+    
+    def _handle(self, query: FakeQuery) -> List[Dict]:
+        with self._lock:
+            table = query.table_name
+            if table not in self.tables:
+                raise FakeSupabaseError(f'relation "{table}" does not exist', '42P01')
+            body = query.payload if query.method in ('upsert', 'insert', 'update') else None
+            self._begin_request(table, query.method, body)
+            
+            if query.method == 'select':
+                return self._respond(self._select(query))
+            if query.method in ('upsert', 'insert'):
+                if self.max_payload_rows is not None and len(query.payload) > self.max_payload_rows:
+                    raise FakeSupabaseError("payload too large", '413')
+                return self._respond(self._upsert(query))
+            if query.method == 'update':
+                return self._respond(self._update(query))
+            return self._respond(self._delete(query))
+    
+    def _select(self, query: FakeQuery) -> List[Dict]:
+        table = query.table_name
+        ordering = tuple(query.ordering)
+        cache_key = (table, ordering, self._versions[table])
+        ordered = self._sorted_cache.get(cache_key)
+        if ordered is None:
+            ordered = list(self.tables[table].values())
+            for column, desc in reversed(ordering):
+                # NULLs sort last ascending and first descending, as in Postgres
+                ordered.sort(key=lambda row: (row.get(column) is None,
+                                              0 if row.get(column) is None else row.get(column)),
+                             reverse=desc)
+            self._sorted_cache = {key: rows for key, rows in self._sorted_cache.items()
+                                  if key[0] != table or key[2] == self._versions[table]}
+            self._sorted_cache[cache_key] = ordered
+        
+        rows = [row for row in ordered if _matches(row, query.filters)] if query.filters else ordered
+        if query.count == 'exact':
+            query.total = len(rows)
+        limit = self.max_rows if query.row_limit is None else min(query.row_limit, self.max_rows)
+        page = rows[query.offset:query.offset + limit]
+        
+        if query.columns.strip() != '*':
+            columns = [column.strip() for column in query.columns.split(',')]
+            page = [{column: row.get(column) for column in columns} for row in page]
+        else:
+            page = [dict(row) for row in page]
+        self.stats['rows_read'] += len(page)
+        return page
+    
+    def _key(self, table: str, row: Dict) -> tuple:
+        return tuple(row.get(column) for column in TABLE_KEYS[table][0])
+    
+    def _upsert(self, query: FakeQuery) -> List[Dict]:
+        table = query.table_name
+        rows = self.tables[table]
+        now = self._now()
+        staged: Dict[tuple, Dict] = {}
+        for payload in query.payload:
+            key = self._key(table, payload)
+            existing = staged.get(key, rows.get(key))
+            if existing is not None and (query.ignore_duplicates or query.method == 'insert'):
+                if query.method == 'insert':
+                    raise FakeSupabaseError(f"duplicate key value violates primary key of {table}", '23505')
+                continue
+            row = dict(existing or {})
+            row.update(payload)
+            for column in DEFAULTED_COLUMNS.get(table, ()):
+                if row.get(column) is None:
+                    row[column] = now
+            for column in STAMPED_COLUMNS.get(table, ()):
+                row[column] = now
+            if self._stamp_change(table, existing, row, now):
+                staged[key] = row
+        
+        # The whole request is one statement: constraint errors apply nothing
+        self._check_unique(table, staged)
+        for key, row in staged.items():
+            self._index(table, rows.get(key), None)
+            self._index(table, row, key)
+            rows[key] = row
+        self._versions[table] += 1
+        self.stats['rows_written'] += len(staged)
+        return [dict(row) for row in staged.values()]
+    
+    def _stamp_change(self, table: str, existing: Optional[Dict], row: Dict, now: str) -> bool:
+        """Apply set_updated_at() to a row being written; False skips the write."""
+        column = CHANGE_STAMPED_COLUMNS.get(table)
+        if column is None:
+            return True
+        if existing is not None:
+            if _older(row.get(column), existing.get(column)):
+                return False
+            row[column] = existing.get(column)
+            if row == existing:
+                return True
+        row[column] = now
+        return True
+    
+    def _unique_values(self, table: str, row: Dict):
+        for columns in TABLE_KEYS[table][1]:
+            yield columns, tuple(row.get(column) for column in columns)
+    
+    def _index(self, table: str, row: Optional[Dict], key: Optional[tuple]):
+        """Add a row to (or with ``key`` None, drop it from) the unique indexes."""
+        if row is None:
+            return
+        for columns, values in self._unique_values(table, row):
+            if key is None:
+                self._unique[table][columns].pop(values, None)
+            else:
+                self._unique[table][columns][values] = key
+    
+    def _reindex(self, table: str):
+        self._unique[table] = {columns: {} for columns in TABLE_KEYS[table][1]}
+        for key, row in self.tables[table].items():
+            self._index(table, row, key)
+    
+    def _check_unique(self, table: str, staged: Dict[tuple, Dict]):
+        claimed: Dict[tuple, tuple] = {}
+        for key, row in staged.items():
+            for columns, values in self._unique_values(table, row):
+                owner = claimed.get((columns, values))
+                if owner is None:
+                    owner = self._unique[table][columns].get(values)
+                    if owner in staged and dict(self._unique_values(table, staged[owner]))[columns] != values:
+                        # The row holding these values gives them up in this request
+                        owner = None
+                if owner is not None and owner != key:
+                    raise FakeSupabaseError(
+                        f'duplicate key value violates unique constraint on {table}({", ".join(columns)})', '23505')
+                claimed[(columns, values)] = key
+    
+    def _update(self, query: FakeQuery) -> List[Dict]:
+        table = query.table_name
+        now = self._now()
+        updated = []
+        rows = self.tables[table]
+        for key, existing in rows.items():
+            if _matches(existing, query.filters):
+                row = dict(existing)
+                row.update(query.payload)
+                for column in STAMPED_COLUMNS.get(table, ()):
+                    row[column] = now
+                if self._stamp_change(table, existing, row, now):
+                    rows[key] = row
+                    updated.append(dict(row))
+        self._reindex(table)
+        self._versions[table] += 1
+        self.stats['rows_written'] += len(updated)
+        return updated
+    
+    def _delete(self, query: FakeQuery) -> List[Dict]:
+        table = query.table_name
+        rows = self.tables[table]
+        deleted = [key for key, row in rows.items() if _matches(row, query.filters)]
+        removed = [rows.pop(key) for key in deleted]
+        if table == 'players' and removed:
+            # ON DELETE CASCADE from event_participants.player_id
+            gone = {row['id'] for row in removed}
+            participants = self.tables['event_participants']
+            for key in [key for key, row in participants.items() if row.get('player_id') in gone]:
+                del participants[key]
+            self._reindex('event_participants')
+            self._versions['event_participants'] += 1
+        self._reindex(table)
+        self._versions[table] += 1
+        self.stats['rows_written'] += len(removed)
+        return removed
+    
+    def _handle_rpc(self, function: str, params: Dict) -> List[Dict]:
+        """The consistency-check functions from merkle_check.MERKLE_SQL."""
+        with self._lock:
+            self._begin_request(params.get('tbl', ''), 'rpc', params)
+            if function not in ('aads_range_digests', 'aads_row_hashes'):
+                raise FakeSupabaseError(f"function {function} does not exist", '42883')
+            
+            table, columns = params['tbl'], params['cols']
+            rows = sorted(self.tables[table].values(), key=lambda row: row['id'])
+            result = []
+            for lo, hi in zip(params['los'], params['his']):
+                in_range = [row for row in rows if lo <= row['id'] < hi]
+                hashes = [row_hash({column: row.get(column) for column in columns}) for row in in_range]
+                if function == 'aads_row_hashes':
+                    result.extend({'row_id': row['id'], 'hash': digest} for row, digest in zip(in_range, hashes))
+                else:
+                    result.append({'lo': lo, 'row_count': len(in_range),
+                                   'digest': hashlib.md5(''.join(hashes).encode('ascii')).hexdigest()})
+            return self._respond(result)
@@ -0,0 +1,178 @@
+"""
+Group Commit for AADS Series
+Keeps one write transaction open across many small writes and commits them
+together, so a busy check-in desk pays for one disk sync per batch
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import metrics
+from metrics import COMMITS, ROLLBACKS
+
+# A batch commits once it holds GROUP_COMMIT_OPS writes or its oldest write
+# is GROUP_COMMIT_MS milliseconds old, whichever comes first
+GROUP_COMMIT_OPS = 50
+GROUP_COMMIT_MS = 10.0
+
+BATCH_SIZES = metrics.REGISTRY.histogram(
+    'aads_db_group_commit_writes', 'Writes committed together by group commit',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500))
+
+
+class GroupCommitter:
+    def __init__(self, db, max_ops: Optional[int] = None, interval: Optional[float] = None):
+        """Batch ``db``'s write transactions into shared commits.
+
+        Each write runs in a savepoint of the open batch transaction and
+        returns as soon as its statements ran, so a failing write is undone
+        on its own. A background thread commits the batch ``interval``
+        seconds after its first write; ``max_ops`` writes commit at once.
+        Listeners hear about changes once their batch is committed.
+        Writes acknowledged but not yet committed are lost if the process
+        dies, so callers must ``stop()`` (AADSDatabase.close does) on exit.
+        """
+        self.db = db
+        self.max_ops = max_ops if max_ops is not None else int(
+            os.getenv('GROUP_COMMIT_OPS', str(GROUP_COMMIT_OPS)))
+        self.interval = interval if interval is not None else float(
+            os.getenv('GROUP_COMMIT_MS', str(GROUP_COMMIT_MS))) / 1000
+        
+        self.pending = 0
+        self._first_write: Optional[float] = None
+        self._condition = threading.Condition()
+        self._stopping = False
+        
+        self.writes = 0
+        self.commits = 0
+        self.busy_commits = 0
+        
+        self._thread = threading.Thread(target=self._run, name="aads-group-commit", daemon=True)
+        self._thread.start()
+    
+    @contextmanager
+    def write(self):
+        """One write inside the open batch; used by AADSDatabase.write_transaction."""
+        db = self.db
+        with db.lock:
+            if not db.conn.in_transaction:
+                db.conn.execute("BEGIN IMMEDIATE")
+                if db._identities is not None:
+                    # Another process may have written since the map was filled
+                    db._identities.sync()
+            db.conn.execute("SAVEPOINT group_write")
+            mark = len(db._pending_changes)
+            db._write_depth = 1
+            try:
+                yield
+                db.conn.execute("RELEASE group_write")
+            except BaseException:
+                db.conn.execute("ROLLBACK TO group_write")
+                db.conn.execute("RELEASE group_write")
+                ROLLBACKS.inc()
+                del db._pending_changes[mark:]
+                # In-memory indexes may already include the rolled back rows
+                db.invalidate_caches()
+                raise
+            finally:
+                db._write_depth = 0
+            
+            with self._condition:
+                self.writes += 1
+                self.pending += 1
+                if self._first_write is None:
+                    self._first_write = time.monotonic()
+                full = self.pending >= self.max_ops
+                self._condition.notify()
+            if full:
+                self.flush()
+    
+    def flush(self) -> bool:
+        """Commit the open batch now; False if another process holds the lock."""
+        db = self.db
+        with db.lock:
+            if db.conn.in_transaction:
+                try:
+                    db.conn.commit()
+                except sqlite3.OperationalError as e:
+                    # Readers in other processes can hold off the commit
+                    # past the busy timeout; the batch stays open
+                    if 'locked' not in str(e).lower() and 'busy' not in str(e).lower():
+                        raise
+                    self.busy_commits += 1
+                    return False
+                self.commits += 1
+                COMMITS.inc()
+            with self._condition:
+                if self.pending:
+                    BATCH_SIZES.observe(self.pending)
+                self.pending = 0
+                self._first_write = None
+            # Something else (e.g. a standings refresh) may have committed the
+            # batch already; its changes are still owed to the listeners
+            pending, db._pending_changes = db._pending_changes, []
+            for table, row_id in pending:
+                db._notify_change(table, row_id)
+        return True
+    
+    def stats(self) -> Dict:
+        with self._condition:
+            return {
+                'pending': self.pending,
+                'writes': self.writes,
+                'commits': self.commits,
+                'busy_commits': self.busy_commits,
+                'max_ops': self.max_ops,
+                'interval': self.interval
+            }
+    
+    def stop(self, retries: int = 0) -> bool:
+        """Stop the thread and commit what is still queued.
+
+        A commit that keeps finding the database busy is retried ``retries``
+        times; after that the queued writes are rolled back and False is
+        returned.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+        
+        for _ in range(retries + 1):
+            if self.flush():
+                return True
+            time.sleep(self.interval)
+        with self.db.lock:
+            lost = self.pending
+            self.db.conn.rollback()
+            self.db._pending_changes.clear()
+            self.db.invalidate_caches()
+            self.pending = 0
+        print(f"Database is busy; {lost} queued write(s) were not saved.")
+        return False
+    
+    def _seconds_until_due(self, now: float) -> Optional[float]:
+        """Seconds until the batch should commit (0 = now, None = idle)."""
+        if self._first_write is None:
+            return None
+        return max(0.0, self._first_write + self.interval - now)
+    
+    def _run(self):
+        """Commit each batch once it is old enough."""
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopping:
+                        return
+                    wait = self._seconds_until_due(time.monotonic())
+                    if wait == 0.0:
+                        break
+                    self._condition.wait(wait)
+            # Outside the condition: flush takes the database lock, which
+            # writers hold while they notify this thread
+            if not self.flush():
+                time.sleep(self.interval)
@@ -0,0 +1,130 @@
+"""
+Identity Map for AADS Series
+Bounded in-process cache of player ids by name and of player and event rows
+by id, so repeated lookups of the same people do not go back to SQLite
+"""
+
+import os
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from metrics import CACHE_REQUESTS
+
+# Entries kept per map; least recently used entries are dropped beyond this
+IDENTITY_MAP_SIZE = 20000
+
+
+class IdentityMap:
+    def __init__(self, conn: sqlite3.Connection, max_size: Optional[int] = None):
+        """Name -> player id, player id -> row and event id -> row, filled lazily.
+
+        Names and ids never change, so a name stays mapped until the player
+        is deleted; cached rows are dropped whenever a write touches them.
+        ``sync()`` clears everything when another connection has committed.
+        """
+        self.conn = conn
+        self.max_size = max_size if max_size is not None else int(
+            os.getenv('IDENTITY_MAP_SIZE', str(IDENTITY_MAP_SIZE)))
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._names: Dict[int, str] = {}
+        self._players: "OrderedDict[int, Dict]" = OrderedDict()
+        self._events: "OrderedDict[int, Dict]" = OrderedDict()
+        self._data_version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._players) + len(self._events)
+    
+    def sync(self):
+        """Forget everything if another connection changed the database."""
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            if self._data_version is not None:
+                self.clear()
+            self._data_version = version
+    
+    def clear(self):
+        self._ids.clear()
+        self._names.clear()
+        self._players.clear()
+        self._events.clear()
+    
+    def _hit(self, cache: str):
+        self.hits += 1
+        CACHE_REQUESTS.inc(cache=cache, result='hit')
+    
+    def _miss(self, cache: str):
+        self.misses += 1
+        CACHE_REQUESTS.inc(cache=cache, result='miss')
+    
+    def _bound(self, entries: OrderedDict):
+        while len(entries) > self.max_size:
+            _, value = entries.popitem(last=False)
+            if entries is self._ids:
+                self._names.pop(value, None)
+    
+    def remember_player(self, player_id: int, name: str):
+        """Map a name to its id, e.g. right after inserting the player."""
+        self._ids[name] = player_id
+        self._ids.move_to_end(name)
+        self._names[player_id] = name
+        self._bound(self._ids)
+    
+    def _cache_player(self, row: sqlite3.Row) -> Dict:
+        player = dict(row)
+        self.remember_player(player['id'], player['name'])
+        self._players[player['id']] = player
+        self._bound(self._players)
+        return player
+    
+    def player_id(self, name: str) -> Optional[int]:
+        """Id of the player called ``name``, or None if there is none."""
+        player_id = self._ids.get(name)
+        if player_id is not None:
+            self._hit('player_ids')
+            self._ids.move_to_end(name)
+            return player_id
+        self._miss('player_ids')
+        row = self.conn.execute("SELECT * FROM players WHERE name = ?", (name,)).fetchone()
+        return None if row is None else self._cache_player(row)['id']
+    
+    def player(self, player_id: int) -> Optional[Dict]:
+        """A copy of the player's row, or None."""
+        player = self._players.get(player_id)
+        if player is not None:
+            self._hit('players')
+            self._players.move_to_end(player_id)
+            return dict(player)
+        self._miss('players')
+        row = self.conn.execute("SELECT * FROM players WHERE id = ?", (player_id,)).fetchone()
+        return None if row is None else dict(self._cache_player(row))
+    
+    def event(self, event_id: int) -> Optional[Dict]:
+        """A copy of the event's row, or None."""
+        event = self._events.get(event_id)
+        if event is not None:
+            self._hit('events')
+            self._events.move_to_end(event_id)
+            return dict(event)
+        self._miss('events')
+        row = self.conn.execute("SELECT * FROM events WHERE id = ?", (event_id,)).fetchone()
+        if row is None:
+            return None
+        self._events[event_id] = event = dict(row)
+        self._bound(self._events)
+        return dict(event)
+    
+    def player_changed(self, player_id: int):
+        """Drop a cached player row after it was written; the name stays mapped."""
+        self._players.pop(player_id, None)
+    
+    def player_deleted(self, player_id: int):
+        self._players.pop(player_id, None)
+        name = self._names.pop(player_id, None)
+        if name is not None:
+            self._ids.pop(name, None)
+    
+    def event_changed(self, event_id: int):
+        self._events.pop(event_id, None)
@@ -0,0 +1,212 @@
+"""
+Local Backups for AADS Series
+Rotating on-disk snapshots taken with SQLite's online backup API
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Pages copied per backup step, and the pause between steps during which
+# other connections may write
+BACKUP_STEP_PAGES = 256
+BACKUP_STEP_SLEEP = 0.005
+
+# A write from another connection restarts a stepped copy; after this many
+# restarts the rest is copied in one step instead of chasing the writer
+MAX_RESTARTS = 3
+
+SNAPSHOT_TIME_FORMAT = '%Y%m%d-%H%M%S'
+
+
+class _TooManyRestarts(Exception):
+    """Raised from the progress callback to abandon a stepped copy."""
+
+
+class LocalBackup:
+    def __init__(self, db_path: str, backup_dir: Optional[str] = None,
+                 retention: Optional[int] = None, step_pages: Optional[int] = None):
+        """Snapshot ``db_path`` into ``backup_dir``, keeping the newest ``retention`` files.
+
+        Defaults come from BACKUP_DIR (a ``backups`` folder next to the
+        database), BACKUP_RETENTION (10) and BACKUP_STEP_PAGES.
+        """
+        if db_path == ':memory:':
+            raise ValueError("in-memory databases cannot be snapshotted by path")
+        
+        self.db_path = os.path.abspath(db_path)
+        default_dir = os.path.join(os.path.dirname(self.db_path), 'backups')
+        self.backup_dir = backup_dir or os.getenv('BACKUP_DIR') or default_dir
+        self.retention = retention if retention is not None else int(os.getenv('BACKUP_RETENTION', '10'))
+        self.step_pages = step_pages or int(os.getenv('BACKUP_STEP_PAGES', str(BACKUP_STEP_PAGES)))
+        
+        self.last_result: Optional[Dict] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def running(self) -> bool:
+        """Whether a background snapshot is in progress."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _snapshot_path(self, label: str = '') -> str:
+        """A new, unused timestamped file name in the backup folder."""
+        stem = os.path.splitext(os.path.basename(self.db_path))[0]
+        stamp = datetime.now().strftime(SNAPSHOT_TIME_FORMAT)
+        suffix = f"-{label}" if label else ""
+        path = os.path.join(self.backup_dir, f"{stem}-{stamp}{suffix}.db")
+        counter = 1
+        while os.path.exists(path):
+            counter += 1
+            path = os.path.join(self.backup_dir, f"{stem}-{stamp}{suffix}-{counter}.db")
+        return path
+    
+    def snapshot(self, label: str = '',
+                 progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """Copy the database to a new snapshot and prune old ones.
+
+        The copy runs ``step_pages`` pages at a time on its own connection,
+        so the database stays usable while it runs. Returns the snapshot
+        path, size, page count, duration and pages per second.
+        """
+        os.makedirs(self.backup_dir, exist_ok=True)
+        path = self._snapshot_path(label)
+        partial = path + '.partial'
+        pages = {'total': 0, 'copied': 0, 'restarts': 0}
+        
+        def on_progress(status, remaining, total):
+            copied = total - remaining
+            if copied < pages['copied']:
+                pages['restarts'] += 1
+                if pages['restarts'] > MAX_RESTARTS:
+                    raise _TooManyRestarts()
+            pages['total'], pages['copied'] = total, copied
+            if progress:
+                progress(copied, total)
+        
+        started = time.perf_counter()
+        source = sqlite3.connect(self.db_path)
+        target = sqlite3.connect(partial)
+        try:
+            try:
+                source.backup(target, pages=self.step_pages, progress=on_progress,
+                              sleep=BACKUP_STEP_SLEEP)
+            except _TooManyRestarts:
+                pages['copied'] = 0
+                source.backup(target, pages=-1, progress=on_progress)
+        except Exception:
+            target.close()
+            os.remove(partial)
+            raise
+        finally:
+            source.close()
+        target.close()
+        # Only complete copies get the final name, so a crash never leaves
+        # a half-written file that looks like a snapshot
+        os.replace(partial, path)
+        elapsed = time.perf_counter() - started
+        
+        result = {
+            'path': path,
+            'bytes': os.path.getsize(path),
+            'pages': pages['total'],
+            'seconds': elapsed,
+            'pages_per_sec': pages['total'] / elapsed if elapsed > 0 else 0.0,
+            'restarts': pages['restarts'],
+            'pruned': self.prune(),
+            'finished_at': datetime.now().isoformat(sep=' ', timespec='seconds')
+        }
+        with self._lock:
+            self.last_result = result
+        return result
+    
+    def snapshot_in_background(self, label: str = '',
+                               on_done: Optional[Callable[[Dict], None]] = None) -> bool:
+        """Start a snapshot on a worker thread; False if one is already running."""
+        if self.running:
+            return False
+        
+        def work():
+            try:
+                result = self.snapshot(label)
+            except Exception as e:
+                result = {'error': str(e), 'finished_at': datetime.now().isoformat(sep=' ', timespec='seconds')}
+                with self._lock:
+                    self.last_result = result
+            if on_done:
+                on_done(result)
+        
+        self._thread = threading.Thread(target=work, name="aads-backup", daemon=True)
+        self._thread.start()
+        return True
+    
+    def wait(self, timeout: Optional[float] = None):
+        """Block until a background snapshot finishes."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def list_snapshots(self) -> List[Dict]:
+        """Completed snapshots of this database, newest first."""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        
+        stem = os.path.splitext(os.path.basename(self.db_path))[0] + '-'
+        snapshots = []
+        for name in os.listdir(self.backup_dir):
+            if not (name.startswith(stem) and name.endswith('.db')):
+                continue
+            path = os.path.join(self.backup_dir, name)
+            stat = os.stat(path)
+            snapshots.append({
+                'name': name,
+                'path': path,
+                'bytes': stat.st_size,
+                'created': datetime.fromtimestamp(stat.st_mtime).isoformat(sep=' ', timespec='seconds'),
+                'mtime_ns': stat.st_mtime_ns
+            })
+        # Files are renamed into place once complete, so modification time
+        # orders them even when several share a timestamp in their name
+        snapshots.sort(key=lambda snapshot: (snapshot['mtime_ns'], snapshot['name']), reverse=True)
+        return snapshots
+    
+    def prune(self) -> List[str]:
+        """Delete all but the newest ``retention`` snapshots; returns removed paths."""
+        if self.retention <= 0:
+            return []
+        removed = []
+        for snapshot in self.list_snapshots()[self.retention:]:
+            os.remove(snapshot['path'])
+            removed.append(snapshot['path'])
+        return removed
+    
+    def restore(self, snapshot_path: str, conn: sqlite3.Connection) -> Dict:
+        """Overwrite the live database behind ``conn`` with a snapshot.
+
+        The snapshot is copied in a single backup step, replacing every page
+        at once. Returns the page count and duration.
+        """
+        if not os.path.exists(snapshot_path):
+            raise FileNotFoundError(snapshot_path)
+        
+        pages = {'total': 0}
+        
+        def on_progress(status, remaining, total):
+            pages['total'] = total
+        
+        started = time.perf_counter()
+        conn.commit()
+        source = sqlite3.connect(snapshot_path)
+        try:
+            source.backup(conn, pages=-1, progress=on_progress)
+        finally:
+            source.close()
+        elapsed = time.perf_counter() - started
+        return {
+            'path': snapshot_path,
+            'pages': pages['total'],
+            'seconds': elapsed,
+            'pages_per_sec': pages['total'] / elapsed if elapsed > 0 else 0.0
+        }
@@ -0,0 +1,229 @@
+"""
+Consistency Check for AADS Series
+Compares local and cloud tables through hash trees over id ranges
+"""
+
+import hashlib
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from aads_records import Player, Event, Participant
+
+RECORD_TYPES = (Player, Event, Participant)
+
+# Children per mismatching range, and the row count at which a range is
+# compared row by row instead of being split further
+FANOUT = 16
+LEAF_SIZE = 64
+
+# Postgres side of the check; both functions hash exactly the columns the
+# client sends, rendered as text and joined with '|', like row_text() below
+MERKLE_SQL = """
+-- Range digests for the local/cloud consistency check
+CREATE OR REPLACE FUNCTION aads_row_text_sql(cols TEXT[]) RETURNS TEXT AS $$
+    SELECT string_agg(format('COALESCE(%I::text, '''')', c), ' || ''|'' || ' ORDER BY ord)
+    FROM unnest(cols) WITH ORDINALITY AS u(c, ord);
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION aads_range_digests(tbl TEXT, cols TEXT[], los BIGINT[], his BIGINT[])
+RETURNS TABLE(lo BIGINT, row_count BIGINT, digest TEXT) AS $$
+BEGIN
+    RETURN QUERY EXECUTE format(
+        'SELECT b.lo, COUNT(t.id),
+                md5(COALESCE(string_agg(md5(%s), '''' ORDER BY t.id) FILTER (WHERE t.id IS NOT NULL), ''''))
+         FROM unnest($1, $2) AS b(lo, hi)
+         LEFT JOIN %I t ON t.id >= b.lo AND t.id < b.hi
+         GROUP BY b.lo
+         ORDER BY b.lo',
+        aads_row_text_sql(cols), tbl)
+    USING los, his;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+CREATE OR REPLACE FUNCTION aads_row_hashes(tbl TEXT, cols TEXT[], los BIGINT[], his BIGINT[])
+RETURNS TABLE(row_id BIGINT, hash TEXT) AS $$
+BEGIN
+    RETURN QUERY EXECUTE format(
+        'SELECT t.id::bigint, md5(%s)
+         FROM unnest($1, $2) AS b(lo, hi)
+         JOIN %I t ON t.id >= b.lo AND t.id < b.hi
+         ORDER BY t.id',
+        aads_row_text_sql(cols), tbl)
+    USING los, his;
+END;
+$$ LANGUAGE plpgsql STABLE;
+"""
+
+
+def row_text(payload: Dict) -> str:
+    """Render a cloud payload the way Postgres renders the row as text."""
+    values = []
+    for value in payload.values():
+        if value is None:
+            values.append('')
+        elif value is True or value is False:
+            values.append('true' if value else 'false')
+        else:
+            values.append(str(value))
+    return '|'.join(values)
+
+
+def row_hash(payload: Dict) -> str:
+    """md5 of a payload's row text."""
+    return hashlib.md5(row_text(payload).encode('utf-8')).hexdigest()
+
+
+def cloud_columns(record_type) -> List[str]:
+    """Columns compared for a record type: exactly the ones pushed to the cloud."""
+    return list(record_type._make([None] * len(record_type._fields)).to_cloud())
+
+
+class SQLiteDigestSource:
+    def __init__(self, conn: sqlite3.Connection):
+        """Digests computed from a local SQLite database.
+
+        Also serves as a stand-in for the cloud side, e.g. a copy of the
+        database, so the check can be exercised offline.
+        """
+        self.conn = conn
+        self.round_trips = 0
+    
+    def _rows(self, record_type, lo: int, hi: int):
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT {', '.join(record_type._fields)}
+            FROM {record_type.TABLE}
+            WHERE id >= ? AND id < ?
+            ORDER BY id
+        """, (lo, hi))
+        return map(record_type._make, cursor)
+    
+    def bounds(self, record_type) -> Optional[Tuple[int, int]]:
+        """Smallest and largest id, or None for an empty table."""
+        self.round_trips += 1
+        lo, hi = self.conn.execute(f"SELECT MIN(id), MAX(id) FROM {record_type.TABLE}").fetchone()
+        return None if lo is None else (lo, hi)
+    
+    def range_digests(self, record_type, ranges: List[Tuple[int, int]]) -> List[Tuple[int, str]]:
+        """(row count, digest) for each half-open id range."""
+        self.round_trips += 1
+        digests = []
+        for lo, hi in ranges:
+            combined = hashlib.md5()
+            count = 0
+            for record in self._rows(record_type, lo, hi):
+                combined.update(row_hash(record.to_cloud()).encode('ascii'))
+                count += 1
+            digests.append((count, combined.hexdigest()))
+        return digests
+    
+    def row_hashes(self, record_type, ranges: List[Tuple[int, int]]) -> Dict[int, str]:
+        """id -> row hash for every row in the ranges."""
+        self.round_trips += 1
+        return {record.id: row_hash(record.to_cloud())
+                for lo, hi in ranges for record in self._rows(record_type, lo, hi)}
+
+
+class SupabaseDigestSource:
+    def __init__(self, client):
+        """Digests computed inside Postgres by the MERKLE_SQL functions."""
+        self.client = client
+        self.round_trips = 0
+    
+    def bounds(self, record_type) -> Optional[Tuple[int, int]]:
+        """Smallest and largest id, or None for an empty table."""
+        self.round_trips += 2
+        first = self.client.table(record_type.TABLE).select('id').order('id').limit(1).execute().data
+        if not first:
+            return None
+        last = self.client.table(record_type.TABLE).select('id').order('id', desc=True).limit(1).execute().data
+        return first[0]['id'], last[0]['id']
+    
+    def _rpc(self, function: str, record_type, ranges: List[Tuple[int, int]]) -> List[Dict]:
+        self.round_trips += 1
+        return self.client.rpc(function, {
+            'tbl': record_type.TABLE,
+            'cols': cloud_columns(record_type),
+            'los': [lo for lo, _ in ranges],
+            'his': [hi for _, hi in ranges]
+        }).execute().data
+    
+    def range_digests(self, record_type, ranges: List[Tuple[int, int]]) -> List[Tuple[int, str]]:
+        """(row count, digest) for each half-open id range, in one request."""
+        by_lo = {row['lo']: (row['row_count'], row['digest'])
+                 for row in self._rpc('aads_range_digests', record_type, ranges)}
+        return [by_lo[lo] for lo, _ in ranges]
+    
+    def row_hashes(self, record_type, ranges: List[Tuple[int, int]]) -> Dict[int, str]:
+        """id -> row hash for every row in the ranges, in one request."""
+        return {row['row_id']: row['hash'] for row in self._rpc('aads_row_hashes', record_type, ranges)}
+
+
+def split_range(lo: int, hi: int, parts: int) -> List[Tuple[int, int]]:
+    """Cut [lo, hi) into up to ``parts`` contiguous, non-empty ranges."""
+    parts = max(1, min(parts, hi - lo))
+    step, extra = divmod(hi - lo, parts)
+    ranges = []
+    start = lo
+    for i in range(parts):
+        end = start + step + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def compare_table(local, remote, record_type, fanout: int = FANOUT,
+                  leaf_size: int = LEAF_SIZE) -> Dict:
+    """Find the ids that differ between two sources for one table.
+
+    Both sides digest the same id ranges; only mismatching ranges are split
+    further, a whole tree level per request, so a handful of differences
+    costs O(log n) round trips instead of a full download.
+    """
+    result = {'missing_local': [], 'missing_remote': [], 'different': [], 'ranges_compared': 0}
+    local_bounds, remote_bounds = local.bounds(record_type), remote.bounds(record_type)
+    known = [bounds for bounds in (local_bounds, remote_bounds) if bounds]
+    if not known:
+        return result
+    
+    frontier = [(min(lo for lo, _ in known), max(hi for _, hi in known) + 1)]
+    while frontier:
+        result['ranges_compared'] += len(frontier)
+        local_digests = local.range_digests(record_type, frontier)
+        remote_digests = remote.range_digests(record_type, frontier)
+        
+        leaves, next_frontier = [], []
+        for (lo, hi), (local_count, local_digest), (remote_count, remote_digest) in zip(
+                frontier, local_digests, remote_digests):
+            if local_digest == remote_digest:
+                continue
+            if max(local_count, remote_count) <= leaf_size or hi - lo <= fanout:
+                leaves.append((lo, hi))
+            else:
+                next_frontier.extend(split_range(lo, hi, fanout))
+        
+        if leaves:
+            local_rows = local.row_hashes(record_type, leaves)
+            remote_rows = remote.row_hashes(record_type, leaves)
+            result['missing_remote'].extend(sorted(local_rows.keys() - remote_rows.keys()))
+            result['missing_local'].extend(sorted(remote_rows.keys() - local_rows.keys()))
+            result['different'].extend(sorted(row_id for row_id in local_rows.keys() & remote_rows.keys()
+                                              if local_rows[row_id] != remote_rows[row_id]))
+        frontier = next_frontier
+    
+    for key in ('missing_local', 'missing_remote', 'different'):
+        result[key].sort()
+    return result
+
+
+def compare(local, remote, fanout: int = FANOUT, leaf_size: int = LEAF_SIZE) -> Dict[str, Dict]:
+    """Compare every synced table; results are keyed by table name."""
+    results = {}
+    for record_type in RECORD_TYPES:
+        local_trips, remote_trips = local.round_trips, remote.round_trips
+        result = compare_table(local, remote, record_type, fanout, leaf_size)
+        result['round_trips'] = remote.round_trips - remote_trips
+        result['local_queries'] = local.round_trips - local_trips
+        results[record_type.TABLE] = result
+    return results
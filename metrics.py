@@ -0,0 +1,315 @@
+"""
+Metrics for AADS Series
+Shared in-process registry of counters, gauges and histograms, exported in the
+Prometheus text format over HTTP (/metrics) or as a node_exporter textfile
+"""
+
+import abc
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; tuned for SQLite calls (sub-millisecond) up to cloud syncs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+TEXTFILE_INTERVAL = 15.0
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric(abc.ABC):
+    TYPE = 'untyped'
+    
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    @abc.abstractmethod
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """(suffix, label text, value) for every exported sample."""
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(f"{self.name}{suffix}{labels} {_format_value(value)}"
+                     for suffix, labels, value in self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    TYPE = 'counter'
+    
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        """A monotonically increasing count, one series per label combination."""
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple, float] = {} if labels else {(): 0.0}
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+    
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield '', _labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    TYPE = 'gauge'
+    
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 callback: Optional[Callable[[], Dict[Tuple, float]]] = None):
+        """A value that goes up and down.
+
+        With ``callback`` the values are computed at export time; it returns
+        {label values: value} and may leave out series that have no value.
+        """
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple, float] = {}
+        self.callback = callback
+    
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def value(self, **labels) -> Optional[float]:
+        return self._values.get(self._key(labels))
+    
+    def values(self) -> Dict[Tuple, float]:
+        """Current values of the set series, by label values."""
+        with self._lock:
+            return dict(self._values)
+    
+    def samples(self):
+        if self.callback is not None:
+            items = sorted((tuple(str(v) for v in key), value) for key, value in self.callback().items())
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        for key, value in items:
+            yield '', _labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    TYPE = 'histogram'
+    
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """Observations counted into cumulative ``le`` buckets, plus sum and count."""
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [count per bucket (last is +Inf), sum]
+        self._series: Dict[Tuple, list] = {}
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+    
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a ``with`` block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+    
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield '_bucket', _labels(self.labelnames, key, f'le="{_format_value(bound)}"'), cumulative
+            yield '_sum', _labels(self.labelnames, key), total
+            yield '_count', _labels(self.labelnames, key), cumulative
+
+
+class Registry:
+    def __init__(self):
+        """Named metrics shared by every component in the process."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, metric_type, name: str, *args, **kwargs) -> _Metric:
+        """Create a metric, or return the existing one so modules can re-register."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_type(name, *args, **kwargs)
+            elif type(metric) is not metric_type:
+                raise ValueError(f"{name} is already registered as a {metric.TYPE}")
+            return metric
+    
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labels)
+    
+    def gauge(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+              callback: Optional[Callable[[], Dict[Tuple, float]]] = None) -> Gauge:
+        return self._register(Gauge, name, documentation, labels, callback)
+    
+    def histogram(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labels, buckets)
+    
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# The process-wide registry components publish to
+REGISTRY = Registry()
+
+# Metrics several components report to; a component's own metrics live in its module
+CACHE_REQUESTS = REGISTRY.counter('aads_cache_requests_total', 'In-memory cache lookups', ('cache', 'result'))
+COMMITS = REGISTRY.counter('aads_db_commits_total', 'Write transactions committed')
+ROLLBACKS = REGISTRY.counter('aads_db_rollbacks_total', 'Write transactions rolled back')
+
+
+def write_textfile(path: str, registry: Registry = REGISTRY):
+    """Write the metrics for node_exporter's textfile collector.
+
+    The file is replaced atomically so the collector never reads half of it.
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        handle.write(registry.render())
+    os.replace(temporary, path)
+
+
+class MetricsServer:
+    def __init__(self, port: int, host: str = '127.0.0.1', registry: Registry = REGISTRY):
+        """Serve ``/metrics`` from a background thread."""
+        self.registry = registry
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split('?', 1)[0] != '/metrics':
+                    handler.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                handler.send_response(200)
+                handler.send_header('Content-Type', CONTENT_TYPE)
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+            
+            def log_message(handler, format, *args):
+                # Scrapes every few seconds would flood the console
+                pass
+        
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="aads-metrics", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TextfileExporter:
+    def __init__(self, path: str, interval: float = TEXTFILE_INTERVAL, registry: Registry = REGISTRY):
+        """Rewrite a textfile every ``interval`` seconds from a background thread."""
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="aads-metrics-textfile", daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while True:
+            try:
+                write_textfile(self.path, self.registry)
+            except OSError as e:
+                print(f"Could not write metrics to {self.path}: {e}")
+            if self._stopped.wait(self.interval):
+                return
+    
+    def stop(self):
+        """Stop the thread after a final write."""
+        self._stopped.set()
+        self._thread.join()
+        try:
+            write_textfile(self.path, self.registry)
+        except OSError:
+            pass
+
+
+def start_exporters(registry: Registry = REGISTRY) -> List:
+    """Start the exporters configured by METRICS_PORT and METRICS_TEXTFILE.
+
+    Returns the started exporters; call ``stop()`` on each when done.
+    """
+    exporters = []
+    port = os.getenv('METRICS_PORT', '').strip()
+    if port:
+        host = os.getenv('METRICS_HOST', '127.0.0.1')
+        try:
+            exporters.append(MetricsServer(int(port), host, registry))
+        except (OSError, ValueError) as e:
+            print(f"Could not serve metrics on {host}:{port}: {e}")
+    path = os.getenv('METRICS_TEXTFILE', '').strip()
+    if path:
+        interval = float(os.getenv('METRICS_TEXTFILE_INTERVAL', str(TEXTFILE_INTERVAL)))
+        exporters.append(TextfileExporter(path, interval, registry))
+    return exporters
@@ -0,0 +1,134 @@
+"""
+Participation Index for AADS Series
+In-memory players x events matrix packed into bitsets for fast roster set queries
+"""
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+
+def bits_to_ids(bits: int) -> List[int]:
+    """Return the positions of the set bits, lowest first."""
+    # bin() runs in C; scanning its reversed digits for '1' is far quicker
+    # than peeling bits off a large integer one at a time
+    digits = bin(bits)[:1:-1]
+    ids = []
+    position = digits.find('1')
+    while position != -1:
+        ids.append(position)
+        position = digits.find('1', position + 1)
+    return ids
+
+
+def ids_to_bits(ids: Iterable[int]) -> int:
+    """Pack ids into a bitset."""
+    # Fill a byte buffer and convert once; OR-ing into a growing integer
+    # would copy the whole bitset for every id
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray((max(ids) >> 3) + 1)
+    for id_ in ids:
+        buffer[id_ >> 3] |= 1 << (id_ & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class ParticipationIndex:
+    def __init__(self):
+        """Create an empty index; use ``from_connection`` to load one."""
+        self._by_event: Dict[int, int] = {}   # event id -> bitset of player ids
+        self._by_player: Dict[int, int] = {}  # player id -> bitset of event ids
+        self._players = 0                      # bitset of every known player id
+        self._played = 0                       # bitset of players with any event
+    
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> 'ParticipationIndex':
+        """Build the index from the players and event_participants tables."""
+        index = cls()
+        index._players = ids_to_bits(row[0] for row in conn.execute("SELECT id FROM players"))
+        
+        by_event: Dict[int, List[int]] = {}
+        for event_id, player_id in conn.execute("SELECT event_id, player_id FROM event_participants"):
+            by_event.setdefault(event_id, []).append(player_id)
+            index._by_player[player_id] = index._by_player.get(player_id, 0) | (1 << event_id)
+        index._by_event = {event_id: ids_to_bits(ids) for event_id, ids in by_event.items()}
+        index._played = ids_to_bits(index._by_player)
+        return index
+    
+    def add_player(self, player_id: int):
+        """Record a player that may not have played yet."""
+        self._players |= 1 << player_id
+    
+    def add(self, event_id: int, player_id: int):
+        """Record that a player is on an event roster."""
+        self._players |= 1 << player_id
+        self._played |= 1 << player_id
+        self._by_event[event_id] = self._by_event.get(event_id, 0) | (1 << player_id)
+        self._by_player[player_id] = self._by_player.get(player_id, 0) | (1 << event_id)
+    
+    def remove(self, event_id: int, player_id: int):
+        """Record that a player was taken off an event roster."""
+        self._by_event[event_id] = self._by_event.get(event_id, 0) & ~(1 << player_id)
+        remaining = self._by_player.get(player_id, 0) & ~(1 << event_id)
+        if remaining:
+            self._by_player[player_id] = remaining
+        else:
+            self._by_player.pop(player_id, None)
+            self._played &= ~(1 << player_id)
+    
+    def remove_player(self, player_id: int):
+        """Forget a deleted player entirely."""
+        for event_id in bits_to_ids(self._by_player.pop(player_id, 0)):
+            self._by_event[event_id] &= ~(1 << player_id)
+        self._players &= ~(1 << player_id)
+        self._played &= ~(1 << player_id)
+    
+    def everyone(self) -> int:
+        """Bitset of all players."""
+        return self._players
+    
+    def played_any(self) -> int:
+        """Bitset of players with at least one event."""
+        return self._played
+    
+    def players_in(self, event_id: int) -> int:
+        """Bitset of the players on an event roster."""
+        return self._by_event.get(event_id, 0)
+    
+    def events_for(self, player_id: int) -> List[int]:
+        """Event ids a player has played, in id order."""
+        return bits_to_ids(self._by_player.get(player_id, 0))
+    
+    def query(self, all_of: Iterable[int] = (), any_of: Iterable[int] = (),
+              none_of: Iterable[int] = (), among: Optional[int] = None) -> int:
+        """Players who played every ``all_of`` event, at least one ``any_of``
+        event (if given) and none of the ``none_of`` events.
+
+        ``among`` restricts the result to a bitset of candidates (all players
+        by default). The result is a bitset; see ``bits_to_ids``.
+        """
+        result = self._players if among is None else among
+        for event_id in all_of:
+            result &= self._by_event.get(event_id, 0)
+        
+        any_of = list(any_of)
+        if any_of:
+            union = 0
+            for event_id in any_of:
+                union |= self._by_event.get(event_id, 0)
+            result &= union
+        
+        for event_id in none_of:
+            result &= ~self._by_event.get(event_id, 0)
+        return result
+    
+    def absent_since(self, event_id: int) -> int:
+        """Players who played before ``event_id`` but not in it or any later event."""
+        earlier = (1 << event_id) - 1
+        return ids_to_bits(player_id for player_id, events in self._by_player.items()
+                           if events & earlier and not events >> event_id)
+    
+    def single_appearance(self) -> int:
+        """Players who never played again after their debut event."""
+        return ids_to_bits(player_id for player_id, events in self._by_player.items()
+                           if events & (events - 1) == 0)
@@ -11,6 +11,12 @@ def check_database_exists():
     return os.path.exists("aads_series.db")
 
 def main():
+    # --profile also covers first-time initialization, not just the menu
+    profiler = None
+    if '--profile' in sys.argv[1:]:
+        from action_profiler import ActionProfiler
+        profiler = ActionProfiler()
+    
     print("="*70)
     print("  AADS SERIES MANAGER - Quick Start")
     print("  Atlantic Armwrestling Development Series")
@@ -34,7 +40,10 @@ def main():
             # Import and run initialization
             try:
                 from initialize_data import initialize_aads_data
-                initialize_aads_data()
+                if profiler:
+                    profiler.run('initialize_aads_data', initialize_aads_data)
+                else:
+                    initialize_aads_data()
                 print()
                 print("✓ Database initialized successfully!")
                 print()
@@ -62,7 +71,7 @@ def main():
     
     try:
         from aads_manager import main as run_manager
-        run_manager()
+        run_manager(profiler)
     except Exception as e:
         print(f"❌ Error launching manager: {e}")
         sys.exit(1)
@@ -0,0 +1,281 @@
+"""
+Season Analytics for AADS Series
+Standings, points, win rates and attendance streaks computed set-wise in SQLite
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from metrics import CACHE_REQUESTS
+
+# Points awarded by final placement; everyone else on a roster earns
+# PARTICIPATION_POINTS. An event's recorded winner counts as 1st place.
+PLACEMENT_POINTS = {1: 10, 2: 7, 3: 5, 4: 3, 5: 2}
+PARTICIPATION_POINTS = 1
+
+# Only completed invitationals count: a running or pending event has no
+# final results yet, and the TOC is the prize, not part of the season.
+QUALIFYING = "event_type = 'Invitational' AND status = 'Completed'"
+
+# One pass over event_participants: placements and points per row, then
+# gaps-and-islands over each player's event sequence numbers. Totals are
+# folded per island first so a single GROUP BY yields every column.
+STANDINGS_SQL = """
+    WITH points_table(placement, points) AS (
+        {points_values}
+    ),
+    series AS (
+        SELECT id, ROW_NUMBER() OVER (ORDER BY id) AS seq
+        FROM events
+        WHERE {qualifying}
+    ),
+    latest AS (
+        SELECT MAX(s.seq) AS seq
+        FROM series s
+        WHERE EXISTS (SELECT 1 FROM event_participants WHERE event_id = s.id)
+    ),
+    results AS (
+        SELECT
+            ep.player_id,
+            s.seq,
+            CASE WHEN e.winner_id = ep.player_id THEN 1 ELSE ep.placement END AS placement
+        FROM event_participants ep
+        JOIN events e ON e.id = ep.event_id
+        JOIN series s ON s.id = ep.event_id
+        {player_filter}
+    ),
+    islands AS (
+        SELECT
+            r.player_id,
+            r.seq - ROW_NUMBER() OVER (PARTITION BY r.player_id ORDER BY r.seq) AS island,
+            r.seq,
+            r.placement,
+            COALESCE(pt.points, ?) AS points
+        FROM results r
+        LEFT JOIN points_table pt ON pt.placement = r.placement
+    ),
+    streaks AS (
+        SELECT
+            player_id,
+            COUNT(*) AS length,
+            MAX(seq) AS last_seq,
+            COALESCE(SUM(placement = 1), 0) AS wins,
+            COALESCE(SUM(placement BETWEEN 1 AND 3), 0) AS podiums,
+            SUM(points) AS points
+        FROM islands
+        GROUP BY player_id, island
+    )
+    SELECT
+        player_id,
+        SUM(length) AS events_played,
+        SUM(wins) AS wins,
+        SUM(podiums) AS podiums,
+        SUM(points) AS points,
+        ROUND(1.0 * SUM(wins) / SUM(length), 4) AS win_rate,
+        MAX(length) AS longest_streak,
+        MAX(CASE WHEN last_seq = (SELECT seq FROM latest) THEN length ELSE 0 END) AS current_streak,
+        ? AS refreshed_at
+    FROM streaks
+    GROUP BY player_id
+"""
+
+
+class SeasonAnalytics:
+    def __init__(self, db, points: Optional[Dict[int, int]] = None,
+                 participation_points: int = PARTICIPATION_POINTS):
+        """Materialize season standings for ``db`` and keep them current.
+
+        The standings table is rebuilt once, then only players touched by a
+        change are recomputed, lazily, the next time results are read.
+        Changes committed by other connections are not reported to the
+        listener, so any of them triggers a full rebuild instead.
+        """
+        self.db = db
+        self.points = dict(points or PLACEMENT_POINTS)
+        self.participation_points = participation_points
+        
+        self._dirty_players: Set[int] = set()
+        self._needs_full_refresh = True
+        self._latest_event: Optional[int] = None
+        self._data_version: Optional[int] = None
+        
+        self.db.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS season_standings (
+                player_id INTEGER PRIMARY KEY,
+                events_played INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                podiums INTEGER NOT NULL,
+                points INTEGER NOT NULL,
+                win_rate REAL NOT NULL,
+                longest_streak INTEGER NOT NULL,
+                current_streak INTEGER NOT NULL,
+                refreshed_at TIMESTAMP
+            )
+        """)
+        # Top-N pages seek the highest points instead of sorting everyone
+        self.db.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_season_standings_points ON season_standings(points DESC)
+        """)
+        self.db.conn.commit()
+        self.db.add_change_listener(self._on_change)
+    
+    def fork(self, db) -> 'SeasonAnalytics':
+        """Analytics for ``db``, a copy made after this object's standings were current."""
+        copy = SeasonAnalytics(db, self.points, self.participation_points)
+        copy._needs_full_refresh = False
+        copy._latest_event = self._latest_event
+        return copy
+    
+    def mark_stale(self):
+        """Schedule a full rebuild, e.g. after a bulk pull."""
+        self._needs_full_refresh = True
+    
+    def _sync(self):
+        """Mark the standings stale if another connection committed since the last look."""
+        version = self.db.conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._data_version is not None and version != self._data_version:
+            self.mark_stale()
+        self._data_version = version
+    
+    def _on_change(self, table: str, row_id: int):
+        """Track which players' standings a committed change affects."""
+        if table == 'event_participants':
+            # Own cursors: listeners run in the middle of AADSDatabase methods
+            row = self.db.conn.execute(f"""
+                SELECT event_id, player_id, event_id IN (SELECT id FROM events WHERE {QUALIFYING})
+                FROM event_participants
+                WHERE id = ?
+            """, (row_id,)).fetchone()
+            if row is None:
+                self._needs_full_refresh = True
+                return
+            event_id, player_id, counts = row
+            if not counts:
+                return
+            self._dirty_players.add(player_id)
+            # A newer event moves every player's "current" streak
+            if self._latest_event is not None and event_id > self._latest_event:
+                self._needs_full_refresh = True
+        elif table == 'events':
+            # A winner change affects that event's roster, and completing a
+            # newer event moves every player's current streak
+            rows = self.db.conn.execute("SELECT player_id FROM event_participants WHERE event_id = ?", (row_id,))
+            self._dirty_players.update(row[0] for row in rows)
+            completed = self.db.conn.execute(f"SELECT 1 FROM events WHERE id = ? AND {QUALIFYING}",
+                                             (row_id,)).fetchone()
+            if completed and (self._latest_event is None or row_id > self._latest_event):
+                self._needs_full_refresh = True
+    
+    def refresh(self, player_ids: Optional[List[int]] = None):
+        """Recompute standings for ``player_ids``, or for everyone if omitted."""
+        values = ", ".join(f"({int(placement)}, {int(points)})" for placement, points in self.points.items())
+        now = datetime.now().isoformat(sep=' ', timespec='seconds')
+        
+        # Takes the write lock up front and joins group commit like any other write
+        with self.db.write_transaction():
+            if player_ids is None:
+                sql = STANDINGS_SQL.format(points_values=f"VALUES {values}", qualifying=QUALIFYING,
+                                           player_filter="")
+                params = (self.participation_points, now)
+                self.db.cursor.execute("DELETE FROM season_standings")
+            else:
+                sql = STANDINGS_SQL.format(
+                    points_values=f"VALUES {values}",
+                    qualifying=QUALIFYING,
+                    player_filter="WHERE ep.player_id IN (SELECT value FROM json_each(?))"
+                )
+                ids = json.dumps(sorted(player_ids))
+                params = (ids, self.participation_points, now)
+                # Players who no longer appear on any roster drop out of the table
+                self.db.cursor.execute("""
+                    DELETE FROM season_standings WHERE player_id IN (SELECT value FROM json_each(?))
+                """, (ids,))
+            
+            self.db.cursor.execute(f"""
+                INSERT OR REPLACE INTO season_standings
+                (player_id, events_played, wins, podiums, points, win_rate,
+                 longest_streak, current_streak, refreshed_at)
+                {sql}
+            """, params)
+            self.db.cursor.execute(f"""
+                SELECT MAX(event_id) FROM event_participants
+                WHERE event_id IN (SELECT id FROM events WHERE {QUALIFYING})
+            """)
+            self._latest_event = self.db.cursor.fetchone()[0]
+    
+    def _ensure_current(self):
+        """Apply pending changes before results are read."""
+        # A group committer's thread calls _on_change and commits on the same
+        # connection; the lock keeps it from touching the dirty set or
+        # committing a half-written batch in the middle of a refresh
+        with self.db.lock:
+            self._sync()
+            CACHE_REQUESTS.inc(cache='standings',
+                               result='miss' if self._needs_full_refresh or self._dirty_players else 'hit')
+            if self._needs_full_refresh:
+                self.refresh()
+                self._needs_full_refresh = False
+                self._dirty_players.clear()
+            elif self._dirty_players:
+                dirty = list(self._dirty_players)
+                self._dirty_players.clear()
+                self.refresh(dirty)
+    
+    def standings(self, limit: Optional[int] = None) -> List[Dict]:
+        """Season standings ordered by points, wins, then name."""
+        self._ensure_current()
+        where, params = "", ()
+        if limit is not None and limit > 0:
+            # The name tiebreak lives in players, so ORDER BY cannot use an
+            # index; only rows scoring at least the limit-th row are sorted
+            row = self.db.conn.execute("""
+                SELECT points FROM season_standings ORDER BY points DESC LIMIT 1 OFFSET ?
+            """, (limit - 1,)).fetchone()
+            if row is not None:
+                where, params = "WHERE s.points >= ?", (row[0],)
+        self.db.cursor.execute(f"""
+            SELECT
+                p.id,
+                p.name,
+                p.province,
+                p.status,
+                s.events_played,
+                s.wins,
+                s.podiums,
+                s.points,
+                s.win_rate,
+                s.longest_streak,
+                s.current_streak
+            FROM season_standings s
+            JOIN players p ON p.id = s.player_id
+            {where}
+            ORDER BY s.points DESC, s.wins DESC, p.name
+            {'LIMIT ?' if limit is not None else ''}
+        """, params + ((limit,) if limit is not None else ()))
+        return [dict(row) for row in self.db.cursor.fetchall()]
+    
+    def player_stats(self, player_id: int) -> Optional[Dict]:
+        """Standings row for one player, or None if they have not played."""
+        self._ensure_current()
+        self.db.cursor.execute("SELECT * FROM season_standings WHERE player_id = ?", (player_id,))
+        result = self.db.cursor.fetchone()
+        return dict(result) if result else None
+    
+    def province_breakdown(self) -> List[Dict]:
+        """Players, appearances, wins and points totalled per province."""
+        self._ensure_current()
+        self.db.cursor.execute("""
+            SELECT
+                p.province,
+                COUNT(*) AS players,
+                SUM(s.events_played) AS appearances,
+                SUM(s.wins) AS wins,
+                SUM(s.points) AS points,
+                ROUND(AVG(s.win_rate), 4) AS avg_win_rate
+            FROM season_standings s
+            JOIN players p ON p.id = s.player_id
+            GROUP BY p.province
+            ORDER BY points DESC
+        """)
+        return [dict(row) for row in self.db.cursor.fetchall()]
@@ -0,0 +1,204 @@
+"""
+Season Simulator for AADS Series
+Monte Carlo runs of the invitationals still to be decided, estimating how
+likely each player is to qualify for the Tournament of Champions
+"""
+
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from participation_index import bits_to_ids
+
+# Who gets invited to each remaining event, besides players already on its roster
+INVITE_POLICIES = {
+    'veterans': "players who have competed before (the invite candidates list)",
+    'all': "everyone on the master list",
+    'prospects': "players who have never competed",
+}
+
+# Seasons x players sampled at once by the NumPy path; bounds memory use
+CHUNK_CELLS = 2_000_000
+
+
+class SeasonSimulator:
+    def __init__(self, db, policy: str = 'veterans', attendance: float = 0.6,
+                 strength: float = 1.0, invite_limit: Optional[int] = None,
+                 skip_qualified: bool = True):
+        """Model the undecided invitationals from a fork of ``db``.
+
+        Each remaining event invites the ``policy`` pool (only the top
+        ``invite_limit`` by season points, if given). Invitees attend with
+        probability ``attendance``; players already on the roster always
+        do. The winner is drawn among attendees with weight
+        (season points + 1) ** ``strength``, so 0 makes everyone equally
+        likely. Qualified players are not invited again unless
+        ``skip_qualified`` is False. Pools are fixed when the model is built.
+        """
+        if policy not in INVITE_POLICIES:
+            raise ValueError(f"Unknown invite policy {policy!r}; choose from {', '.join(INVITE_POLICIES)}")
+        self.policy = policy
+        self.attendance = attendance
+        self.strength = strength
+        self.invite_limit = invite_limit
+        self.skip_qualified = skip_qualified
+        self.last_duration: Optional[float] = None
+        
+        # A fork is a consistent copy, and nothing here can touch the real data
+        fork = db.fork()
+        try:
+            self._load(fork)
+        finally:
+            fork.close()
+    
+    def _load(self, db):
+        rows = db.conn.execute("SELECT id, name, province, toc_qualified FROM players ORDER BY id").fetchall()
+        self.players = [(row[0], row[1], row[2]) for row in rows]
+        index = {row[0]: position for position, row in enumerate(rows)}
+        points = {row['id']: row['points'] for row in db.analytics.standings()}
+        
+        participation = db.participation
+        pool = {
+            'veterans': participation.played_any(),
+            'all': participation.everyone(),
+            'prospects': participation.everyone() & ~participation.played_any(),
+        }[self.policy]
+        
+        self.events = []
+        for event_id, name in db.conn.execute("""
+            SELECT id, name FROM events
+            WHERE event_type = 'Invitational' AND winner_id IS NULL
+            ORDER BY event_date IS NULL, event_date, id
+        """):
+            roster = participation.players_in(event_id)
+            invited = bits_to_ids(pool & ~roster)
+            if self.invite_limit is not None:
+                invited.sort(key=lambda player_id: (-points.get(player_id, 0), self.players[index[player_id]][1]))
+                invited = invited[:self.invite_limit]
+            self.events.append((event_id, name, [index[player_id] for player_id in invited],
+                                [index[player_id] for player_id in bits_to_ids(roster)]))
+        
+        self.model = {
+            'weights': [(points.get(player_id, 0) + 1) ** self.strength for player_id, _, _ in self.players],
+            'qualified': [bool(row[3]) for row in rows],
+            'events': [(invited, rostered) for _, _, invited, rostered in self.events],
+            'attendance': self.attendance,
+            'skip_qualified': self.skip_qualified,
+        }
+    
+    def run(self, seasons: int = 10000, processes: Optional[int] = None,
+            seed: Optional[int] = None) -> List[Dict]:
+        """Simulate ``seasons`` seasons; returns players with any chance, likeliest first.
+
+        Each row has the player's id, name and province, whether they are
+        already qualified, their qualification ``probability`` and the mean
+        number of remaining events they win. With ``processes`` the seasons
+        are split across a process pool.
+        """
+        started = time.perf_counter()
+        if processes and processes > 1 and seasons > 1:
+            parts = [seasons // processes + (i < seasons % processes) for i in range(processes)]
+            seeds = [None if seed is None else seed + i for i in range(processes)]
+            with ProcessPoolExecutor(processes) as pool:
+                results = list(pool.map(simulate, [self.model] * processes, parts, seeds))
+        else:
+            results = [simulate(self.model, seasons, seed)]
+        qualified = [sum(counts) for counts in zip(*(result[0] for result in results))]
+        wins = [sum(counts) for counts in zip(*(result[1] for result in results))]
+        self.last_duration = time.perf_counter() - started
+        
+        report = []
+        for position, (player_id, name, province) in enumerate(self.players):
+            if qualified[position]:
+                report.append({
+                    'id': player_id,
+                    'name': name,
+                    'province': province,
+                    'qualified': self.model['qualified'][position],
+                    'probability': qualified[position] / seasons,
+                    'expected_wins': wins[position] / seasons
+                })
+        report.sort(key=lambda row: (-row['probability'], row['name']))
+        return report
+
+
+def simulate(model: Dict, seasons: int, seed: Optional[int] = None):
+    """(qualified counts, win counts) per player over ``seasons`` runs of ``model``.
+
+    Module level so process pool workers can run it.
+    """
+    if NUMPY_AVAILABLE:
+        return _simulate_numpy(model, seasons, seed)
+    return _simulate_python(model, seasons, seed)
+
+
+def _simulate_numpy(model: Dict, seasons: int, seed: Optional[int]):
+    rng = np.random.default_rng(seed)
+    weights = np.asarray(model['weights'], dtype=float)
+    already = np.asarray(model['qualified'], dtype=bool)
+    players = len(weights)
+    qualified_counts = np.zeros(players, dtype=np.int64)
+    win_counts = np.zeros(players, dtype=np.int64)
+    
+    events = []
+    for invited, rostered in model['events']:
+        # Only invitees and the roster can win, so sampling is over them alone
+        candidates = np.asarray(invited + rostered, dtype=np.int64)
+        on_roster = np.arange(len(candidates)) >= len(invited)
+        events.append((candidates, on_roster))
+    
+    chunk = max(1, CHUNK_CELLS // max(players, 1))
+    for start in range(0, seasons, chunk):
+        rows = min(chunk, seasons - start)
+        qualified = np.tile(already, (rows, 1))
+        for candidates, on_roster in events:
+            if not len(candidates):
+                continue
+            attend = rng.random((rows, len(candidates))) < model['attendance']
+            if model['skip_qualified']:
+                attend &= ~qualified[:, candidates]
+            attend |= on_roster
+            
+            # Weighted draw per season: the first cumulative weight above a
+            # uniform point in [0, total) is the winner
+            cumulative = np.cumsum(attend * weights[candidates], axis=1)
+            total = cumulative[:, -1]
+            point = rng.random(rows) * total
+            picks = np.minimum((cumulative <= point[:, None]).sum(axis=1), len(candidates) - 1)
+            held = np.nonzero(total > 0)[0]
+            winners = candidates[picks[held]]
+            qualified[held, winners] = True
+            np.add.at(win_counts, winners, 1)
+        qualified_counts += qualified.sum(axis=0)
+    return qualified_counts.tolist(), win_counts.tolist()
+
+
+def _simulate_python(model: Dict, seasons: int, seed: Optional[int]):
+    """Same model one season at a time, for installs without NumPy (much slower)."""
+    rng = random.Random(seed)
+    weights = model['weights']
+    qualified_counts = [0] * len(weights)
+    win_counts = [0] * len(weights)
+    for _ in range(seasons):
+        qualified = set(position for position, flag in enumerate(model['qualified']) if flag)
+        for invited, rostered in model['events']:
+            attendees = [position for position in invited
+                         if not (model['skip_qualified'] and position in qualified)
+                         and rng.random() < model['attendance']]
+            attendees.extend(rostered)
+            chances = [weights[position] for position in attendees]
+            if not attendees or not sum(chances):
+                continue
+            winner = rng.choices(attendees, chances)[0]
+            qualified.add(winner)
+            win_counts[winner] += 1
+        for position in qualified:
+            qualified_counts[position] += 1
+    return qualified_counts, win_counts
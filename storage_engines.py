@@ -0,0 +1,45 @@
+"""
+Storage Engines for AADS Series
+Where an AADSDatabase keeps its tables: the database file, or a private
+in-memory copy that tests and simulations can fork cheaply
+"""
+
+import sqlite3
+from typing import Optional
+
+
+class SQLiteFileEngine:
+    in_memory = False
+    
+    def __init__(self, path: str = "aads_series.db"):
+        """The database file on disk, shared with other processes."""
+        self.path = path
+    
+    def connect(self, timeout: float) -> sqlite3.Connection:
+        # The group committer commits on this connection from its own thread
+        return sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+
+
+class MemoryEngine:
+    in_memory = True
+    path = ':memory:'
+    
+    def __init__(self, source: Optional[sqlite3.Connection] = None):
+        """A private in-memory database, copied from ``source`` if given.
+
+        The copy goes through SQLite's backup API page by page, so forking
+        a loaded series costs a memory copy rather than re-running inserts,
+        and nothing a fork writes touches the disk or the source.
+        """
+        self.source = source
+    
+    def connect(self, timeout: float) -> sqlite3.Connection:
+        conn = sqlite3.connect(':memory:', timeout=timeout, check_same_thread=False)
+        if self.source is not None:
+            self.source.backup(conn)
+        return conn
+
+
+def engine_for(db_path: str):
+    """The engine AADSDatabase uses for a plain ``db_path``."""
+    return MemoryEngine() if db_path == ':memory:' else SQLiteFileEngine(db_path)
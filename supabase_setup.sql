@@ -10,7 +10,8 @@ CREATE TABLE IF NOT EXISTS players (
     status TEXT NOT NULL DEFAULT 'Prospect' CHECK (status IN ('Prospect', 'Previous Participant', 'Winner', 'TOC Qualified')),
     total_events INTEGER NOT NULL DEFAULT 0,
     toc_qualified BOOLEAN NOT NULL DEFAULT false,
-    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
 -- Create events table
@@ -20,9 +21,14 @@ CREATE TABLE IF NOT EXISTS events (
     event_type TEXT NOT NULL CHECK (event_type IN ('Invitational', 'TOC')),
     status TEXT NOT NULL DEFAULT 'Pending' CHECK (status IN ('Pending', 'Active', 'Completed')),
     winner_id BIGINT REFERENCES players(id),
-    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Upgrading an existing project: track changes for incremental pulls
+ALTER TABLE players ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+ALTER TABLE events ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
 -- Create event_participants table
 CREATE TABLE IF NOT EXISTS event_participants (
     id BIGINT PRIMARY KEY,
@@ -30,21 +36,116 @@ CREATE TABLE IF NOT EXISTS event_participants (
     player_id BIGINT NOT NULL REFERENCES players(id) ON DELETE CASCADE,
     is_debut BOOLEAN NOT NULL DEFAULT false,
     is_veteran BOOLEAN NOT NULL DEFAULT false,
+    placement INTEGER CHECK (placement IS NULL OR placement >= 1),
     added_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     UNIQUE(event_id, player_id)
 );
 
+-- Upgrading an existing project: placements and flags change roster rows
+ALTER TABLE event_participants ADD COLUMN IF NOT EXISTS placement INTEGER;
+ALTER TABLE event_participants ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_players_province ON players(province);
 CREATE INDEX IF NOT EXISTS idx_players_status ON players(status);
 CREATE INDEX IF NOT EXISTS idx_events_status ON events(status);
 CREATE INDEX IF NOT EXISTS idx_event_participants_event ON event_participants(event_id);
 CREATE INDEX IF NOT EXISTS idx_event_participants_player ON event_participants(player_id);
+CREATE INDEX IF NOT EXISTS idx_players_updated_at ON players(updated_at);
+CREATE INDEX IF NOT EXISTS idx_events_updated_at ON events(updated_at);
+CREATE INDEX IF NOT EXISTS idx_event_participants_updated_at ON event_participants(updated_at);
+
+-- Stamp rows with the server time when their content changes, so incremental
+-- pulls see the change. Pushes carry the client's updated_at: an update older
+-- than the cloud row is skipped instead of overwriting newer edits, and an
+-- unchanged row (e.g. re-sent by a full push) keeps its stamp.
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        -- Local timestamps have whole-second precision
+        IF date_trunc('second', NEW.updated_at) < date_trunc('second', OLD.updated_at) THEN
+            RETURN NULL;
+        END IF;
+        NEW.updated_at = OLD.updated_at;
+        IF NEW IS NOT DISTINCT FROM OLD THEN
+            RETURN NEW;
+        END IF;
+    END IF;
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS players_set_updated_at ON players;
+CREATE TRIGGER players_set_updated_at BEFORE INSERT OR UPDATE ON players
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+DROP TRIGGER IF EXISTS events_set_updated_at ON events;
+CREATE TRIGGER events_set_updated_at BEFORE INSERT OR UPDATE ON events
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+DROP TRIGGER IF EXISTS event_participants_set_updated_at ON event_participants;
+CREATE TRIGGER event_participants_set_updated_at BEFORE INSERT OR UPDATE ON event_participants
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- Deletions, so syncs can propagate them (old entries are compacted)
+CREATE TABLE IF NOT EXISTS tombstones (
+    table_name TEXT NOT NULL,
+    row_id BIGINT NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (table_name, row_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_at ON tombstones(deleted_at);
+
+CREATE OR REPLACE FUNCTION set_deleted_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.deleted_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tombstones_set_deleted_at ON tombstones;
+CREATE TRIGGER tombstones_set_deleted_at BEFORE INSERT OR UPDATE ON tombstones
+    FOR EACH ROW EXECUTE FUNCTION set_deleted_at();
+
+-- Range digests for the local/cloud consistency check
+CREATE OR REPLACE FUNCTION aads_row_text_sql(cols TEXT[]) RETURNS TEXT AS $$
+    SELECT string_agg(format('COALESCE(%I::text, '''')', c), ' || ''|'' || ' ORDER BY ord)
+    FROM unnest(cols) WITH ORDINALITY AS u(c, ord);
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION aads_range_digests(tbl TEXT, cols TEXT[], los BIGINT[], his BIGINT[])
+RETURNS TABLE(lo BIGINT, row_count BIGINT, digest TEXT) AS $$
+BEGIN
+    RETURN QUERY EXECUTE format(
+        'SELECT b.lo, COUNT(t.id),
+                md5(COALESCE(string_agg(md5(%s), '''' ORDER BY t.id) FILTER (WHERE t.id IS NOT NULL), ''''))
+         FROM unnest($1, $2) AS b(lo, hi)
+         LEFT JOIN %I t ON t.id >= b.lo AND t.id < b.hi
+         GROUP BY b.lo
+         ORDER BY b.lo',
+        aads_row_text_sql(cols), tbl)
+    USING los, his;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+CREATE OR REPLACE FUNCTION aads_row_hashes(tbl TEXT, cols TEXT[], los BIGINT[], his BIGINT[])
+RETURNS TABLE(row_id BIGINT, hash TEXT) AS $$
+BEGIN
+    RETURN QUERY EXECUTE format(
+        'SELECT t.id::bigint, md5(%s)
+         FROM unnest($1, $2) AS b(lo, hi)
+         JOIN %I t ON t.id >= b.lo AND t.id < b.hi
+         ORDER BY t.id',
+        aads_row_text_sql(cols), tbl)
+    USING los, his;
+END;
+$$ LANGUAGE plpgsql STABLE;
 
 -- Enable Row Level Security (RLS)
 ALTER TABLE players ENABLE ROW LEVEL SECURITY;
 ALTER TABLE events ENABLE ROW LEVEL SECURITY;
 ALTER TABLE event_participants ENABLE ROW LEVEL SECURITY;
+ALTER TABLE tombstones ENABLE ROW LEVEL SECURITY;
 
 -- Create policies for public read/write access
 -- WARNING: These policies allow anyone to read/write. 
@@ -86,5 +187,17 @@ CREATE POLICY "Enable update access for all users" ON event_participants
 CREATE POLICY "Enable delete access for all users" ON event_participants
     FOR DELETE USING (true);
 
+CREATE POLICY "Enable read access for all users" ON tombstones
+    FOR SELECT USING (true);
+
+CREATE POLICY "Enable insert access for all users" ON tombstones
+    FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "Enable update access for all users" ON tombstones
+    FOR UPDATE USING (true);
+
+CREATE POLICY "Enable delete access for all users" ON tombstones
+    FOR DELETE USING (true);
+
 -- Success message
 SELECT 'Database setup complete! ✅' AS message;
@@ -5,9 +5,15 @@ Handles cloud backup and synchronization with Supabase
 
 import os
 import json
-from typing import Dict, List, Optional
+import time
+from itertools import islice
+from typing import Dict, List, Optional, Iterable, Iterator
 from datetime import datetime
 
+import metrics
+from aads_records import Player, Event, Participant, Tombstone
+from merkle_check import MERKLE_SQL
+
 try:
     from supabase import create_client, Client
     SUPABASE_AVAILABLE = True
@@ -16,12 +22,86 @@ except ImportError:
     print("Warning: supabase-py not installed. Cloud sync disabled.")
     print("Install with: pip install supabase")
 
+# Rows sent per upsert request when pushing to Supabase
+PUSH_BATCH_SIZE = 500
+
+# Rows requested per page when pulling from Supabase
+PULL_PAGE_SIZE = 1000
+
+# Change-tracking column per table, used as the incremental pull watermark
+WATERMARK_COLUMNS = {
+    'players': 'updated_at',
+    'events': 'updated_at',
+    'event_participants': 'updated_at',
+    'tombstones': 'deleted_at'
+}
+
+# Columns that make the pull order total after the watermark column
+TIEBREAK_COLUMNS = {
+    'tombstones': ('table_name', 'row_id')
+}
+
+# Tables whose deletions are propagated, children first so cloud foreign
+# keys are never left dangling
+DELETE_ORDER = ('event_participants', 'events', 'players')
+
+# sync_state key holding the latest deleted_at among tombstones known to be
+# in the cloud; every local tombstone older than it has been pushed
+PUSHED_DELETIONS_KEY = 'last_pushed_deletion_at'
+
+ROWS_PUSHED = metrics.REGISTRY.counter(
+    'aads_sync_rows_pushed_total', 'Rows upserted to Supabase', ('table',))
+ROWS_REJECTED = metrics.REGISTRY.counter(
+    'aads_sync_rows_rejected_total', 'Pushed rows the server skipped for its newer copy', ('table',))
+ROWS_PULLED = metrics.REGISTRY.counter(
+    'aads_sync_rows_pulled_total', 'Rows fetched from Supabase', ('table',))
+SYNC_RUNS = metrics.REGISTRY.counter(
+    'aads_sync_runs_total', 'Pushes and pulls by kind and result', ('kind', 'result'))
+SYNC_LAST_SUCCESS = metrics.REGISTRY.gauge(
+    'aads_sync_last_success_timestamp_seconds', 'Unix time of the last successful sync', ('kind',))
+
+
+def _last_sync_age() -> Dict[tuple, float]:
+    """Age of the newest successful sync; no sample before the first one."""
+    latest = max(SYNC_LAST_SUCCESS.values().values(), default=None)
+    return {} if latest is None else {(): time.time() - latest}
+
+
+metrics.REGISTRY.gauge('aads_sync_last_success_age_seconds', 'Seconds since the last successful push or pull',
+                       callback=_last_sync_age)
+
+
+def record_sync_outcome(kind: str, success: bool, at: Optional[float] = None):
+    """Publish a push or pull result to the metrics registry."""
+    SYNC_RUNS.inc(kind=kind, result='success' if success else 'failure')
+    if success:
+        at = at if at is not None else time.time()
+        if at > (SYNC_LAST_SUCCESS.value(kind=kind) or 0):
+            SYNC_LAST_SUCCESS.set(at, kind=kind)
+
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of up to ``size`` items from ``items``."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
 
 class SupabaseSync:
-    def __init__(self, url: Optional[str] = None, key: Optional[str] = None):
-        """Initialize Supabase connection."""
-        self.client: Optional[Client] = None
-        self.enabled = False
+    def __init__(self, url: Optional[str] = None, key: Optional[str] = None, client=None):
+        """Initialize Supabase connection.
+        
+        ``client`` may be any object with the supabase-py table API; it is
+        used as-is instead of connecting, e.g. for offline benchmarks.
+        """
+        self.client: Optional[Client] = client
+        self.enabled = client is not None
+        
+        if client is not None:
+            return
         
         if not SUPABASE_AVAILABLE:
             print("Supabase sync is disabled - supabase-py package not installed.")
@@ -73,9 +153,13 @@ CREATE TABLE IF NOT EXISTS events (
     event_type TEXT NOT NULL CHECK(event_type IN ('Invitational', 'TOC')),
     event_date TEXT,
     winner_id BIGINT REFERENCES players(id),
-    status TEXT DEFAULT 'Pending' CHECK(status IN ('Pending', 'Active', 'Completed'))
+    status TEXT DEFAULT 'Pending' CHECK(status IN ('Pending', 'Active', 'Completed')),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Upgrading an existing project: events did not track changes before
+ALTER TABLE events ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
 -- Event Participants table
 CREATE TABLE IF NOT EXISTS event_participants (
     id BIGSERIAL PRIMARY KEY,
@@ -83,27 +167,87 @@ CREATE TABLE IF NOT EXISTS event_participants (
     player_id BIGINT NOT NULL REFERENCES players(id),
     is_debut BOOLEAN DEFAULT false,
     is_veteran BOOLEAN DEFAULT false,
-    placement INTEGER,
+    placement INTEGER CHECK (placement IS NULL OR placement >= 1),
     added_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     UNIQUE(event_id, player_id)
 );
 
+-- Upgrading an existing project: placements and flags change roster rows
+ALTER TABLE event_participants ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_players_province ON players(province);
 CREATE INDEX IF NOT EXISTS idx_players_status ON players(status);
 CREATE INDEX IF NOT EXISTS idx_event_participants_event ON event_participants(event_id);
 CREATE INDEX IF NOT EXISTS idx_event_participants_player ON event_participants(player_id);
+CREATE INDEX IF NOT EXISTS idx_players_updated_at ON players(updated_at);
+CREATE INDEX IF NOT EXISTS idx_events_updated_at ON events(updated_at);
+CREATE INDEX IF NOT EXISTS idx_event_participants_updated_at ON event_participants(updated_at);
+
+-- Stamp rows with the server time when their content changes, so incremental
+-- pulls see the change. Pushes carry the client's updated_at: an update older
+-- than the cloud row is skipped instead of overwriting newer edits, and an
+-- unchanged row (e.g. re-sent by a full push) keeps its stamp.
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        -- Local timestamps have whole-second precision
+        IF date_trunc('second', NEW.updated_at) < date_trunc('second', OLD.updated_at) THEN
+            RETURN NULL;
+        END IF;
+        NEW.updated_at = OLD.updated_at;
+        IF NEW IS NOT DISTINCT FROM OLD THEN
+            RETURN NEW;
+        END IF;
+    END IF;
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS players_set_updated_at ON players;
+CREATE TRIGGER players_set_updated_at BEFORE INSERT OR UPDATE ON players
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+DROP TRIGGER IF EXISTS events_set_updated_at ON events;
+CREATE TRIGGER events_set_updated_at BEFORE INSERT OR UPDATE ON events
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+DROP TRIGGER IF EXISTS event_participants_set_updated_at ON event_participants;
+CREATE TRIGGER event_participants_set_updated_at BEFORE INSERT OR UPDATE ON event_participants
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- Deletions, so syncs can propagate them (old entries are compacted)
+CREATE TABLE IF NOT EXISTS tombstones (
+    table_name TEXT NOT NULL,
+    row_id BIGINT NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (table_name, row_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_at ON tombstones(deleted_at);
+
+CREATE OR REPLACE FUNCTION set_deleted_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.deleted_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tombstones_set_deleted_at ON tombstones;
+CREATE TRIGGER tombstones_set_deleted_at BEFORE INSERT OR UPDATE ON tombstones
+    FOR EACH ROW EXECUTE FUNCTION set_deleted_at();
 
 -- Enable Row Level Security (RLS)
 ALTER TABLE players ENABLE ROW LEVEL SECURITY;
 ALTER TABLE events ENABLE ROW LEVEL SECURITY;
 ALTER TABLE event_participants ENABLE ROW LEVEL SECURITY;
+ALTER TABLE tombstones ENABLE ROW LEVEL SECURITY;
 
 -- Create policies (adjust based on your security needs)
 -- For development/testing - allow all operations
 CREATE POLICY "Allow all operations on players" ON players FOR ALL USING (true);
 CREATE POLICY "Allow all operations on events" ON events FOR ALL USING (true);
 CREATE POLICY "Allow all operations on event_participants" ON event_participants FOR ALL USING (true);
+CREATE POLICY "Allow all operations on tombstones" ON tombstones FOR ALL USING (true);
 
 -- Last sync tracking table
 CREATE TABLE IF NOT EXISTS sync_metadata (
@@ -116,95 +260,109 @@ CREATE TABLE IF NOT EXISTS sync_metadata (
 INSERT INTO sync_metadata (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
 """
         
-        print(sql)
+        print(sql + MERKLE_SQL)
         print("\n" + "="*70)
         print("After running this SQL, press Enter to continue...")
         input()
         return True
     
-    def sync_players_to_cloud(self, players: List[Dict]) -> bool:
-        """Push players data to Supabase."""
-        if not self.enabled:
-            return False
+    def push_records(self, record_type, rows: Iterable, rejected: Optional[List[int]] = None) -> int:
+        """Upsert rows to the record type's table in batches and return the count.
         
-        try:
-            print(f"Syncing {len(players)} players to Supabase...")
-            
-            for player in players:
-                # Convert SQLite format to Supabase format
-                player_data = {
-                    'id': player['id'],
-                    'name': player['name'],
-                    'province': player['province'],
-                    'status': player['status'],
-                    'total_events': player['total_events'],
-                    'toc_qualified': bool(player['toc_qualified'])
-                }
-                
-                # Upsert (insert or update)
-                self.client.table('players').upsert(player_data).execute()
-            
-            print(f"✓ Synced {len(players)} players")
-            return True
-            
-        except Exception as e:
-            print(f"Error syncing players: {e}")
-            return False
+        Payload dicts are built one batch at a time. The server skips rows
+        whose cloud copy is newer (see set_updated_at); their ids are added
+        to ``rejected``. Errors propagate to the caller; see
+        ``_push_records`` for the reporting wrapper.
+        """
+        if record_type is Tombstone:
+            return self.push_tombstones(rows)
+        
+        total = 0
+        payloads = (record_type.coerce(row).to_push() for row in rows)
+        for batch in _batched(payloads, PUSH_BATCH_SIZE):
+            # Upsert (insert or update); the response holds the rows written
+            response = self.client.table(record_type.TABLE).upsert(batch).execute()
+            written = {row['id'] for row in response.data or ()}
+            skipped = [payload['id'] for payload in batch if payload['id'] not in written]
+            if skipped:
+                ROWS_REJECTED.inc(len(skipped), table=record_type.TABLE)
+                if rejected is not None:
+                    rejected.extend(skipped)
+            ROWS_PUSHED.inc(len(batch), table=record_type.TABLE)
+            total += len(batch)
+        return total
     
-    def sync_events_to_cloud(self, events: List[Dict]) -> bool:
-        """Push events data to Supabase."""
+    def push_tombstones(self, tombstones: Iterable) -> int:
+        """Record deletions in the cloud and delete the rows they name.
+        
+        Tombstones are upserted first, so other clients learn about the
+        deletion even if removing the row fails and is retried later.
+        """
+        by_table: Dict[str, List[int]] = {}
+        payloads = []
+        for tombstone in tombstones:
+            tombstone = Tombstone.coerce(tombstone)
+            payloads.append(tombstone.to_cloud())
+            by_table.setdefault(tombstone.table_name, []).append(tombstone.row_id)
+        
+        for batch in _batched(payloads, PUSH_BATCH_SIZE):
+            # Existing tombstones keep their original deleted_at
+            self.client.table(Tombstone.TABLE).upsert(batch, ignore_duplicates=True).execute()
+            ROWS_PUSHED.inc(len(batch), table=Tombstone.TABLE)
+        for table in DELETE_ORDER:
+            for batch in _batched(by_table.get(table, ()), PUSH_BATCH_SIZE):
+                self.client.table(table).delete().in_('id', batch).execute()
+        return len(payloads)
+    
+    def compact_tombstones(self, before: str) -> bool:
+        """Delete cloud tombstones older than ``before`` (ISO timestamp)."""
         if not self.enabled:
             return False
-        
         try:
-            print(f"Syncing {len(events)} events to Supabase...")
-            
-            for event in events:
-                event_data = {
-                    'id': event['id'],
-                    'name': event['name'],
-                    'event_type': event['event_type'],
-                    'event_date': event.get('event_date'),
-                    'winner_id': event.get('winner_id'),
-                    'status': event['status']
-                }
-                
-                self.client.table('events').upsert(event_data).execute()
-            
-            print(f"✓ Synced {len(events)} events")
+            self.client.table(Tombstone.TABLE).delete().lt('deleted_at', before).execute()
             return True
-            
         except Exception as e:
-            print(f"Error syncing events: {e}")
+            print(f"Error compacting cloud tombstones: {e}")
             return False
     
-    def sync_participants_to_cloud(self, participants: List[Dict]) -> bool:
-        """Push event participants data to Supabase."""
+    def _push_records(self, record_type, rows: Iterable, label: str) -> bool:
+        """Push rows with progress messages, reporting failure instead of raising."""
         if not self.enabled:
             return False
         
         try:
-            print(f"Syncing {len(participants)} event participants to Supabase...")
-            
-            for participant in participants:
-                participant_data = {
-                    'id': participant['id'],
-                    'event_id': participant['event_id'],
-                    'player_id': participant['player_id'],
-                    'is_debut': bool(participant['is_debut']),
-                    'is_veteran': bool(participant['is_veteran']),
-                    'placement': participant.get('placement')
-                }
-                
-                self.client.table('event_participants').upsert(participant_data).execute()
-            
-            print(f"✓ Synced {len(participants)} participants")
+            print(f"Syncing {label} to Supabase...")
+            rejected: List[int] = []
+            total = self.push_records(record_type, rows, rejected)
+            print(f"✓ Synced {total - len(rejected)} {label}")
+            if rejected:
+                # Usually another desk's newer edit, but also what a clock
+                # running behind the server's looks like
+                shown = ', '.join(map(str, rejected[:10])) + (' ...' if len(rejected) > 10 else '')
+                print(f"⚠ {len(rejected)} {label} not written; the cloud copy is newer (ids {shown}). "
+                      f"If this computer's clock is behind, correct it and push again.")
             return True
             
         except Exception as e:
-            print(f"Error syncing participants: {e}")
+            print(f"Error syncing {label}: {e}")
             return False
     
+    def sync_players_to_cloud(self, players: Iterable) -> bool:
+        """Push players data to Supabase."""
+        return self._push_records(Player, players, "players")
+    
+    def sync_events_to_cloud(self, events: Iterable) -> bool:
+        """Push events data to Supabase."""
+        return self._push_records(Event, events, "events")
+    
+    def sync_participants_to_cloud(self, participants: Iterable) -> bool:
+        """Push event participants data to Supabase."""
+        return self._push_records(Participant, participants, "participants")
+    
+    def sync_tombstones_to_cloud(self, tombstones: Iterable) -> bool:
+        """Push local deletions to Supabase."""
+        return self._push_records(Tombstone, tombstones, "deletions")
+    
     def full_sync_to_cloud(self, db) -> bool:
         """Perform a complete sync of all data to Supabase."""
         if not self.enabled:
@@ -216,21 +374,13 @@ INSERT INTO sync_metadata (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
         print("="*70 + "\n")
         
         try:
-            # Get all data from local database
-            db.cursor.execute("SELECT * FROM players")
-            players = [dict(row) for row in db.cursor.fetchall()]
-            
-            db.cursor.execute("SELECT * FROM events")
-            events = [dict(row) for row in db.cursor.fetchall()]
-            
-            db.cursor.execute("SELECT * FROM event_participants")
-            participants = [dict(row) for row in db.cursor.fetchall()]
-            
-            # Sync to cloud
+            # Stream compact records from the local database straight into
+            # batched upserts instead of materializing every table as dicts
             success = True
-            success &= self.sync_players_to_cloud(players)
-            success &= self.sync_events_to_cloud(events)
-            success &= self.sync_participants_to_cloud(participants)
+            success &= self.sync_players_to_cloud(db.iter_records(Player))
+            success &= self.sync_events_to_cloud(db.iter_records(Event))
+            success &= self.sync_participants_to_cloud(db.iter_records(Participant))
+            success &= self.sync_tombstones_to_cloud(db.iter_records(Tombstone))
             
             if success:
                 # Update sync metadata
@@ -249,8 +399,14 @@ INSERT INTO sync_metadata (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
             print(f"\n❌ Sync failed: {e}")
             return False
     
-    def pull_from_cloud(self, db) -> bool:
-        """Pull data from Supabase to local database."""
+    def pull_from_cloud(self, db, staged: bool = False) -> bool:
+        """Pull data from Supabase to local database.
+        
+        With ``staged`` the local tables are replaced as a whole: rows are
+        bulk-loaded into shadow tables, validated and swapped in with a
+        single transaction, so readers never see a half-updated database.
+        Otherwise cloud rows are upserted over the live tables.
+        """
         if not self.enabled:
             print("Supabase sync is not enabled.")
             return False
@@ -260,68 +416,250 @@ INSERT INTO sync_metadata (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
         print("="*70 + "\n")
         
         try:
-            # Fetch all data from Supabase
-            players_response = self.client.table('players').select('*').execute()
-            events_response = self.client.table('events').select('*').execute()
-            participants_response = self.client.table('event_participants').select('*').execute()
-            
-            players = players_response.data
-            events = events_response.data
-            participants = participants_response.data
+            # Fetch all data from Supabase (paged, so large tables are not
+            # truncated at the server's row limit)
+            totals: Dict[str, int] = {}
+            players = self._fetch_changed('players', None, totals)
+            events = self._fetch_changed('events', None, totals)
+            participants = self._fetch_changed('event_participants', None, totals)
             
             print(f"Retrieved {len(players)} players from cloud")
             print(f"Retrieved {len(events)} events from cloud")
             print(f"Retrieved {len(participants)} participants from cloud")
             
-            # Clear local database and insert cloud data
             print("\nUpdating local database...")
             
-            # Players
-            for player in players:
-                db.cursor.execute("""
-                    INSERT OR REPLACE INTO players 
-                    (id, name, province, status, total_events, toc_qualified, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player['id'], player['name'], player['province'], player['status'],
-                    player['total_events'], 1 if player['toc_qualified'] else 0,
-                    player.get('created_at'), player.get('updated_at')
-                ))
+            if staged:
+                # Bulk-load shadow tables and swap them in atomically; the
+                # swap is refused unless each table matches the cloud's count
+                counts = db.replace_tables_staged(
+                    map(Player.from_cloud, players),
+                    map(Event.from_cloud, events),
+                    map(Participant.from_cloud, participants),
+                    expected=totals
+                )
+                print(f"Swapped in {counts['players']} players, {counts['events']} events "
+                      f"and {counts['event_participants']} participants")
+            
+            # Lock up front and commit like any other write, so a busy
+            # database is waited for instead of failing halfway
+            with db.write_transaction():
+                if not staged:
+                    for record_type, rows in ((Player, players), (Event, events), (Participant, participants)):
+                        db.cursor.executemany(f"""
+                            INSERT OR REPLACE INTO {record_type.TABLE} 
+                            ({', '.join(record_type._fields)})
+                            VALUES ({', '.join('?' * len(record_type._fields))})
+                        """, map(record_type.from_cloud, rows))
+                
+                # Later incremental pulls continue from this snapshot
+                pulled = (('players', players), ('events', events), ('event_participants', participants))
+                for table, rows in pulled:
+                    if rows:
+                        column = WATERMARK_COLUMNS[table]
+                        db.set_sync_state(f'pull_watermark.{table}', max(row[column] for row in rows),
+                                          commit=False)
+            
+            print("\n" + "="*70)
+            print("✓ DATA PULLED FROM CLOUD SUCCESSFULLY")
+            print("="*70)
+            return True
+            
+        except Exception as e:
+            print(f"\n❌ Pull failed: {e}")
+            return False
+    
+    def _fetch_changed(self, table: str, since: Optional[str],
+                       totals: Optional[Dict[str, int]] = None) -> List[Dict]:
+        """Fetch rows of ``table`` changed after ``since``, one page at a time.
+        
+        The first page also asks for the exact number of matching rows,
+        which is stored in ``totals`` under the table name when given.
+        """
+        column = WATERMARK_COLUMNS[table]
+        rows = []
+        total = None
+        while True:
+            counting = not rows
+            query = self.client.table(table).select('*', count='exact') if counting else \
+                self.client.table(table).select('*')
+            if since:
+                query = query.gt(column, since)
+            query = query.order(column)
+            for tiebreak in TIEBREAK_COLUMNS.get(table, ('id',)):
+                query = query.order(tiebreak)
+            response = query.range(len(rows), len(rows) + PULL_PAGE_SIZE - 1).execute()
+            page = response.data
+            if counting and response.count is not None:
+                total = response.count
+                if totals is not None:
+                    totals[table] = total
+            ROWS_PULLED.inc(len(page), table=table)
+            rows.extend(page)
+            # The server may cap pages below PULL_PAGE_SIZE, so while the
+            # count is known a short page does not mean the end
+            done = len(rows) >= total if total is not None else len(page) < PULL_PAGE_SIZE
+            if not page or done:
+                return rows
+    
+    def incremental_pull(self, db) -> bool:
+        """Pull rows changed in Supabase since the last pull and merge them locally.
+        
+        Conflict rule: players, events and participant rows are
+        last-writer-wins on ``updated_at`` (ties go to the cloud), so newer
+        local edits are kept and pushed later. Desks assign ids locally, so
+        a cloud row whose id or name belongs to a different local player
+        (or whose id or event/player pair belongs to a different local
+        roster row) is not applied: it is reported, the pull counts as
+        failed and the watermark stays before it so the next pull fetches
+        it again. Deletions win over edits: cloud tombstones remove local
+        rows, and rows deleted on either side are never re-inserted. Merged
+        rows and the advanced watermarks are committed in one transaction.
+        """
+        if not self.enabled:
+            print("Supabase sync is not enabled.")
+            return False
+        
+        print("\n" + "="*70)
+        print("PULLING CHANGES FROM SUPABASE")
+        print("="*70 + "\n")
+        
+        try:
+            watermarks = {table: db.get_sync_state(f'pull_watermark.{table}') for table in WATERMARK_COLUMNS}
+            changes = {table: self._fetch_changed(table, watermarks[table]) for table in WATERMARK_COLUMNS}
             
-            # Events
-            for event in events:
-                db.cursor.execute("""
-                    INSERT OR REPLACE INTO events 
-                    (id, name, event_type, event_date, winner_id, status)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    event['id'], event['name'], event['event_type'],
-                    event.get('event_date'), event.get('winner_id'), event['status']
-                ))
+            for table, rows in changes.items():
+                print(f"Retrieved {len(rows)} changed {table.replace('_', ' ')} from cloud")
             
-            # Participants
-            for participant in participants:
-                db.cursor.execute("""
-                    INSERT OR REPLACE INTO event_participants 
-                    (id, event_id, player_id, is_debut, is_veteran, placement, added_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    participant['id'], participant['event_id'], participant['player_id'],
-                    1 if participant['is_debut'] else 0,
-                    1 if participant['is_veteran'] else 0,
-                    participant.get('placement'), participant.get('added_at')
-                ))
+            received = sum(len(rows) for rows in changes.values())
+            applied = 0
+            fetched = dict(changes)
+            conflicts: Dict[str, List[Dict]] = {}
+            messages: List[str] = []
             
-            db.conn.commit()
+            # Merged rows and watermarks commit together, through the same
+            # locked write path as every other change
+            with db.write_transaction():
+                tombstones = [Tombstone.from_cloud(row) for row in changes['tombstones']]
+                deleted = db.tombstoned_ids()
+                for tombstone in tombstones:
+                    deleted.setdefault(tombstone.table_name, set()).add(tombstone.row_id)
+                for table in ('players', 'events', 'event_participants'):
+                    gone = deleted.get(table, set())
+                    changes[table] = [row for row in changes[table] if row['id'] not in gone]
+                
+                # Cloud player ids that name a different player here
+                foreign_players = set()
+                for player in changes['players']:
+                    record = Player.from_cloud(player)
+                    local_name = db.cursor.execute("SELECT name FROM players WHERE id = ?",
+                                                   (record.id,)).fetchone()
+                    local_id = db.cursor.execute("SELECT id FROM players WHERE name = ?",
+                                                 (record.name,)).fetchone()
+                    if local_name is not None and local_name[0] != record.name:
+                        messages.append(f"player {record.id} is {record.name!r} in the cloud "
+                                        f"but {local_name[0]!r} here")
+                    elif local_id is not None and local_id[0] != record.id:
+                        messages.append(f"player {record.name!r} is id {record.id} in the cloud "
+                                        f"but id {local_id[0]} here")
+                    else:
+                        db.cursor.execute("""
+                            INSERT INTO players 
+                            (id, name, province, status, total_events, toc_qualified, created_at, updated_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT(id) DO UPDATE SET
+                                name = excluded.name,
+                                province = excluded.province,
+                                status = excluded.status,
+                                total_events = excluded.total_events,
+                                toc_qualified = excluded.toc_qualified,
+                                updated_at = excluded.updated_at
+                            WHERE excluded.updated_at >= COALESCE(players.updated_at, '')
+                        """, record)
+                        applied += db.cursor.rowcount
+                        continue
+                    foreign_players.add(record.id)
+                    conflicts.setdefault('players', []).append(player)
+                
+                for event in changes['events']:
+                    db.cursor.execute("""
+                        INSERT INTO events 
+                        (id, name, event_type, event_date, winner_id, status, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(id) DO UPDATE SET
+                            name = excluded.name,
+                            event_type = excluded.event_type,
+                            event_date = excluded.event_date,
+                            winner_id = excluded.winner_id,
+                            status = excluded.status,
+                            updated_at = excluded.updated_at
+                        WHERE excluded.updated_at >= COALESCE(events.updated_at, '')
+                    """, Event.from_cloud(event))
+                    applied += db.cursor.rowcount
+                
+                for participant in changes['event_participants']:
+                    record = Participant.from_cloud(participant)
+                    local_pair = db.cursor.execute("""
+                        SELECT event_id, player_id FROM event_participants WHERE id = ?
+                    """, (record.id,)).fetchone()
+                    local_id = db.cursor.execute("""
+                        SELECT id FROM event_participants WHERE event_id = ? AND player_id = ?
+                    """, (record.event_id, record.player_id)).fetchone()
+                    if record.player_id in foreign_players:
+                        messages.append(f"roster row {record.id} belongs to cloud player {record.player_id}, "
+                                        f"a different player here")
+                    elif local_pair is not None and tuple(local_pair) != (record.event_id, record.player_id):
+                        messages.append(f"roster row {record.id} is player {record.player_id} in Event "
+                                        f"{record.event_id} in the cloud but player {local_pair[1]} in Event "
+                                        f"{local_pair[0]} here")
+                    elif local_id is not None and local_id[0] != record.id:
+                        messages.append(f"player {record.player_id} in Event {record.event_id} is roster row "
+                                        f"{record.id} in the cloud but {local_id[0]} here")
+                    else:
+                        db.cursor.execute("""
+                            INSERT INTO event_participants 
+                            (id, event_id, player_id, is_debut, is_veteran, placement, added_at, updated_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT(id) DO UPDATE SET
+                                is_debut = excluded.is_debut,
+                                is_veteran = excluded.is_veteran,
+                                placement = excluded.placement,
+                                updated_at = excluded.updated_at
+                            WHERE excluded.updated_at >= COALESCE(event_participants.updated_at, '')
+                        """, record)
+                        applied += db.cursor.rowcount
+                        continue
+                    conflicts.setdefault('event_participants', []).append(participant)
+                
+                applied += db.apply_tombstones(tombstones, commit=False)
+                
+                # Advance each watermark to the newest change seen, in the same
+                # transaction as the merged rows, but not past a conflicting row
+                for table, rows in fetched.items():
+                    column = WATERMARK_COLUMNS[table]
+                    held = [row[column] for row in conflicts.get(table, ())]
+                    stamps = [row[column] for row in rows if not held or row[column] < min(held)]
+                    if stamps:
+                        db.set_sync_state(f'pull_watermark.{table}', max(stamps), commit=False)
             
+            skipped = sum(len(rows) for rows in conflicts.values())
+            print(f"\nApplied {applied} of {received} change(s); kept the local row for the rest")
+            if skipped:
+                print(f"\n⚠ {skipped} change(s) conflict with different local rows and were not applied:")
+                for message in messages:
+                    print(f"  - {message}")
+                print("The next pull fetches them again.")
+                print("\n" + "="*70)
+                print("❌ INCREMENTAL PULL INCOMPLETE")
+                print("="*70)
+                return False
             print("\n" + "="*70)
-            print("✓ DATA PULLED FROM CLOUD SUCCESSFULLY")
+            print("✓ INCREMENTAL PULL COMPLETED SUCCESSFULLY")
             print("="*70)
             return True
             
         except Exception as e:
             print(f"\n❌ Pull failed: {e}")
-            db.conn.rollback()
             return False
     
     def get_last_sync_time(self) -> Optional[str]:
@@ -343,9 +681,11 @@ INSERT INTO sync_metadata (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
             return False
         
         try:
-            # Try to query the players table
-            response = self.client.table('players').select('count', count='exact').execute()
-            print(f"✓ Connection successful! Found {response.count} players in cloud.")
+            # A one-row primary key lookup: cheap no matter how big the table is
+            started = time.perf_counter()
+            self.client.table('players').select('id').limit(1).execute()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"✓ Connection successful! Round trip took {elapsed_ms:.0f} ms.")
             return True
         except Exception as e:
             print(f"❌ Connection test failed: {e}")
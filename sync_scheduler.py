@@ -0,0 +1,288 @@
+"""
+Auto-Sync Scheduler for AADS Series
+Pushes local changes to Supabase in the background when AUTO_SYNC is enabled
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from aads_records import Player, Event, Participant, Tombstone
+from supabase_sync import PUSHED_DELETIONS_KEY, record_sync_outcome
+
+# Push order respects foreign keys: players and events before participants,
+# deletions last
+RECORD_TYPES = (Player, Event, Participant, Tombstone)
+
+# sync_state key holding changed ids a stopped scheduler could not push, as
+# JSON {table: [ids]}; the next scheduler on the database pushes them first
+PENDING_KEY = 'auto_sync_pending'
+
+
+class AutoSyncScheduler:
+    def __init__(self, db_path: str, supabase, interval: Optional[float] = None,
+                 debounce: Optional[float] = None, max_pending: Optional[int] = None):
+        """Start a background worker that pushes changed rows to Supabase.
+
+        Changes are debounced: a push happens once writes have been quiet for
+        ``debounce`` seconds, once the oldest unsynced change is ``interval``
+        seconds old, or as soon as ``max_pending`` rows are waiting. Ids
+        still queued when the scheduler stops without pushing them are
+        saved in sync_state and pushed by the next scheduler.
+        """
+        self.db_path = db_path
+        self.supabase = supabase
+        self.interval = interval if interval is not None else float(os.getenv('AUTO_SYNC_INTERVAL', '30'))
+        self.debounce = debounce if debounce is not None else float(os.getenv('AUTO_SYNC_DEBOUNCE', '5'))
+        self.max_pending = max_pending if max_pending is not None else int(os.getenv('AUTO_SYNC_BATCH', '50'))
+        
+        self._pending: Dict[str, Set[int]] = {record_type.TABLE: set() for record_type in RECORD_TYPES}
+        self._first_change: Optional[float] = None
+        self._last_change: Optional[float] = None
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._flush = True
+        # The saved ids this scheduler restored, until a push covers them
+        self._restored: Optional[str] = None
+        
+        self.pushes = 0
+        self.rows_pushed = 0
+        self.rows_rejected = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_sync: Optional[float] = None
+        self.last_latency: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        
+        self._thread = threading.Thread(target=self._run, name="aads-auto-sync", daemon=True)
+        self._thread.start()
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of changed rows waiting to be pushed."""
+        return sum(len(ids) for ids in self._pending.values())
+    
+    def record_change(self, table: str, row_id: int):
+        """Queue a changed row; called by AADSDatabase after each commit."""
+        if table not in self._pending:
+            return
+        
+        with self._condition:
+            now = time.monotonic()
+            self._pending[table].add(row_id)
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+            self._condition.notify()
+    
+    def stats(self) -> Dict:
+        """Snapshot of queue depth, latency and push counters."""
+        with self._condition:
+            return {
+                'running': self._thread.is_alive(),
+                'queue_depth': self.queue_depth,
+                'pushes': self.pushes,
+                'rows_pushed': self.rows_pushed,
+                'rows_rejected': self.rows_rejected,
+                'failures': self.failures,
+                'last_error': self.last_error,
+                'last_sync': self.last_sync,
+                'last_latency': self.last_latency,
+                'last_duration': self.last_duration
+            }
+    
+    def stop(self, flush: bool = True, timeout: Optional[float] = None):
+        """Stop the worker, pushing anything still queued first if ``flush``.
+
+        Without ``flush``, or if the final push fails, the queued ids are
+        saved for the next scheduler instead of being dropped.
+        """
+        with self._condition:
+            self._stopping = True
+            self._flush = flush
+            self._condition.notify()
+        self._thread.join(timeout)
+    
+    def _seconds_until_due(self, now: float) -> Optional[float]:
+        """Seconds until the pending batch should be pushed (0 = now, None = idle)."""
+        depth = self.queue_depth
+        if depth == 0:
+            return None
+        if depth >= self.max_pending or self._stopping:
+            return 0.0
+        return max(0.0, min(self._last_change + self.debounce, self._first_change + self.interval) - now)
+    
+    def _run(self):
+        """Worker loop: wait until a batch is due, then push it."""
+        # SQLite connections are per-thread; the worker reads on its own
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self._restore(conn)
+            while True:
+                with self._condition:
+                    while True:
+                        wait = self._seconds_until_due(time.monotonic())
+                        if wait == 0.0 or (wait is None and self._stopping):
+                            break
+                        self._condition.wait(wait)
+                    
+                    if self.queue_depth == 0:
+                        return
+                    if self._stopping and not self._flush:
+                        self._save(conn)
+                        return
+                    
+                    batch = self._pending
+                    first_change = self._first_change
+                    self._pending = {table: set() for table in batch}
+                    self._first_change = self._last_change = None
+                
+                if not self._push(conn, batch, first_change) and self._stopping:
+                    # The batch was re-queued; keep it for the next scheduler
+                    self._save(conn)
+                    return
+        finally:
+            conn.close()
+    
+    def _restore(self, conn: sqlite3.Connection):
+        """Queue the ids a previous scheduler saved, due for an immediate push."""
+        try:
+            row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (PENDING_KEY,)).fetchone()
+        except sqlite3.Error:
+            return
+        if row is None or not row[0]:
+            return
+        with self._condition:
+            for table, ids in json.loads(row[0]).items():
+                if table in self._pending:
+                    self._pending[table].update(ids)
+            if self.queue_depth:
+                now = time.monotonic()
+                self._first_change = now - self.interval
+                self._last_change = self._last_change or now
+        self._restored = row[0]
+    
+    def _save(self, conn: sqlite3.Connection):
+        """Store the queued ids in sync_state, merged with any saved before."""
+        with self._condition:
+            pending = {table: set(ids) for table, ids in self._pending.items()}
+        try:
+            row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (PENDING_KEY,)).fetchone()
+            if row is not None and row[0]:
+                for table, ids in json.loads(row[0]).items():
+                    pending.setdefault(table, set()).update(ids)
+            value = json.dumps({table: sorted(ids) for table, ids in pending.items() if ids})
+            conn.execute("""
+                INSERT INTO sync_state (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """, (PENDING_KEY, value))
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Auto-sync could not save {self.queue_depth} unsynced change(s): {e}")
+            return
+        with self._condition:
+            for ids in self._pending.values():
+                ids.clear()
+    
+    def _forget_restored(self, conn: sqlite3.Connection):
+        """Drop the saved ids once a push has covered them."""
+        try:
+            # Only if unchanged: another scheduler may have saved more since
+            conn.execute("DELETE FROM sync_state WHERE key = ? AND value = ?", (PENDING_KEY, self._restored))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            return
+        self._restored = None
+    
+    def _push(self, conn: sqlite3.Connection, batch: Dict[str, Set[int]], first_change: float) -> bool:
+        """Push the current rows for a batch of changed ids; False re-queues them."""
+        started = time.monotonic()
+        rejected: List[int] = []
+        deletions: List[Tombstone] = []
+        try:
+            pushed = 0
+            for record_type in RECORD_TYPES:
+                ids = batch[record_type.TABLE]
+                if not ids:
+                    continue
+                cursor = conn.execute(f"""
+                    SELECT {', '.join(record_type._fields)}
+                    FROM {record_type.TABLE}
+                    WHERE id IN (SELECT value FROM json_each(?))
+                    ORDER BY id
+                """, (json.dumps(sorted(ids)),))
+                rows = map(record_type._make, cursor)
+                if record_type is Tombstone:
+                    rows = deletions = list(rows)
+                pushed += self.supabase.push_records(record_type, rows, rejected)
+        except Exception as e:
+            with self._condition:
+                # Re-queue so the rows go out with the next attempt
+                for table, ids in batch.items():
+                    self._pending[table] |= ids
+                now = time.monotonic()
+                self._first_change = min(first_change, self._first_change or now)
+                self._last_change = self._last_change or now
+                self.failures += 1
+                self.last_error = str(e)
+            record_sync_outcome('auto_push', False)
+            self._record_result(conn, False)
+            if not self._stopping:
+                # Back off instead of retrying a dead connection in a tight loop
+                time.sleep(min(self.interval, 5.0))
+            return False
+        
+        finished = time.monotonic()
+        record_sync_outcome('auto_push', True)
+        self._record_result(conn, True, deletions)
+        if self._restored is not None:
+            # The first batch took everything that was restored
+            self._forget_restored(conn)
+        with self._condition:
+            self.pushes += 1
+            self.rows_pushed += pushed
+            self.rows_rejected += len(rejected)
+            self.last_error = None
+            self.last_sync = time.time()
+            self.last_latency = finished - first_change
+            self.last_duration = finished - started
+        return True
+    
+    def _record_result(self, conn: sqlite3.Connection, success: bool,
+                       deletions: Optional[List[Tombstone]] = None):
+        """Store the push outcome, and how far pushed deletions reach, in sync_state."""
+        now = datetime.now().isoformat(sep=' ', timespec='seconds')
+        values = [('last_result', f"auto-sync push {'succeeded' if success else 'failed'} at {now}")]
+        if success:
+            values.append(('last_push_at', now))
+        try:
+            conn.executemany("""
+                INSERT INTO sync_state (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """, values)
+            if deletions:
+                # Tombstone compaction stops at the newest deletion pushed, but
+                # only if the batch held every one since the last mark; older
+                # ones made while nobody was listening wait for a full push
+                conn.execute("""
+                    INSERT INTO sync_state (key, value)
+                    SELECT ?1, ?2
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM tombstones
+                        WHERE deleted_at <= ?2
+                          AND deleted_at > COALESCE((SELECT value FROM sync_state WHERE key = ?1), '')
+                          AND id NOT IN (SELECT value FROM json_each(?3))
+                    )
+                    ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)
+                """, (PUSHED_DELETIONS_KEY, max(row.deleted_at for row in deletions),
+                      json.dumps([row.id for row in deletions])))
+            conn.commit()
+        except sqlite3.Error:
+            # Status bookkeeping must never break syncing
+            conn.rollback()
@@ -0,0 +1,37 @@
+"""
+Shared fixtures for the AADS Series tests
+"""
+
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aads_database import AADSDatabase
+
+
+@pytest.fixture
+def quiet():
+    """Swallow the progress lines the database prints."""
+    with redirect_stdout(io.StringIO()) as output:
+        yield output
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'series.db')
+
+
+@pytest.fixture
+def db(db_path):
+    """A series database file with the standard events."""
+    database = AADSDatabase(db_path, enable_sync=False)
+    with redirect_stdout(io.StringIO()):
+        database.initialize_events()
+    yield database
+    database.close()
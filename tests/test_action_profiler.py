@@ -0,0 +1,52 @@
+import os
+import pstats
+
+import aads_manager
+from action_profiler import CATEGORIES, ActionProfiler, categorize
+
+
+def test_wrapped_actions_are_profiled_and_reported(db, quiet, tmp_path, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda prompt='': '')
+    manager = aads_manager.AADSManager(db)
+    profiler = ActionProfiler(str(tmp_path / 'profiles'))
+    profiler.wrap(manager, aads_manager.MENU_ACTIONS)
+    
+    manager.view_all_events()
+    manager.view_all_events()
+    assert manager.view_all_events.__name__ == 'view_all_events'
+    assert profiler.calls == {'view_all_events': 2}
+    functions = profiler.stats['view_all_events'].stats
+    assert any(categorize(function) == 'sql' for function in functions)
+    
+    path = profiler.finish()
+    assert path == str(tmp_path / 'profiles' / 'report.txt')
+    with open(path, encoding='utf-8') as handle:
+        rows = [line.split() for line in handle]
+    action = next(row for row in rows if row and row[0] == 'view_all_events')
+    assert action[1] == '2' and len(action) == 3 + len(CATEGORIES)
+    pstats.Stats(str(tmp_path / 'profiles' / 'view_all_events.prof'))
+
+
+def test_nothing_is_wrapped_without_the_profiler(db, quiet):
+    manager = aads_manager.AADSManager(db)
+    assert 'view_all_events' not in vars(manager)
+    assert manager.view_all_events.__func__ is aads_manager.AADSManager.view_all_events
+    assert ActionProfiler(output_dir='unused').finish() is None
+    assert not os.path.exists('unused')
+
+
+def test_nested_actions_get_their_own_profile(db, quiet):
+    profiler = ActionProfiler()
+    
+    def inner():
+        return db.get_all_events_summary()
+    
+    def outer():
+        return profiler.run('inner', inner)
+    
+    assert len(profiler.run('outer', outer)) == 7
+    assert profiler.calls == {'outer': 1, 'inner': 1}
+    inner_names = {function[2] for function in profiler.stats['inner'].stats}
+    outer_names = {function[2] for function in profiler.stats['outer'].stats}
+    assert 'get_all_events_summary' in inner_names
+    assert 'get_all_events_summary' not in outer_names
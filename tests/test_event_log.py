@@ -0,0 +1,78 @@
+import threading
+
+from aads_database import AADSDatabase
+
+TABLES = {
+    'players': "id, name, province, status, total_events, toc_qualified",
+    'events': "id, name, event_type, event_date, status, winner_id",
+    'event_participants': "id, event_id, player_id, is_debut, is_veteran, placement",
+}
+
+
+def contents(db):
+    return {table: db.conn.execute(f"SELECT {columns} FROM {table} ORDER BY id").fetchall()
+            for table, columns in TABLES.items()}
+
+
+def play_season(db):
+    db.add_player('Dana', 'PEI')
+    for name, province in (('Alice', 'NB'), ('Bob', 'NS'), ('Carol', 'NB')):
+        db.add_player_to_event(1, name, province)
+    db.add_player_to_event(2, 'Alice', 'NB')
+    db.record_placement(1, 'Bob', 2)
+    db.set_event_winner(1, 'Alice')
+    db.remove_player_from_event(1, 'Carol')
+    db.reconcile_event_roster(3, ['Bob', ('Erin', 'NS')])
+    db.delete_player('Dana')
+    db.recompute_participation_flags()
+
+
+def test_rebuild_matches_live_tables(db, tmp_path, quiet):
+    play_season(db)
+    target = str(tmp_path / 'rebuilt.db')
+    result = db.oplog.rebuild(target)
+    assert result['seq'] == db.oplog.last_seq()
+    
+    rebuilt = AADSDatabase(target, enable_sync=False)
+    try:
+        assert contents(rebuilt) == contents(db)
+        assert rebuilt.oplog.last_seq() == db.oplog.last_seq()
+    finally:
+        rebuilt.close()
+
+
+def test_rebuild_up_to_an_earlier_operation(db, tmp_path, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    before = contents(db)
+    seq = db.oplog.last_seq()
+    db.add_player_to_event(1, 'Bob', 'NS')
+    db.record_placement(1, 'Alice', 1)
+    
+    target = str(tmp_path / 'earlier.db')
+    db.oplog.rebuild(target, upto=seq)
+    rebuilt = AADSDatabase(target, enable_sync=False)
+    try:
+        assert contents(rebuilt) == before
+    finally:
+        rebuilt.close()
+
+
+def test_checkpoint_waits_for_a_running_snapshot(db, quiet, monkeypatch):
+    snapshots = db.oplog.snapshots
+    copy = snapshots.snapshot
+    release = threading.Event()
+    labels = []
+    
+    def slow_snapshot(label='', progress=None):
+        labels.append(label)
+        release.wait(5)
+        return copy(label, progress)
+    
+    monkeypatch.setattr(snapshots, 'snapshot', slow_snapshot)
+    assert snapshots.snapshot_in_background('periodic')
+    # The running copy may predate a pull, so a checkpoint takes another
+    threading.Timer(0.1, release.set).start()
+    assert db.oplog.checkpoint()
+    snapshots.wait()
+    assert labels == ['periodic', 'checkpoint']
+    assert len(db.oplog.list_snapshots()) == 2
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from aads_database import AADSDatabase
+from fake_supabase import FakeSupabase, FakeSupabaseError
+from supabase_sync import SupabaseSync
+
+
+def contents(db):
+    return {table: db.conn.execute(f"SELECT id FROM {table} ORDER BY id").fetchall()
+            for table in ('players', 'events', 'event_participants')}
+
+
+@pytest.mark.parametrize('staged', [False, True])
+def test_round_trip_pages_past_max_rows(db, quiet, tmp_path, staged):
+    with db.write_transaction():
+        for i in range(25):
+            db.add_player_to_event(1 + i % 3, f"Player {i:02d}", 'NB')
+    server = FakeSupabase(max_rows=7)
+    sync = SupabaseSync(client=server)
+    assert sync.full_sync_to_cloud(db)
+    assert len(server.rows('players')) == 25
+    # A single select never returns more than max_rows
+    assert len(server.table('players').select('*').execute().data) == 7
+    
+    target = AADSDatabase(str(tmp_path / 'copy.db'), enable_sync=False)
+    try:
+        assert sync.pull_from_cloud(target, staged=staged)
+        assert contents(target) == contents(db)
+    finally:
+        target.close()
+
+
+def test_fail_next_only_hits_matching_requests():
+    server = FakeSupabase()
+    server.fail_next(table='players', method='upsert')
+    
+    server.table('events').upsert({'id': 1, 'name': 'Event 1'}).execute()
+    server.table('players').select('*').execute()
+    with pytest.raises(FakeSupabaseError):
+        server.table('players').upsert({'id': 1, 'name': 'Alice'}).execute()
+    server.table('players').upsert({'id': 1, 'name': 'Alice'}).execute()
+    
+    assert server.stats['failures'] == 1
+    assert server.stats['requests'] == 4
+    assert server.stats['by_method'] == {'upsert': 3, 'select': 1}
+    assert [row['name'] for row in server.rows('players')] == ['Alice']
+
+
+def test_stats_count_json_bodies_and_rows():
+    server = FakeSupabase()
+    payload = [{'id': i, 'name': f"Player {i}", 'province': 'NB'} for i in range(1, 4)]
+    server.table('players').upsert(payload).execute()
+    assert server.stats['bytes_sent'] == len(json.dumps(payload))
+    assert server.stats['rows_written'] == 3
+    
+    server.reset_stats()
+    data = server.table('players').select('id, name').order('id').range(0, 1).execute().data
+    assert data == [{'id': 1, 'name': 'Player 1'}, {'id': 2, 'name': 'Player 2'}]
+    assert server.stats == {'requests': 1, 'bytes_sent': 0, 'bytes_received': len(json.dumps(data)),
+                            'rows_written': 0, 'rows_read': 2, 'failures': 0, 'by_method': {'select': 1}}
+
+
+def test_oversized_payloads_are_rejected_whole():
+    server = FakeSupabase(max_payload_rows=2)
+    payload = [{'id': i, 'name': f"Player {i}"} for i in range(1, 4)]
+    with pytest.raises(FakeSupabaseError) as error:
+        server.table('players').upsert(payload).execute()
+    assert error.value.code == '413'
+    assert server.rows('players') == []
+    
+    server.table('players').upsert(payload[:2]).execute()
+    assert len(server.rows('players')) == 2
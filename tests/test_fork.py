@@ -0,0 +1,45 @@
+def contents(db):
+    return {table: db.conn.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+            for table in ('players', 'events', 'event_participants')}
+
+
+def test_fork_writes_leave_the_source_alone(db, quiet):
+    for name, province in (('Alice', 'NB'), ('Bob', 'NS'), ('Carol', 'PEI')):
+        db.add_player_to_event(1, name, province)
+    db.set_event_winner(1, 'Alice')
+    before = contents(db)
+    
+    fork = db.fork()
+    try:
+        assert contents(fork) == before
+        fork.add_player_to_event(2, 'Dave', 'NB')
+        fork.remove_player_from_event(1, 'Bob')
+        fork.set_event_winner(2, 'Dave')
+        fork.delete_player('Carol')
+        assert [row['name'] for row in fork.get_all_players()] == ['Alice', 'Bob', 'Dave']
+    finally:
+        fork.close()
+    
+    assert contents(db) == before
+    assert [row['name'] for row in db.get_event_roster(1)] == ['Alice', 'Bob', 'Carol']
+
+
+def test_fork_standings_match_the_source(db, quiet):
+    for event_id in (1, 2):
+        for name, province in (('Alice', 'NB'), ('Bob', 'NS'), ('Carol', 'PEI')):
+            db.add_player_to_event(event_id, name, province)
+    db.record_placement(1, 'Carol', 2)
+    db.set_event_winner(1, 'Alice')
+    db.set_event_winner(2, 'Bob')
+    standings = db.analytics.standings()
+    
+    fork = db.fork()
+    try:
+        assert fork.analytics.standings() == standings
+        # A scenario's changes stay in the fork
+        fork.record_placement(2, 'Carol', 2)
+        assert fork.analytics.player_stats(3)['points'] == 14
+    finally:
+        fork.close()
+    assert db.analytics.standings() == standings
+    assert db.analytics.player_stats(3)['points'] == 8
@@ -0,0 +1,64 @@
+import sqlite3
+
+import pytest
+
+import metrics
+from aads_database import AADSDatabase
+
+
+def roster_size(path, event_id):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM event_participants WHERE event_id = ?",
+                            (event_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def desk(db_path):
+    # Commits only when flushed or full
+    database = AADSDatabase(db_path, enable_sync=False, group_commit=False)
+    database.start_group_commit(max_ops=1000, interval=3600)
+    yield database
+    database.close()
+
+
+def test_batch_is_committed_together(desk, db_path, quiet):
+    commits = metrics.COMMITS.value()
+    for i in range(5):
+        desk.add_player_to_event(1, f"Player {i}", 'NB')
+    assert roster_size(db_path, 1) == 0
+    
+    assert desk.flush_writes()
+    assert roster_size(db_path, 1) == 5
+    assert metrics.COMMITS.value() == commits + 1
+
+
+def test_failed_write_is_undone_alone(desk, db_path, quiet):
+    rollbacks = metrics.ROLLBACKS.value()
+    desk.add_player_to_event(1, 'Alice', 'NB')
+    with pytest.raises(RuntimeError):
+        with desk.write_transaction():
+            desk.add_player_to_event(1, 'Bob', 'NS')
+            raise RuntimeError("desk closed")
+    desk.flush_writes()
+    
+    assert [player['name'] for player in desk.get_event_roster(1)] == ['Alice']
+    assert metrics.ROLLBACKS.value() == rollbacks + 1
+
+
+def test_committer_starts_with_the_first_write(db_path, quiet):
+    database = AADSDatabase(db_path, enable_sync=False, group_commit=True)
+    try:
+        assert database.group_committer is None
+        database.add_player('Alice', 'NB')
+        assert database.group_committer is not None
+        
+        assert database.stop_group_commit()
+        database.add_player('Bob', 'NS')
+        assert database.group_committer is None
+        assert roster_size(db_path, 1) == 0
+        assert [player['name'] for player in database.get_all_players()] == ['Alice', 'Bob']
+    finally:
+        database.close()
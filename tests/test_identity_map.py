@@ -0,0 +1,38 @@
+import sqlite3
+
+
+def test_cached_lookups_issue_no_queries(db, quiet):
+    db.add_player('Alice', 'NB')
+    identities = db.identities
+    assert identities.player_id('Alice') == 1
+    identities.player(1)
+    identities.event(1)
+    
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        assert identities.player_id('Alice') == 1
+        assert identities.player(1)['name'] == 'Alice'
+        assert identities.event(1)['name'] == "Event 1 - Invitational"
+        # Through the database only the staleness check runs
+        assert db.identities.player_id('Alice') == 1
+    finally:
+        db.conn.set_trace_callback(None)
+    assert statements == ["PRAGMA data_version"]
+
+
+def test_writes_from_another_connection_clear_the_map(db, db_path, quiet):
+    db.add_player('Alice', 'NB')
+    assert db.identities.player(1)['province'] == 'NB'
+    assert db.identities.player_id('Alice') == 1
+    
+    other = sqlite3.connect(db_path)
+    try:
+        other.execute("UPDATE players SET name = 'Alicia', province = 'PEI' WHERE id = 1")
+        other.commit()
+    finally:
+        other.close()
+    
+    assert db.identities.player(1)['province'] == 'PEI'
+    assert db.identities.player_id('Alice') is None
+    assert db.identities.player_id('Alicia') == 1
@@ -0,0 +1,55 @@
+import sqlite3
+
+from local_backup import LocalBackup
+
+
+def player_names(db):
+    return [row['name'] for row in db.get_all_players()]
+
+
+def test_snapshot_copies_the_database(db, quiet):
+    db.add_player('Alice', 'NB')
+    db.flush_writes()
+    
+    result = db.backups.snapshot(label='manual')
+    assert result['path'].endswith('-manual.db')
+    assert result['pages'] > 0 and result['pages_per_sec'] > 0
+    assert [snapshot['path'] for snapshot in db.backups.list_snapshots()] == [result['path']]
+    
+    copy = sqlite3.connect(result['path'])
+    try:
+        assert copy.execute("SELECT name FROM players").fetchall() == [('Alice',)]
+    finally:
+        copy.close()
+
+
+def test_retention_keeps_the_newest_snapshots(db, quiet, tmp_path):
+    backups = LocalBackup(db.db_path, backup_dir=str(tmp_path / 'kept'), retention=2)
+    paths = [backups.snapshot(label=str(number))['path'] for number in range(4)]
+    
+    assert [snapshot['path'] for snapshot in backups.list_snapshots()] == paths[:1:-1]
+    assert backups.last_result['pruned'] == [paths[1]]
+
+
+def test_background_snapshot_reports_its_result(db, quiet):
+    finished = []
+    assert db.backups.snapshot_in_background('nightly', on_done=finished.append)
+    db.backups.wait(10)
+    
+    assert not db.backups.running
+    assert finished == [db.backups.last_result]
+    assert 'error' not in finished[0]
+
+
+def test_restore_brings_back_the_snapshot(db, quiet):
+    db.add_player('Alice', 'NB')
+    db.flush_writes()
+    snapshot = db.backups.snapshot()['path']
+    db.add_player('Bob', 'NS')
+    db.delete_player('Alice')
+    assert player_names(db) == ['Bob']
+    
+    db.restore_snapshot(snapshot)
+    assert player_names(db) == ['Alice']
+    # The data being replaced was kept as a snapshot of its own
+    assert db.backups.list_snapshots()[0]['name'].endswith('-pre-restore.db')
@@ -0,0 +1,57 @@
+import pytest
+
+from aads_records import Player
+from fake_supabase import FakeSupabase
+from merkle_check import compare, compare_table, SQLiteDigestSource, SupabaseDigestSource
+from supabase_sync import SupabaseSync
+
+
+@pytest.fixture
+def synced(db, quiet):
+    server = FakeSupabase()
+    db.supabase = SupabaseSync(client=server)
+    with db.write_transaction():
+        for i in range(300):
+            db.add_player(f"Player {i:03d}", ('NB', 'NS', 'PEI')[i % 3])
+    db.add_player_to_event(1, 'Player 007', 'NB')
+    assert db.sync_to_cloud()
+    return db, server
+
+
+def check_players(db, server):
+    # A small tree, so a single difference takes several levels to find
+    return compare_table(SQLiteDigestSource(db.conn), SupabaseDigestSource(server), Player,
+                         fanout=4, leaf_size=8)
+
+
+def test_matching_copies_agree_at_the_root(synced):
+    db, server = synced
+    results = compare(SQLiteDigestSource(db.conn), SupabaseDigestSource(server))
+    for table, result in results.items():
+        assert (result['missing_local'], result['missing_remote'], result['different']) == ([], [], []), table
+        assert result['ranges_compared'] == 1
+    assert db.verify_against_cloud()['players']['different'] == []
+
+
+def test_finds_a_single_changed_row(synced):
+    db, server = synced
+    db.conn.execute("UPDATE players SET province = 'NS' WHERE id = 123")
+    db.conn.commit()
+    result = check_players(db, server)
+    assert (result['missing_local'], result['missing_remote'], result['different']) == ([], [], [123])
+    assert 1 < result['ranges_compared'] < 300
+
+
+def test_finds_a_row_missing_in_the_cloud(synced):
+    db, server = synced
+    server.table('players').delete().in_('id', [250]).execute()
+    result = check_players(db, server)
+    assert (result['missing_local'], result['missing_remote'], result['different']) == ([], [250], [])
+
+
+def test_finds_an_extra_cloud_row(synced):
+    db, server = synced
+    db.conn.execute("DELETE FROM players WHERE id = 42")
+    db.conn.commit()
+    result = check_players(db, server)
+    assert (result['missing_local'], result['missing_remote'], result['different']) == ([42], [], [])
@@ -0,0 +1,37 @@
+import pytest
+
+import metrics
+
+
+def test_render_uses_the_prometheus_text_format():
+    registry = metrics.Registry()
+    registry.counter('checks_total', 'Check-ins', ('province',)).inc(2, province='NB')
+    registry.histogram('write_seconds', 'Write time', buckets=(0.1, 1.0)).observe(0.5)
+    assert registry.render().splitlines() == [
+        '# HELP checks_total Check-ins',
+        '# TYPE checks_total counter',
+        'checks_total{province="NB"} 2',
+        '# HELP write_seconds Write time',
+        '# TYPE write_seconds histogram',
+        'write_seconds_bucket{le="0.1"} 0',
+        'write_seconds_bucket{le="1"} 1',
+        'write_seconds_bucket{le="+Inf"} 1',
+        'write_seconds_sum 0.5',
+        'write_seconds_count 1',
+    ]
+
+
+def test_registering_again_returns_the_same_metric():
+    registry = metrics.Registry()
+    counter = registry.counter('checks_total', 'Check-ins')
+    assert registry.counter('checks_total', 'Check-ins') is counter
+    with pytest.raises(ValueError):
+        registry.gauge('checks_total', 'Check-ins')
+
+
+def test_metric_types_must_export_samples():
+    class Incomplete(metrics._Metric):
+        pass
+    
+    with pytest.raises(TypeError):
+        Incomplete('incomplete', 'No samples')
@@ -0,0 +1,39 @@
+def flags(db, name):
+    return {row[0]: (row[1], row[2]) for row in db.conn.execute("""
+        SELECT ep.event_id, ep.is_debut, ep.is_veteran
+        FROM event_participants ep JOIN players p ON p.id = ep.player_id
+        WHERE p.name = ?
+    """, (name,))}
+
+
+def test_recompute_follows_event_dates_not_insert_order(db, quiet):
+    db.conn.execute("UPDATE events SET event_date = printf('2026-%02d-01', id)")
+    db.conn.commit()
+    # Entered late: the Event 3 row was inserted first and took the debut
+    db.add_player_to_event(3, 'Alice', 'NB')
+    db.add_player_to_event(1, 'Alice', 'NB')
+    assert flags(db, 'Alice') == {3: (1, 0), 1: (0, 1)}
+    
+    assert db.recompute_participation_flags('Alice') == 2
+    assert flags(db, 'Alice') == {1: (1, 0), 3: (0, 1)}
+    assert db.recompute_participation_flags() == 0
+
+
+def test_recompute_after_a_winner_changes_nothing(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    db.add_player_to_event(2, 'Alice', 'NB')
+    db.set_event_winner(2, 'Alice')
+    
+    assert db.get_player_history('Alice')['total_events'] == 3
+    assert db.recompute_participation_flags() == 0
+
+
+def test_recompute_puts_undated_events_last(db, quiet):
+    db.conn.execute("UPDATE events SET event_date = '2026-05-01' WHERE id = 4")
+    db.conn.commit()
+    db.add_player_to_event(2, 'Bob', 'NS')
+    db.add_player_to_event(4, 'Bob', 'NS')
+    
+    db.recompute_participation_flags()
+    assert flags(db, 'Bob') == {2: (0, 1), 4: (1, 0)}
+    assert db.get_player_history('Bob')['total_events'] == 2
@@ -0,0 +1,27 @@
+from aads_database import AADSDatabase
+
+
+def names(players):
+    return [player['name'] for player in players]
+
+
+def test_index_follows_this_connections_writes(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    assert names(db.find_players(all_of=[1])) == ['Alice']
+    db.add_player_to_event(2, 'Bob', 'NS')
+    db.remove_player_from_event(1, 'Alice')
+    assert names(db.find_players(any_of=[1, 2])) == ['Bob']
+
+
+def test_index_sees_commits_from_another_connection(db, db_path, quiet):
+    other = AADSDatabase(db_path, enable_sync=False)
+    try:
+        other.add_player_to_event(1, 'Alice', 'NB')
+        other.add_player_to_event(2, 'Bob', 'NS')
+        assert names(db.get_players_not_in_event(2)) == ['Alice']
+        
+        other.add_player_to_event(2, 'Alice', 'NB')
+        assert names(db.get_players_not_in_event(2)) == []
+        assert names(db.find_players(all_of=[2])) == ['Alice', 'Bob']
+    finally:
+        other.close()
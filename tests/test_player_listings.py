@@ -0,0 +1,66 @@
+import pytest
+
+import aads_manager
+from aads_database import PLAYER_SORTS
+
+
+@pytest.fixture
+def roster(db, quiet):
+    # Shared provinces, statuses and event counts, so pages split inside ties
+    for i in range(23):
+        db.add_player(f"Player {i:02d}", ('NB', 'NS', 'PEI')[i % 3])
+    for i in range(0, 23, 2):
+        db.add_player_to_event(1, f"Player {i:02d}", 'NB')
+    for i in range(0, 23, 4):
+        db.add_player_to_event(2, f"Player {i:02d}", 'NB')
+    return db
+
+
+def pages(db, sort_by, limit, **filters):
+    rows, after = [], None
+    while True:
+        page = list(db.iter_players(sort_by, after=after, limit=limit, **filters))
+        rows.extend(page)
+        if len(page) < limit:
+            return rows
+        after = db.player_cursor(page[-1], sort_by)
+
+
+@pytest.mark.parametrize('sort_by', list(PLAYER_SORTS))
+@pytest.mark.parametrize('limit', [1, 4, 7])
+def test_keyset_pages_match_the_full_listing(roster, sort_by, limit):
+    expected = [row['id'] for row in roster.iter_players(sort_by)]
+    assert len(expected) == 23
+    assert [row['id'] for row in pages(roster, sort_by, limit)] == expected
+
+
+def test_keyset_pages_keep_filters(roster):
+    expected = [row['id'] for row in roster.iter_players("participation", province='NB', has_played=True)]
+    assert expected
+    assert [row['id'] for row in pages(roster, "participation", 2, province='NB', has_played=True)] == expected
+
+
+def test_pages_resume_after_rows_added_in_between(roster, quiet):
+    first = list(roster.iter_players("name", limit=5))
+    roster.add_player("Aaron", 'NB')
+    rest = list(roster.iter_players("name", after=roster.player_cursor(first[-1], "name")))
+    # Rows before the cursor are not repeated, rows after it are not skipped
+    assert [row['name'] for row in first + rest] == [f"Player {i:02d}" for i in range(23)]
+
+
+def test_invite_candidates_are_listed_page_by_page(roster, capsys, monkeypatch):
+    def load_everyone(event_id):
+        raise AssertionError("the full candidate list was loaded")
+    
+    prompts = []
+    monkeypatch.setattr(aads_manager, 'PAGE_SIZE', 5)
+    monkeypatch.setattr('builtins.input', lambda prompt='': prompts.append(prompt) or '')
+    monkeypatch.setattr(roster, 'get_players_not_in_event', load_everyone)
+    aads_manager.AADSManager(roster).view_invite_candidates()
+    
+    # Everyone who has played missed Event 5; prospects are not invited
+    out = capsys.readouterr().out
+    assert "Total Candidates: 12" in out
+    assert all(f"Player {i:02d}" in out for i in range(0, 23, 2))
+    assert not any(f"Player {i:02d}" in out for i in range(1, 23, 2))
+    assert len(prompts) == 3
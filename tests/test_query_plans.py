@@ -0,0 +1,99 @@
+import io
+import os
+import re
+import sys
+from contextlib import redirect_stdout
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from aads_database import AADSDatabase
+from query_plans import hot_queries, hot_writes, plan_problems
+from synthetic import populate
+
+EVENT_ID = 3
+
+# Constraint indexes are named by SQLite on a fresh file and by the staged
+# restore after a swap
+PLAYER_NAME = r"(?:sqlite_autoindex_players_1|idx_players_name)"
+EVENT_PLAYER = r"(?:sqlite_autoindex_event_participants_1|idx_event_participants_event_player)"
+
+# Plan line each hot call must produce (None: only that guarded tables are searched)
+EXPECTED_READS = {
+    "event roster": rf"SEARCH ep USING INDEX {EVENT_PLAYER} \(event_id=\?\)",
+    "event details": r"SEARCH e USING INTEGER PRIMARY KEY",
+    "player history": r"SEARCH ep USING INDEX idx_event_participants_player \(player_id=\?\)",
+    "next page by name": rf"SEARCH players USING INDEX {PLAYER_NAME} \(name>\?\)",
+    "province page": r"SEARCH players USING INDEX idx_players_province \(province=\?\)",
+    "prospects page": r"SCAN players USING INDEX idx_players_province",
+    "candidate page (NOT IN)": rf"SEARCH event_participants USING COVERING INDEX {EVENT_PLAYER} \(event_id=\?\)",
+    "candidate count (NOT IN)": rf"SEARCH event_participants USING COVERING INDEX {EVENT_PLAYER} \(event_id=\?\)",
+    "invite candidates": r"SEARCH players USING INTEGER PRIMARY KEY",
+    "standings top 25": r"USING (?:COVERING )?INDEX idx_season_standings_points",
+}
+EXPECTED_WRITES = {
+    "check in new player": rf"SEARCH players USING INDEX {PLAYER_NAME} \(name=\?\)",
+    "record placement": rf"SEARCH event_participants USING COVERING INDEX {EVENT_PLAYER} \(event_id=\? AND player_id=\?\)",
+    "set event winner": rf"SEARCH event_participants USING COVERING INDEX {EVENT_PLAYER} \(event_id=\?\)",
+    "recompute player flags": r"SEARCH ep USING INDEX idx_event_participants_player \(player_id=\?\)",
+    "remove from event": rf"SEARCH ep USING COVERING INDEX {EVENT_PLAYER} \(event_id=\? AND player_id=\?\)",
+    "delete player": None,
+}
+
+
+@pytest.fixture(scope='module')
+def series(tmp_path_factory):
+    db = AADSDatabase(str(tmp_path_factory.mktemp('plans') / 'plans.db'), enable_sync=False)
+    populate(db, players=200, events=6, per_event=30)
+    db.rebuild_summaries()
+    yield db
+    db.close()
+
+
+def traced_plans(db, call, allowed_walks):
+    """(plan lines, guarded scans) for every statement ``call`` issues."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        with redirect_stdout(io.StringIO()):
+            call()
+    finally:
+        db.conn.set_trace_callback(None)
+    lines, problems = [], []
+    for sql in dict.fromkeys(statements):
+        if sql.lstrip().startswith('--'):
+            continue
+        try:
+            lines.extend(row[3] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        except Exception:
+            continue
+        problems.extend(plan_problems(db.conn, sql, allowed_walks))
+    return lines, problems
+
+
+def assert_plan(label, lines, problems, expected):
+    assert not problems, f"{label} scans a guarded table: {problems}"
+    if expected is not None:
+        assert any(re.search(expected, line) for line in lines), f"{label} did not use {expected}: {lines}"
+
+
+@pytest.mark.parametrize('label', list(EXPECTED_READS))
+def test_hot_query_uses_index(series, label):
+    player_name = series.get_event_roster(EVENT_ID)[0]['name']
+    cases = {case[0]: case for case in hot_queries(series, EVENT_ID, player_name)}
+    _, call, _, allowed_walks = cases[label]
+    # Builds in-memory caches, which load whole tables by design
+    with redirect_stdout(io.StringIO()):
+        call()
+    lines, problems = traced_plans(series, call, allowed_walks)
+    assert_plan(label, lines, problems, EXPECTED_READS[label])
+
+
+def test_hot_writes_use_indexes(series):
+    # Each write builds on the one before, so they run once in order
+    cases = hot_writes(series, EVENT_ID)
+    assert [case[0] for case in cases] == list(EXPECTED_WRITES)
+    for label, call, _, allowed_walks in cases:
+        lines, problems = traced_plans(series, call, allowed_walks)
+        assert_plan(label, lines, problems, EXPECTED_WRITES[label])
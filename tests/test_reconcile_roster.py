@@ -0,0 +1,38 @@
+def roster(db, event_id):
+    return sorted(row['name'] for row in db.get_event_roster(event_id))
+
+
+def test_reconcile_adds_removes_and_is_idempotent(db, quiet):
+    for name in ('Alice', 'Bob', 'Carol'):
+        db.add_player_to_event(1, name, 'NB')
+    db.set_event_winner(1, 'Carol')
+    
+    listed = ['Alice', ('Dave', 'NS')]
+    assert db.reconcile_event_roster(1, listed) == {
+        'added': ['Dave'], 'removed': ['Bob'], 'unchanged': ['Alice'], 'created': ['Dave'], 'kept': ['Carol']
+    }
+    assert roster(db, 1) == ['Alice', 'Carol', 'Dave']
+    assert db.get_player_history('Bob')['status'] == 'Prospect'
+    
+    seq = db.oplog.last_seq()
+    assert db.reconcile_event_roster(1, listed) == {
+        'added': [], 'removed': [], 'unchanged': ['Alice', 'Dave'], 'created': [], 'kept': ['Carol']
+    }
+    assert roster(db, 1) == ['Alice', 'Carol', 'Dave']
+    assert db.oplog.last_seq() == seq
+
+
+def test_reconcile_needs_a_province_for_new_players(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    assert db.reconcile_event_roster(1, ['Alice', 'Zed']) is None
+    assert roster(db, 1) == ['Alice']
+
+
+def test_reconcile_refuses_unknown_provinces_before_writing(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    seq = db.oplog.last_seq()
+    for _ in range(2):
+        assert db.reconcile_event_roster(1, [('Carl', 'NS'), ('Bad', 'XX')]) is None
+    assert roster(db, 1) == ['Alice']
+    assert [player['name'] for player in db.get_all_players()] == ['Alice']
+    assert db.oplog.last_seq() == seq
@@ -0,0 +1,63 @@
+import sqlite3
+
+import pytest
+
+from aads_database import AADSDatabase
+
+
+def placements(db, event_id):
+    return {row['name']: row['placement'] for row in db.get_event_roster(event_id)}
+
+
+def test_placement_below_one_is_refused(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    with pytest.raises(ValueError):
+        db.record_placement(1, 'Alice', 0)
+    assert placements(db, 1) == {'Alice': None}
+
+
+def test_placement_needs_a_roster_row(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    with pytest.raises(ValueError):
+        db.record_placement(2, 'Alice', 1)
+    with pytest.raises(ValueError):
+        db.record_placement(1, 'Nobody', 1)
+    assert placements(db, 2) == {}
+
+
+def test_schema_checks_placements(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    with pytest.raises(sqlite3.IntegrityError):
+        db.conn.execute("UPDATE event_participants SET placement = 0")
+    db.conn.rollback()
+
+
+def test_older_files_get_the_placement_check(db_path, quiet):
+    # A roster table from before placements were checked
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE event_participants (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            is_debut INTEGER DEFAULT 0,
+            is_veteran INTEGER DEFAULT 0,
+            placement INTEGER,
+            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(event_id, player_id)
+        )
+    """)
+    conn.commit()
+    conn.close()
+    
+    db = AADSDatabase(db_path, enable_sync=False)
+    try:
+        db.initialize_events()
+        db.add_player_to_event(1, 'Alice', 'NB')
+        with pytest.raises(sqlite3.IntegrityError):
+            db.conn.execute("UPDATE event_participants SET placement = -1")
+        db.conn.rollback()
+        db.record_placement(1, 'Alice', 1)
+        assert placements(db, 1) == {'Alice': 1}
+    finally:
+        db.close()
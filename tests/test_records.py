@@ -0,0 +1,39 @@
+from aads_records import Player, Event, Participant, to_cloud_timestamp, to_local_timestamp
+
+
+def test_iter_records_streams_compact_rows(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    db.set_event_winner(1, 'Alice')
+    
+    players = list(db.iter_records(Player))
+    assert [type(player) for player in players] == [Player]
+    alice = players[0]
+    assert not hasattr(alice, '__dict__')
+    # Rows answer both attribute and dict-style access
+    assert (alice.name, alice['province'], alice[0]) == ('Alice', 'NB', alice.id)
+    assert (alice.get('toc_qualified'), alice.get('missing', 0)) == (1, 0)
+    
+    participants = list(db.iter_records(Participant, "WHERE event_id = ?", (7,)))
+    assert [(row.event_id, row.player_id) for row in participants] == [(7, alice.id)]
+    assert [event.winner_id for event in db.iter_records(Event) if event.id == 1] == [alice.id]
+
+
+def test_cloud_round_trip_keeps_local_values(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    for record_type in (Player, Event, Participant):
+        for record in db.iter_records(record_type):
+            payload = record.to_push()
+            cloud_row = dict(payload)
+            if record_type is Player:
+                cloud_row['created_at'] = to_cloud_timestamp(record.created_at)
+            if record_type is Participant:
+                cloud_row['added_at'] = to_cloud_timestamp(record.added_at)
+            assert record_type.from_cloud(cloud_row) == record
+            assert record_type.coerce(record._asdict()) == record
+
+
+def test_timestamps_convert_between_sqlite_and_supabase():
+    assert to_cloud_timestamp('2024-03-01 12:30:00') == '2024-03-01T12:30:00+00:00'
+    assert to_local_timestamp('2024-03-01T12:30:00+00:00') == '2024-03-01 12:30:00'
+    assert to_local_timestamp('2024-03-01T09:30:00.123-03:00') == '2024-03-01 12:30:00'
+    assert to_cloud_timestamp(None) is None
@@ -0,0 +1,51 @@
+from aads_database import AADSDatabase
+
+
+def points(db):
+    return {row['name']: row['points'] for row in db.analytics.standings()}
+
+
+def test_standings_follow_placements(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    db.add_player_to_event(1, 'Bob', 'NS')
+    assert points(db) == {'Alice': 1, 'Bob': 1}
+    db.record_placement(1, 'Bob', 2)
+    assert points(db) == {'Bob': 7, 'Alice': 1}
+
+
+def test_standings_see_commits_from_another_connection(db, db_path, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    assert points(db) == {'Alice': 1}
+    
+    other = AADSDatabase(db_path, enable_sync=False)
+    try:
+        other.add_player_to_event(1, 'Bob', 'NS')
+        other.record_placement(1, 'Alice', 1)
+        assert points(db) == {'Alice': 10, 'Bob': 1}
+    finally:
+        other.close()
+
+
+def test_standings_leave_out_the_toc_and_unfinished_events(db, quiet):
+    for event_id in (4, 5):
+        for name in ('Alice', 'Bob', 'Carol'):
+            db.add_player_to_event(event_id, name, 'NB')
+    db.set_event_winner(4, 'Alice')
+    db.set_event_winner(5, 'Bob')
+    db.add_player_to_event(6, 'Dave', 'NS')
+    
+    standings = {row['name']: row for row in db.analytics.standings()}
+    # The winners' TOC entries add no events, and event 6 is still running
+    assert set(standings) == {'Alice', 'Bob', 'Carol'}
+    for name in ('Alice', 'Bob'):
+        assert standings[name]['events_played'] == 2
+        assert standings[name]['wins'] == 1
+        assert standings[name]['win_rate'] == 0.5
+    assert standings['Carol']['current_streak'] == 2
+    assert standings['Carol']['longest_streak'] == 2
+    
+    # Completing a later event ends the streaks of players who missed it
+    db.set_event_winner(6, 'Dave')
+    standings = {row['name']: row for row in db.analytics.standings()}
+    assert standings['Carol']['current_streak'] == 0
+    assert standings['Dave']['current_streak'] == 1
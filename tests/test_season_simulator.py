@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import season_simulator
+from season_simulator import SeasonSimulator
+
+
+@pytest.fixture
+def season(db, quiet):
+    # Events 1-5 are decided; only Event 6 is left to simulate
+    for event_id in range(1, 7):
+        for name, province in (('Alice', 'NB'), ('Bob', 'NS'), ('Carol', 'PEI'), ('Dave', 'NB')):
+            db.add_player_to_event(event_id, name, province)
+    for event_id in range(1, 6):
+        db.add_player_to_event(event_id, f"Winner {event_id}", 'NS')
+        db.set_event_winner(event_id, f"Winner {event_id}")
+    return db
+
+
+def test_manager_does_not_load_the_simulator_on_import():
+    result = subprocess.run(
+        [sys.executable, '-c', "import sys, aads_manager; "
+                               "print('season_simulator' in sys.modules, 'numpy' in sys.modules)"],
+        capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.dirname(__file__))
+    )
+    assert result.stdout.split()[-2:] == ['False', 'False']
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_one_remaining_event_qualifies_exactly_one_player(season, monkeypatch, numpy):
+    if numpy and not season_simulator.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(season_simulator, 'NUMPY_AVAILABLE', numpy)
+    simulator = SeasonSimulator(season, attendance=0.5)
+    assert [name for _, name, _, _ in simulator.events] == ["Event 6 - Invitational"]
+    
+    report = simulator.run(2000, seed=7)
+    contenders = [row for row in report if not row['qualified']]
+    assert {row['name'] for row in contenders} == {'Alice', 'Bob', 'Carol', 'Dave'}
+    assert sum(row['probability'] for row in contenders) == pytest.approx(1.0)
+    assert sum(row['expected_wins'] for row in report) == pytest.approx(1.0)
+    # The same seed gives the same season
+    assert simulator.run(2000, seed=7) == report
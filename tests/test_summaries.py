@@ -0,0 +1,31 @@
+# Triggers leave emptied province/status rows at zero; readers skip them
+SUMMARIES = {
+    'event_summary': "SELECT * FROM event_summary ORDER BY event_id",
+    'province_status_summary': "SELECT * FROM province_status_summary WHERE players > 0 ORDER BY province, status",
+}
+
+
+def summaries(db):
+    return {table: [tuple(row) for row in db.conn.execute(sql)] for table, sql in SUMMARIES.items()}
+
+
+def test_triggers_match_a_recount(db, quiet):
+    for event_id in (1, 2, 3):
+        for name, province in (('Alice', 'NB'), ('Bob', 'NS'), ('Carol', 'PEI'), ('Dave', 'NB')):
+            db.add_player_to_event(event_id, name, province)
+    db.add_player('Erin', 'NS')
+    db.set_event_winner(1, 'Alice')
+    db.remove_player_from_event(2, 'Bob')
+    db.remove_player_from_event(1, 'Dave')
+    # Re-placed on a roster after being taken off
+    db.add_player_to_event(2, 'Bob', 'NS')
+    db.add_player_to_event(1, 'Erin', 'NS')
+    db.record_placement(1, 'Carol', 2)
+    db.set_event_winner(2, 'Carol')
+    db.delete_player('Dave')
+    db.recompute_participation_flags()
+    
+    maintained = summaries(db)
+    assert maintained['event_summary'][:2] == [(1, 4, 4, 0, 1, 'Alice'), (2, 3, 0, 3, 3, 'Carol')]
+    db.rebuild_summaries()
+    assert summaries(db) == maintained
@@ -0,0 +1,238 @@
+import pytest
+
+from aads_database import AADSDatabase
+from fake_supabase import FakeSupabase
+from metrics import COMMITS
+from supabase_sync import SupabaseSync
+
+
+@pytest.fixture
+def server():
+    return FakeSupabase()
+
+
+def connect(path, server):
+    db = AADSDatabase(path, enable_sync=False)
+    db.supabase = SupabaseSync(client=server)
+    return db
+
+
+def stamps(server, table):
+    return {row['id']: row['updated_at'] for row in server.rows(table)}
+
+
+def test_full_push_of_unchanged_rows_keeps_cloud_stamps(tmp_path, server, quiet):
+    db = connect(str(tmp_path / 'a.db'), server)
+    db.add_player_to_event(1, 'Alice', 'NB')
+    db.add_player_to_event(1, 'Bob', 'NS')
+    assert db.sync_to_cloud()
+    before = stamps(server, 'players')
+    
+    assert db.sync_to_cloud()
+    assert stamps(server, 'players') == before
+    db.close()
+
+
+def test_stale_push_does_not_overwrite_newer_cloud_edit(tmp_path, server, quiet):
+    first = connect(str(tmp_path / 'a.db'), server)
+    first.add_player_to_event(1, 'Alice', 'NB')
+    assert first.sync_to_cloud()
+    
+    second = connect(str(tmp_path / 'b.db'), server)
+    assert second.pull_from_cloud()
+    second.conn.execute("UPDATE players SET province = 'PEI', updated_at = CURRENT_TIMESTAMP WHERE name = 'Alice'")
+    second.conn.commit()
+    assert second.sync_to_cloud()
+    
+    # The first desk still holds the older copy
+    first.conn.execute("UPDATE players SET updated_at = '2020-01-01 00:00:00'")
+    first.conn.commit()
+    assert first.sync_to_cloud()
+    assert [row['province'] for row in server.rows('players')] == ['PEI']
+    
+    assert first.incremental_pull()
+    assert [player['name'] for player in first.get_players_by_province('PEI')] == ['Alice']
+    first.close()
+    second.close()
+
+
+def test_incremental_pull_brings_roster_row_updates(tmp_path, server, quiet):
+    first = connect(str(tmp_path / 'a.db'), server)
+    first.add_player_to_event(1, 'Alice', 'NB')
+    first.add_player_to_event(1, 'Bob', 'NS')
+    assert first.sync_to_cloud()
+    
+    second = connect(str(tmp_path / 'b.db'), server)
+    assert second.pull_from_cloud()
+    # Make the placement clearly newer than the rows the second desk pulled
+    first.record_placement(1, 'Alice', 1)
+    first.conn.execute("UPDATE event_participants SET updated_at = datetime('now', '+1 minute') WHERE placement = 1")
+    first.conn.commit()
+    assert first.sync_to_cloud()
+    
+    assert second.incremental_pull()
+    placements = {row['name']: row['placement'] for row in second.get_event_roster(1)}
+    assert placements == {'Alice': 1, 'Bob': None}
+    first.close()
+    second.close()
+
+
+def test_incremental_pull_keeps_newer_local_roster_row(tmp_path, server, quiet):
+    first = connect(str(tmp_path / 'a.db'), server)
+    first.add_player_to_event(1, 'Alice', 'NB')
+    assert first.sync_to_cloud()
+    
+    second = connect(str(tmp_path / 'b.db'), server)
+    assert second.pull_from_cloud()
+    second.record_placement(1, 'Alice', 2)
+    second.conn.execute("UPDATE event_participants SET updated_at = datetime('now', '+1 minute')")
+    second.conn.commit()
+    
+    first.record_placement(1, 'Alice', 1)
+    assert first.sync_to_cloud()
+    assert second.incremental_pull()
+    assert second.get_event_roster(1)[0]['placement'] == 2
+    first.close()
+    second.close()
+
+
+def test_staged_pull_replaces_local_tables(tmp_path, server, quiet):
+    first = connect(str(tmp_path / 'a.db'), server)
+    first.initialize_events()
+    first.add_player_to_event(1, 'Alice', 'NB')
+    first.add_player_to_event(1, 'Bob', 'NS')
+    assert first.sync_to_cloud()
+    
+    second = connect(str(tmp_path / 'b.db'), server)
+    second.initialize_events()
+    second.add_player_to_event(1, 'Carol', 'PEI')
+    assert second.pull_from_cloud(staged=True)
+    assert sorted(row['name'] for row in second.get_event_roster(1)) == ['Alice', 'Bob']
+    first.close()
+    second.close()
+
+
+def test_staged_pull_refuses_a_truncated_download(tmp_path, quiet):
+    # Pages hold two rows, and a player is deleted in the cloud between pages
+    server = FakeSupabase(max_rows=2)
+    first = connect(str(tmp_path / 'a.db'), server)
+    first.initialize_events()
+    for name in ('Alice', 'Bob', 'Carol'):
+        first.add_player_to_event(1, name, 'NB')
+    assert first.sync_to_cloud()
+    assert len(server.rows('players')) == 3
+    
+    second = connect(str(tmp_path / 'b.db'), server)
+    second.initialize_events()
+    second.add_player_to_event(1, 'Dave', 'NS')
+    table, selects = server.table, []
+    
+    def racing_table(name):
+        if name == 'players':
+            selects.append(name)
+            if len(selects) == 2:
+                table('players').delete().eq('name', 'Alice').execute()
+        return table(name)
+    
+    server.table = racing_table
+    assert not second.pull_from_cloud(staged=True)
+    assert [row['name'] for row in second.get_event_roster(1)] == ['Dave']
+    first.close()
+    second.close()
+
+
+def test_pull_pages_past_the_server_row_cap(tmp_path, quiet):
+    server = FakeSupabase(max_rows=2)
+    first = connect(str(tmp_path / 'a.db'), server)
+    for name in ('Alice', 'Bob', 'Carol', 'Dave', 'Erin'):
+        first.add_player(name, 'NB')
+    assert first.sync_to_cloud()
+    
+    second = connect(str(tmp_path / 'b.db'), server)
+    assert second.pull_from_cloud()
+    assert len(second.get_all_players()) == 5
+    first.close()
+    second.close()
+
+
+def test_incremental_pull_keeps_newer_local_player_edit(tmp_path, server, quiet):
+    first = connect(str(tmp_path / 'a.db'), server)
+    first.add_player('Alice', 'NB')
+    assert first.sync_to_cloud()
+    
+    second = connect(str(tmp_path / 'b.db'), server)
+    assert second.pull_from_cloud()
+    second.conn.execute("UPDATE players SET province = 'PEI', updated_at = datetime('now', '+1 minute')")
+    second.conn.commit()
+    
+    first.conn.execute("UPDATE players SET province = 'NS', updated_at = CURRENT_TIMESTAMP")
+    first.conn.commit()
+    assert first.sync_to_cloud()
+    assert [row['province'] for row in server.rows('players')] == ['NS']
+    
+    # The cloud copy is older than the unpushed local edit, which wins
+    assert second.incremental_pull()
+    assert [player['province'] for player in second.get_all_players()] == ['PEI']
+    first.close()
+    second.close()
+
+
+def test_incremental_pull_refuses_ids_that_name_another_player(tmp_path, server, capsys):
+    first = connect(str(tmp_path / 'a.db'), server)
+    first.initialize_events()
+    first.add_player_to_event(1, 'Alice', 'NB')
+    assert first.sync_to_cloud()
+    
+    # Entered offline on the second desk, which gave Bob the same id
+    second = connect(str(tmp_path / 'b.db'), server)
+    second.initialize_events()
+    second.add_player_to_event(2, 'Bob', 'NS')
+    watermarks = second.get_sync_status()['watermarks']
+    
+    assert not second.incremental_pull()
+    assert [player['name'] for player in second.get_all_players()] == ['Bob']
+    assert [row['name'] for row in second.get_event_roster(2)] == ['Bob']
+    assert second.get_event_roster(1) == []
+    assert "player 1 is 'Alice' in the cloud but 'Bob' here" in capsys.readouterr().out
+    # The conflicting rows are fetched again by the next pull
+    assert second.get_sync_status()['watermarks'].get('players') == watermarks.get('players')
+    assert not second.incremental_pull()
+    first.close()
+    second.close()
+
+
+def test_push_reports_rows_the_cloud_kept(tmp_path, server, capsys):
+    first = connect(str(tmp_path / 'a.db'), server)
+    first.add_player('Alice', 'NB')
+    assert first.sync_to_cloud()
+    
+    # An edit stamped by a clock running an hour behind the cloud's copy
+    first.conn.execute("UPDATE players SET province = 'NS', updated_at = datetime('now', '-1 hour')")
+    first.conn.commit()
+    assert first.sync_to_cloud()
+    assert [row['province'] for row in server.rows('players')] == ['NB']
+    assert "1 players not written; the cloud copy is newer (ids 1)" in capsys.readouterr().out
+    first.close()
+
+
+def test_pulls_write_through_write_transaction(tmp_path, server, quiet):
+    first = connect(str(tmp_path / 'a.db'), server)
+    first.initialize_events()
+    first.add_player_to_event(1, 'Alice', 'NB')
+    assert first.sync_to_cloud()
+    
+    second = connect(str(tmp_path / 'b.db'), server)
+    for pull in (lambda: second.supabase.pull_from_cloud(second),
+                 lambda: second.supabase.pull_from_cloud(second, staged=True),
+                 lambda: second.supabase.incremental_pull(second)):
+        before = COMMITS.value()
+        assert pull()
+        assert COMMITS.value() == before + 1
+    assert [row['name'] for row in second.get_event_roster(1)] == ['Alice']
+    
+    # The standings refresh is a write transaction too
+    before = COMMITS.value()
+    assert [row['name'] for row in second.analytics.standings()] == ['Alice']
+    assert COMMITS.value() == before + 1
+    first.close()
+    second.close()
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from fake_supabase import FakeSupabase
+from supabase_sync import SupabaseSync
+from sync_scheduler import AutoSyncScheduler, PENDING_KEY
+
+
+@pytest.fixture
+def server():
+    return FakeSupabase()
+
+
+def start(db, server):
+    # Nothing is pushed on its own while a test runs
+    return AutoSyncScheduler(db.db_path, SupabaseSync(client=server), interval=3600, debounce=3600)
+
+
+def cloud_names(server):
+    return sorted(row['name'] for row in server.rows('players'))
+
+
+def test_stop_without_flush_keeps_changes_for_the_next_scheduler(db, server, quiet):
+    scheduler = start(db, server)
+    db.add_change_listener(scheduler.record_change)
+    db.add_player('Alice', 'NB')
+    scheduler.stop(flush=False)
+    assert cloud_names(server) == []
+    assert json.loads(db.get_sync_state(PENDING_KEY)) == {'players': [1]}
+    
+    scheduler = start(db, server)
+    scheduler.stop()
+    assert cloud_names(server) == ['Alice']
+    assert db.get_sync_state(PENDING_KEY) is None
+
+
+def test_failed_final_push_is_saved(db, server, quiet):
+    scheduler = start(db, server)
+    db.add_change_listener(scheduler.record_change)
+    db.add_player('Alice', 'NB')
+    db.add_player('Bob', 'NS')
+    server.fail_next(table='players')
+    scheduler.stop()
+    assert cloud_names(server) == []
+    assert json.loads(db.get_sync_state(PENDING_KEY)) == {'players': [1, 2]}
+    
+    scheduler = start(db, server)
+    scheduler.stop()
+    assert cloud_names(server) == ['Alice', 'Bob']
@@ -0,0 +1,50 @@
+from fake_supabase import FakeSupabase
+from supabase_sync import SupabaseSync
+
+
+def test_status_is_read_without_network(db, quiet):
+    server = FakeSupabase()
+    db.supabase = SupabaseSync(client=server)
+    db.add_player_to_event(1, 'Alice', 'NB')
+    assert db.sync_to_cloud()
+    assert db.incremental_pull()
+    
+    server.reset_stats()
+    status = db.get_sync_status()
+    assert server.stats['requests'] == 0
+    assert status['enabled']
+    assert status['last_push'] and status['last_pull']
+    assert status['last_sync'] == max(status['last_push'], status['last_pull'])
+    assert status['last_result'].startswith('pull succeeded')
+    assert set(status['watermarks']) == {'players', 'events', 'event_participants'}
+
+
+def test_failed_push_keeps_the_last_good_time(db, quiet):
+    server = FakeSupabase()
+    db.supabase = SupabaseSync(client=server)
+    db.add_player('Alice', 'NB')
+    assert db.sync_to_cloud()
+    last_push = db.get_sync_status()['last_push']
+    
+    server.fail_next(table='players')
+    assert not db.sync_to_cloud()
+    status = db.get_sync_status()
+    assert status['last_push'] == last_push
+    assert status['last_result'].startswith('push failed')
+
+
+def test_connection_probe_reads_one_row(db, quiet):
+    server = FakeSupabase()
+    db.supabase = SupabaseSync(client=server)
+    with db.write_transaction():
+        for i in range(50):
+            db.add_player(f"Player {i:02d}", 'NB')
+    assert db.sync_to_cloud()
+    
+    server.reset_stats()
+    assert db.test_cloud_connection()
+    assert server.stats['requests'] == 1
+    assert server.stats['rows_read'] == 1
+    
+    server.fail_next()
+    assert not db.test_cloud_connection()
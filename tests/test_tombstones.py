@@ -0,0 +1,142 @@
+from aads_database import AADSDatabase
+from aads_records import Tombstone
+from fake_supabase import FakeSupabase
+from supabase_sync import SupabaseSync, PUSHED_DELETIONS_KEY
+from sync_scheduler import AutoSyncScheduler
+
+
+def names(db):
+    return sorted(player['name'] for player in db.get_all_players())
+
+
+def copy_of(db, path):
+    """A second database file holding the same rows as ``db``."""
+    other = AADSDatabase(path, enable_sync=False)
+    db.conn.backup(other.conn)
+    other.invalidate_caches()
+    return other
+
+
+def test_deletions_leave_tombstones(db, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    db.add_player_to_event(2, 'Alice', 'NB')
+    db.add_player_to_event(1, 'Bob', 'NS')
+    participants = [row[0] for row in db.conn.execute("SELECT id FROM event_participants WHERE player_id = 1")]
+    
+    assert db.remove_player_from_event(1, 'Bob')
+    assert db.delete_player('Alice')
+    assert db.tombstoned_ids() == {'players': {1}, 'event_participants': set(participants) | {3}}
+
+
+def test_applying_tombstones_deletes_rows_once(db, tmp_path, quiet):
+    db.add_player_to_event(1, 'Alice', 'NB')
+    db.add_player_to_event(1, 'Bob', 'NS')
+    other = copy_of(db, str(tmp_path / 'other.db'))
+    try:
+        assert db.delete_player('Alice')
+        tombstones = list(db.iter_records(Tombstone))
+        
+        # The player's roster entry goes with them, as in the cloud
+        assert other.apply_tombstones(tombstones) == 2
+        assert names(other) == ['Bob']
+        assert [row['name'] for row in other.get_event_roster(1)] == ['Bob']
+        assert other.tombstoned_ids() == db.tombstoned_ids()
+        
+        assert other.apply_tombstones(tombstones) == 0
+        assert names(other) == ['Bob']
+    finally:
+        other.close()
+
+
+def test_compaction_drops_only_old_tombstones(db, quiet):
+    db.add_player('Alice', 'NB')
+    db.add_player('Bob', 'NS')
+    db.delete_player('Alice')
+    db.delete_player('Bob')
+    db.conn.execute("UPDATE tombstones SET deleted_at = datetime('now', '-40 days') WHERE row_id = 1")
+    db.conn.commit()
+    
+    assert db.compact_tombstones(days=30) == 1
+    assert db.tombstoned_ids() == {'players': {2}}
+    assert db.get_sync_state('last_compaction_at')
+
+
+def test_compaction_keeps_unpushed_tombstones_when_syncing(db, quiet):
+    db.supabase = SupabaseSync(client=FakeSupabase())
+    db.add_player('Alice', 'NB')
+    db.delete_player('Alice')
+    db.conn.execute("UPDATE tombstones SET deleted_at = datetime('now', '-40 days')")
+    db.conn.commit()
+    
+    # Nothing was pushed yet, so other clients have not heard of the deletion
+    assert db.compact_tombstones(days=30) == 0
+    assert db.tombstoned_ids() == {'players': {1}}
+    
+    # Auto-sync pushing other rows does not push the deletion
+    db.set_sync_state('last_push_at', '2999-01-01 00:00:00')
+    assert db.compact_tombstones(days=30) == 0
+    
+    # Compaction follows a successful full push
+    assert db.sync_to_cloud()
+    assert db.tombstoned_ids() == {}
+
+
+def test_auto_sync_marks_deletions_pushed_only_without_gaps(db, quiet):
+    server = FakeSupabase()
+    db.supabase = SupabaseSync(client=server)
+    for name in ('Alice', 'Bob', 'Carol'):
+        db.add_player(name, 'NB')
+    # Deleted while nothing was listening, so auto-sync never pushes it
+    db.delete_player('Alice')
+    db.conn.execute("UPDATE tombstones SET deleted_at = datetime('now', '-50 days')")
+    db.conn.commit()
+    
+    scheduler = AutoSyncScheduler(db.db_path, SupabaseSync(client=server), interval=3600, debounce=3600)
+    db.add_change_listener(scheduler.record_change)
+    db.delete_player('Bob')
+    scheduler.stop()
+    assert db.get_sync_state(PUSHED_DELETIONS_KEY) is None
+    assert db.compact_tombstones(days=30) == 0
+    
+    # A full push sends them all
+    assert db.sync_to_cloud()
+    assert db.tombstoned_ids() == {'players': {2}}
+    
+    # With nothing missing since the mark, auto-sync moves it on
+    db.conn.execute("UPDATE tombstones SET deleted_at = datetime('now', '-1 day')")
+    db.conn.execute("UPDATE sync_state SET value = datetime('now', '-1 day') WHERE key = ?", (PUSHED_DELETIONS_KEY,))
+    db.conn.commit()
+    scheduler = AutoSyncScheduler(db.db_path, SupabaseSync(client=server), interval=3600, debounce=3600)
+    db.add_change_listener(scheduler.record_change)
+    db.delete_player('Carol')
+    scheduler.stop()
+    carol = db.conn.execute("SELECT deleted_at FROM tombstones WHERE row_id = 3").fetchone()[0]
+    assert db.get_sync_state(PUSHED_DELETIONS_KEY) == carol
+
+
+def test_pulled_tombstones_delete_rows_and_stop_them_coming_back(tmp_path, quiet):
+    server = FakeSupabase()
+    first = AADSDatabase(str(tmp_path / 'a.db'), enable_sync=False)
+    second = AADSDatabase(str(tmp_path / 'b.db'), enable_sync=False)
+    first.supabase = SupabaseSync(client=server)
+    second.supabase = SupabaseSync(client=server)
+    try:
+        first.initialize_events()
+        first.add_player_to_event(1, 'Alice', 'NB')
+        first.add_player_to_event(1, 'Bob', 'NS')
+        assert first.sync_to_cloud()
+        second.initialize_events()
+        assert second.pull_from_cloud()
+        
+        assert first.delete_player('Alice')
+        assert first.sync_to_cloud()
+        assert [row['name'] for row in server.rows('players')] == ['Bob']
+        
+        assert second.incremental_pull()
+        assert names(second) == ['Bob']
+        # A later full push from the second desk does not resurrect her
+        assert second.sync_to_cloud()
+        assert [row['name'] for row in server.rows('players')] == ['Bob']
+    finally:
+        first.close()
+        second.close()
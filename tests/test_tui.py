@@ -0,0 +1,52 @@
+import pytest
+
+from aads_tui import PlayerWindow, format_player
+
+
+@pytest.fixture
+def roster(db, quiet):
+    with db.write_transaction():
+        for i in range(95):
+            db.add_player(f"Player {i:02d}", ('NB', 'NS', 'PEI')[i % 3])
+    return db
+
+
+def test_window_rows_match_the_full_listing(roster):
+    window = PlayerWindow(roster, block_size=10, max_blocks=3)
+    everyone = [row['id'] for row in roster.iter_players("name")]
+    assert window.total == 95
+    for offset, count in ((0, 5), (8, 7), (40, 25), (90, 20)):
+        assert [row['id'] for row in window.rows(offset, count)] == everyone[offset:offset + count]
+    assert window.rows(200, 5) == []
+
+
+def test_window_fetches_only_the_blocks_it_shows(roster):
+    window = PlayerWindow(roster, block_size=10, max_blocks=3)
+    window.rows(0, 15)
+    assert window.fetches == 2
+    window.rows(5, 10)
+    assert window.fetches == 2
+    # Older blocks are dropped past the cache limit and read again on return
+    window.rows(40, 10)
+    assert len(window._blocks) == 3
+    window.rows(0, 5)
+    assert window.fetches == 6
+
+
+def test_window_filters_live(roster):
+    window = PlayerWindow(roster, block_size=10)
+    window.set_query(name_contains="Player 1")
+    assert window.total == 10
+    assert [row['name'] for row in window.rows(0, 3)] == ["Player 10", "Player 11", "Player 12"]
+    window.set_query(province="NS")
+    assert [row['name'] for row in window.rows(0, 50)] == ["Player 10", "Player 13", "Player 16", "Player 19"]
+    # Clearing a filter drops it
+    window.set_query(name_contains="", province=None)
+    assert window.total == 95
+
+
+def test_format_player_fits_the_width():
+    player = {'name': "Alice", 'province': "NB", 'status': "Winner", 'total_events': 2, 'toc_qualified': 1}
+    line = format_player(player, 80)
+    assert line.split() == ["Alice", "NB", "Winner", "2", "✓"]
+    assert format_player(player, 12) == " Alice      "